@@ -0,0 +1,55 @@
+# -*- coding:utf-8 -*-
+
+"""AST memory benchmark: python -m benchmarks.ast_memory."""
+
+import sys
+import tracemalloc
+
+from benchmarks.programs import generate_program
+from interpreter.arena import build_arena
+from interpreter.lexer import get_token_buffer
+from interpreter.parser import Parser
+
+
+def measure(build):
+    """Return memory held by the result of build.
+
+    Args:
+        build: function without arguments
+
+    Returns:
+        tuple: result and allocated bytes
+    """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    buffer = get_token_buffer(generate_program(statements))
+    print("{0} statements, {1} tokens".format(statements, len(buffer)))
+    tree, size = measure(lambda: Parser(buffer).parse())
+    print(
+        "{0:>10}: {1:8.1f} MB, {2:5.1f} bytes per token".format(
+            "AST",
+            size / 1e6,
+            size / len(buffer),
+        )
+    )
+    _, size = measure(lambda: build_arena(tree))
+    print(
+        "{0:>10}: {1:8.1f} MB, {2:5.1f} bytes per token".format(
+            "arena",
+            size / 1e6,
+            size / len(buffer),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# -*- coding:utf-8 -*-
+
+"""Program loading benchmark: python -m benchmarks.ast_serialization."""
+
+import pickle  # noqa: S403
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.intereter import parse
+from interpreter.serialization import dumps, loads
+
+
+def measure(load, data, repeat=3):
+    """Return the best loading time in seconds.
+
+    Args:
+        load: function loading a program
+        data: its argument
+        repeat: number of runs
+
+    Returns:
+        float: seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    text = generate_program(statements)
+    tree = parse(text)
+    formats = (
+        ("parse source", parse, text),
+        ("pickle", pickle.loads, pickle.dumps(tree, pickle.HIGHEST_PROTOCOL)),
+        ("binary format", loads, dumps(tree)),
+    )
+    print("{0} statements".format(statements))
+    for name, load, data in formats:
+        elapsed = measure(load, data)
+        print(
+            "{0:>14}: {1:8.1f} ms, {2:6.1f} MB".format(
+                name,
+                elapsed * 1e3,
+                len(data) / 1e6,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# -*- coding:utf-8 -*-
+
+"""AST builder benchmark: python -m benchmarks.builder."""
+
+import random
+import sys
+import time
+
+from interpreter.builder import AstBuilder
+from interpreter.lexer import get_token
+from interpreter.parser import Parser
+
+
+def make_plan(statements, variables=100, seed=0):
+    """Return the statements of a generated program as tuples.
+
+    Args:
+        statements: number of assignment statements
+        variables: number of distinct variable names
+        seed: random seed
+
+    Returns:
+        list: (target, source, addend, factor, subtrahend) tuples
+    """
+    rnd = random.Random(seed)
+    names = ["v{0}".format(index) for index in range(variables)]
+    return [
+        (
+            names[index % variables],
+            names[rnd.randrange(variables)],
+            rnd.randint(0, 1000),
+            rnd.randint(1, 9),
+            rnd.randint(0, 1000),
+        )
+        for index in range(statements)
+    ]
+
+
+def render_and_parse(plan):
+    """Render program text and parse it.
+
+    Args:
+        plan: program statements
+
+    Returns:
+        tree: abstract syntax tree
+    """
+    lines = ["BEGIN"]
+    lines.extend(
+        "{0} := ({1} + {2}) * {3} - {4};".format(*statement) for statement in plan
+    )
+    lines.append("END.")
+    return Parser(get_token("\n".join(lines))).parse()
+
+
+def build(plan):
+    """Build the program with the builder.
+
+    Args:
+        plan: program statements
+
+    Returns:
+        tree: abstract syntax tree
+    """
+    builder = AstBuilder()
+    add = builder.add
+    mul = builder.mul
+    sub = builder.sub
+    statements = builder.assignments(
+        (target, sub(mul(add(source, addend), factor), subtrahend))
+        for target, source, addend, factor, subtrahend in plan
+    )
+    statements.append(builder.empty())
+    return builder.compound(statements)
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    plan = make_plan(statements)
+    assert str(build(plan[:100])) == str(render_and_parse(plan[:100]))
+    print("{0} statements".format(statements))
+    for name, make in (("render + parse", render_and_parse), ("builder", build)):
+        start = time.perf_counter()
+        make(plan)
+        elapsed = time.perf_counter() - start
+        print(
+            "{0:>15}: {1:6.2f} s, {2:5.2f} us per statement".format(
+                name,
+                elapsed,
+                elapsed / statements * 1e6,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# -*- coding:utf-8 -*-
+
+"""Execution engine benchmark: python -m benchmarks.bytecode."""
+
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.bytecode import VirtualMachine, compile_tree
+from interpreter.intereter import parse
+from interpreter.visitor import CalculationVisitor
+
+
+def measure(run, repeat=3):
+    """Return the best running time in seconds.
+
+    Args:
+        run: function to time
+        repeat: number of runs
+
+    Returns:
+        float: seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    tree = parse(generate_program(statements))
+    code = compile_tree(tree)
+    visitor_scope = {}
+    machine_scope = {}
+    CalculationVisitor(visitor_scope).visit(tree)
+    VirtualMachine(machine_scope).run(code)
+    assert machine_scope == visitor_scope
+    runs = (
+        ("visitor", lambda: CalculationVisitor({}).visit(tree)),
+        ("compile", lambda: compile_tree(tree)),
+        ("bytecode", lambda: VirtualMachine({}).run(code)),
+    )
+    print("{0} statements, {1} instructions".format(statements, len(code)))
+    for name, run in runs:
+        elapsed = measure(run)
+        print(
+            "{0:>9}: {1:7.1f} ms, {2:5.2f} us per statement".format(
+                name,
+                elapsed * 1e3,
+                elapsed / statements * 1e6,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
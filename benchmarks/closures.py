@@ -0,0 +1,62 @@
+# -*- coding:utf-8 -*-
+
+"""Repeated execution benchmark: python -m benchmarks.closures."""
+
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.bytecode import VirtualMachine, compile_tree
+from interpreter.closures import compile_closures
+from interpreter.intereter import parse
+from interpreter.visitor import CalculationVisitor
+
+
+def measure(run, runs):
+    """Return seconds taken by runs calls.
+
+    Args:
+        run: function taking the global scope
+        runs: number of calls
+
+    Returns:
+        float: seconds
+    """
+    start = time.perf_counter()
+    for _ in range(runs):
+        run({})
+    return time.perf_counter() - start
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    tree = parse(generate_program(statements))
+    start = time.perf_counter()
+    code = compile_tree(tree)
+    bytecode_compile = time.perf_counter() - start
+    start = time.perf_counter()
+    program = compile_closures(tree)
+    closure_compile = time.perf_counter() - start
+    engines = (
+        ("visitor", 0, lambda scope: CalculationVisitor(scope).visit(tree)),
+        ("bytecode", bytecode_compile, lambda scope: VirtualMachine(scope).run(code)),
+        ("closure", closure_compile, program),
+    )
+    print("{0} statements, {1} runs".format(statements, runs))
+    for name, compile_time, run in engines:
+        elapsed = measure(run, runs)
+        print(
+            "{0:>9}: compile {1:6.2f} ms, run {2:7.1f} ms, "
+            "{3:5.2f} us per statement".format(
+                name,
+                compile_time * 1e3,
+                elapsed * 1e3,
+                elapsed / (statements * runs) * 1e6,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
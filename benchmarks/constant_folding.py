@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+
+"""Constant folding benchmark: python -m benchmarks.constant_folding."""
+
+import random
+import sys
+import time
+
+from interpreter.intereter import parse
+from interpreter.optimizer import count_nodes, fold_constants
+from interpreter.visitor import CalculationVisitor
+
+
+def generate_constant_program(statements, variables=100, seed=0):
+    """Return a generated program with constant subexpressions.
+
+    Args:
+        statements: number of assignment statements
+        variables: number of distinct variable names
+        seed: random seed
+
+    Returns:
+        str: program text
+    """
+    rnd = random.Random(seed)
+    names = ["v{0}".format(index) for index in range(variables)]
+    lines = ["BEGIN", "    scale := 2 * (3 + 4);"]
+    lines.extend("    {0} := 1;".format(name) for name in names)
+    for index in range(statements):
+        lines.append(
+            "    {0} := ({1} + {2} * ({3} - 1)) * 1 + 0 - scale / {4};".format(
+                names[index % variables],
+                names[rnd.randrange(variables)],
+                rnd.randint(1, 9),
+                rnd.randint(1, 9),
+                rnd.randint(1, 9),
+            ),
+        )
+    lines.append("END.")
+    return "\n".join(lines)
+
+
+def measure(tree, repeat=3):
+    """Return the best running time of the visitor in seconds.
+
+    Args:
+        tree: abstract syntax tree
+        repeat: number of runs
+
+    Returns:
+        float: seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        CalculationVisitor({}).visit(tree)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    tree = parse(generate_constant_program(statements))
+    start = time.perf_counter()
+    folded, removed = fold_constants(tree)
+    elapsed = time.perf_counter() - start
+    scope = {}
+    folded_scope = {}
+    CalculationVisitor(scope).visit(tree)
+    CalculationVisitor(folded_scope).visit(folded)
+    assert folded_scope == scope
+    print(
+        "{0} statements, {1} nodes, {2} removed, folded in {3:.2f} s".format(
+            statements,
+            count_nodes(tree),
+            removed,
+            elapsed,
+        )
+    )
+    for name, program in (("original", tree), ("folded", folded)):
+        elapsed = measure(program)
+        print(
+            "{0:>9}: {1:7.1f} ms, {2:5.2f} us per statement".format(
+                name,
+                elapsed * 1e3,
+                elapsed / statements * 1e6,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
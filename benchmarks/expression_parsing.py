@@ -0,0 +1,92 @@
+# -*- coding:utf-8 -*-
+
+"""Expression parser benchmark: python -m benchmarks.expression_parsing."""
+
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.ast import BinaryOperation, Num, UnaryOperation
+from interpreter.lexer import get_token_buffer
+from interpreter.parser import Parser
+from interpreter.token import TokenType
+
+
+class RecursiveParser(Parser):
+    """Parser with the recursive descent expression grammar."""
+
+    def _expr(self):
+        node = self._term()
+        while self.current_token.type in {TokenType.plus, TokenType.minus}:
+            token = self.current_token
+            self._eat(token.type)
+            node = BinaryOperation(left=node, op=token, right=self._term())
+        return node
+
+    def _term(self):
+        node = self._factor()
+        while self.current_token.type in {TokenType.multiply, TokenType.divide}:
+            token = self.current_token
+            self._eat(token.type)
+            node = BinaryOperation(left=node, op=token, right=self._factor())
+        return node
+
+    def _factor(self):
+        token = self.current_token
+        if token.type in {TokenType.plus, TokenType.minus}:
+            self._eat(token.type)
+            return UnaryOperation(token, self._factor())
+        elif token.type in {TokenType.integer, TokenType.real}:
+            self._eat(token.type)
+            return Num(token)
+        elif token.type == TokenType.lparen:
+            self._eat(TokenType.lparen)
+            node = self._expr()
+            self._eat(TokenType.rparen)
+            return node
+        return self._variable()
+
+
+def measure(parser_class, buffer, repeat=3):
+    """Return the best parsing time in seconds.
+
+    Args:
+        parser_class: parser to run
+        buffer: token buffer
+        repeat: number of runs
+
+    Returns:
+        float: seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser_class(buffer).parse()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    buffer = get_token_buffer(generate_program(statements))
+    print("{0} statements, {1} tokens".format(statements, len(buffer)))
+    for parser_class in (RecursiveParser, Parser):
+        elapsed = measure(parser_class, buffer)
+        print(
+            "{0:>16}: {1:8.3f} s, {2:6.2f} us per token".format(
+                parser_class.__name__,
+                elapsed,
+                elapsed / len(buffer) * 1e6,
+            ),
+        )
+
+    depth = 1000000
+    buffer = get_token_buffer("-" * depth + "(" * depth + "1" + ")" * depth)
+    start = time.perf_counter()
+    Parser(buffer)._expr()
+    print("nesting depth {0}: {1:.2f} s".format(depth, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# -*- coding:utf-8 -*-
+
+"""Incremental relexing benchmark: python -m benchmarks.incremental_lexing."""
+
+import random
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.lexer import get_token_buffer, relex_token_buffer
+
+# Edits as (name, number of deleted characters, inserted texts).
+_EDITS = (
+    ("same length", 1, "ab1 +;"),
+    ("insert", 1, ("77", "a b", "1 +")),
+    ("delete", 1, ("",)),
+)
+
+
+def measure(buffer, text, deleted_length, pieces, edits=200, seed=0):
+    """Return the mean time of an edit in seconds and the new text.
+
+    Args:
+        buffer: token buffer of the text, updated in place
+        text: program text
+        deleted_length: number of characters deleted by every edit
+        pieces: texts to insert
+        edits: number of edits
+        seed: random seed
+
+    Returns:
+        tuple: seconds, program text after the edits
+    """
+    rnd = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(edits):
+        offset = rnd.randrange(len(text) - deleted_length)
+        text, _, _ = relex_token_buffer(
+            buffer,
+            text,
+            offset,
+            deleted_length,
+            rnd.choice(pieces),
+        )
+    return (time.perf_counter() - start) / edits, text
+
+
+def main():
+    """Run benchmark."""
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    text = generate_program(lines)
+
+    start = time.perf_counter()
+    buffer = get_token_buffer(text)
+    full = time.perf_counter() - start
+
+    print("{0} lines, {1} tokens".format(lines, len(buffer)))
+    print("full lex:    {0:8.2f} ms".format(full * 1e3))
+    for name, deleted_length, pieces in _EDITS:
+        elapsed, text = measure(buffer, text, deleted_length, pieces)
+        print("{0:<12} {1:8.2f} ms per edit".format(name + ":", elapsed * 1e3))
+    assert buffer.starts == get_token_buffer(text).starts
+
+
+if __name__ == "__main__":
+    main()
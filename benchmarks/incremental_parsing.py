@@ -0,0 +1,64 @@
+# -*- coding:utf-8 -*-
+
+"""Incremental parsing benchmark: python -m benchmarks.incremental_parsing."""
+
+import random
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.incremental import ParseTree
+from interpreter.lexer import get_token_buffer, relex_token_buffer
+from interpreter.parser import Parser
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    edits = 10
+    text = generate_program(statements)
+    rnd = random.Random(0)
+    offsets = sorted(
+        (text.index(":=", rnd.randrange(len(text) // 2)) + 3 for _ in range(edits)),
+        reverse=True,
+    )
+
+    buffer = get_token_buffer(text)
+    start = time.perf_counter()
+    for offset in offsets:
+        buffer_text, _, _ = relex_token_buffer(
+            buffer,
+            buffer.source,
+            offset,
+            0,
+            "1 + ",
+        )
+        Parser(buffer).parse()
+    full = (time.perf_counter() - start) / edits
+
+    tree = ParseTree(get_token_buffer(text))
+    relex = 0
+    reparse = 0
+    for offset in offsets:
+        start = time.perf_counter()
+        _, first, stop = relex_token_buffer(
+            tree.buffer,
+            tree.buffer.source,
+            offset,
+            0,
+            "1 + ",
+        )
+        relex += time.perf_counter() - start
+        start = time.perf_counter()
+        tree.reparse(first, stop)
+        reparse += time.perf_counter() - start
+
+    assert buffer_text == tree.buffer.source
+    print("{0} statements, {1} edits".format(statements, edits))
+    print("relex + full parse:  {0:8.2f} ms per edit".format(full * 1e3))
+    print("relex:               {0:8.2f} ms per edit".format(relex / edits * 1e3))
+    print("incremental reparse: {0:8.2f} ms per edit".format(reparse / edits * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# -*- coding:utf-8 -*-
+
+"""Cached interpret() benchmark: python -m benchmarks.interpret_cache."""
+
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.cache import SourceCache
+from interpreter.intereter import interpret
+
+
+def measure(programs, cache, calls):
+    """Return seconds per interpret() call.
+
+    Args:
+        programs: program texts, interpreted in turn
+        cache: program cache
+        calls: number of calls
+
+    Returns:
+        float: seconds
+    """
+    start = time.perf_counter()
+    for index in range(calls):
+        interpret(programs[index % len(programs)], cache)
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    programs = [generate_program(statements, seed=seed) for seed in range(100)]
+    calls = 5000
+    print(
+        "{0} programs of {1} statements, {2} calls".format(
+            len(programs),
+            statements,
+            calls,
+        )
+    )
+    caches = (
+        ("no cache", SourceCache(maxsize=0)),
+        ("memory cache", SourceCache()),
+    )
+    for name, cache in caches:
+        elapsed = measure(programs, cache, calls)
+        print(
+            "{0:>14}: {1:8.1f} us per call, {2} hits, {3} misses".format(
+                name,
+                elapsed * 1e6,
+                cache.hits,
+                cache.misses,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# -*- coding:utf-8 -*-
+
+"""Keyword recognition benchmark: python -m benchmarks.keyword_lexing."""
+
+import random
+import sys
+import time
+
+from interpreter.lexer import _TOKEN_REGEX, get_token, get_token_by_char
+from interpreter.token import make_keywords, make_variable
+
+_WORDS = ("BEGIN", "begin", "Begin", "END", "end", "VAR", "var", "Real", "x", "y")
+
+
+def per_word_lookup(text):
+    """Return tokens normalizing and looking up every word, without caching.
+
+    Args:
+        text: program text
+
+    Yields:
+        tokens: token iterator
+    """
+    keywords = make_keywords()
+    for match in _TOKEN_REGEX.finditer(text):
+        if match.lastgroup == "word":
+            word = match.group()
+            yield keywords.get(word.upper()) or make_variable(word.lower())
+
+
+def main():
+    """Run benchmark."""
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    rnd = random.Random(0)
+    text = " ".join(rnd.choice(_WORDS) for _ in range(words))
+    for engine in (get_token_by_char, per_word_lookup, get_token):
+        start = time.perf_counter()
+        for _ in engine(text):  # noqa: WPS328
+            pass
+        elapsed = time.perf_counter() - start
+        print(
+            "{0:>20}: {1:8.1f} ns per word".format(
+                engine.__name__,
+                elapsed / words * 1e9,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
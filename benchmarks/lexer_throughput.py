@@ -0,0 +1,42 @@
+# -*- coding:utf-8 -*-
+
+"""Lexer throughput benchmark: python -m benchmarks.lexer_throughput."""
+
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.lexer import get_token, get_token_by_char
+
+
+def measure(engine, text, repeat=3):
+    """Return the best lexing throughput in MB/s.
+
+    Args:
+        engine: token generator function
+        text: program text
+        repeat: number of runs
+
+    Returns:
+        float: megabytes of source per second
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in engine(text):  # noqa: WPS328
+            pass
+        best = min(best, time.perf_counter() - start)
+    return len(text) / best / 1e6
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    text = generate_program(statements)
+    print("program size: {0:.2f} MB".format(len(text) / 1e6))
+    for engine in (get_token_by_char, get_token):
+        print("{0:>20}: {1:8.2f} MB/s".format(engine.__name__, measure(engine, text)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# -*- coding:utf-8 -*-
+
+"""Parallel lexing benchmark: python -m benchmarks.parallel_lexing [MB]."""
+
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.lexer import get_token_buffer
+
+
+def main():
+    """Run benchmark."""
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 500
+    text = generate_program(int(megabytes * 1e6 / 33))
+    print("program size: {0:.1f} MB".format(len(text) / 1e6))
+    for workers in (1, 2, 4, 8):
+        start = time.perf_counter()
+        buffer = get_token_buffer(text, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(
+            "{0} workers: {1:7.2f} s, {2:6.2f} MB/s, {3} tokens".format(
+                workers,
+                elapsed,
+                len(text) / elapsed / 1e6,
+                len(buffer),
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# -*- coding:utf-8 -*-
+
+"""Parser throughput benchmark: python -m benchmarks.parser_throughput."""
+
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.lexer import get_token_buffer
+from interpreter.parser import Parser
+
+
+def measure(make_source, repeat=3):
+    """Return the best parsing time in seconds.
+
+    Args:
+        make_source: function returning parser input
+        repeat: number of runs
+
+    Returns:
+        float: seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        source = make_source()
+        start = time.perf_counter()
+        Parser(source).parse()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    buffer = get_token_buffer(generate_program(statements))
+    tokens = [buffer[index] for index in range(len(buffer))]
+    print("{0} statements, {1} tokens".format(statements, len(buffer)))
+    sources = (
+        ("token iterator", lambda: iter(tokens)),
+        ("token buffer", lambda: buffer),
+    )
+    for name, make_source in sources:
+        elapsed = measure(make_source)
+        print(
+            "{0:>16}: {1:8.3f} s, {2:6.2f} us per token".format(
+                name,
+                elapsed,
+                elapsed / len(buffer) * 1e6,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
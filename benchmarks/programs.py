@@ -0,0 +1,62 @@
+# -*- coding:utf-8 -*-
+
+"""Generators of large programs for benchmarks."""
+
+import random
+
+
+def generate_program(statements, variables=100, seed=0):
+    """Return the text of a generated program.
+
+    Args:
+        statements: number of assignment statements
+        variables: number of distinct variable names
+        seed: random seed
+
+    Returns:
+        str: program text
+    """
+    rnd = random.Random(seed)
+    names = ["v{0}".format(index) for index in range(variables)]
+    lines = ["BEGIN {generated program}", "    {0} := 1;".format(names[0])]
+    for index in range(1, statements):
+        target = names[index % variables]
+        source = names[rnd.randrange(min(index, variables))]
+        lines.append(
+            "    {0} := ({1} + {2}) * {3} - {4};".format(
+                target,
+                source,
+                rnd.randint(0, 1000),
+                rnd.randint(1, 9),
+                rnd.randint(0, 1000),
+            ),
+        )
+    lines.append("END.")
+    return "\n".join(lines)
+
+
+def generate_distinct_program(statements, variables=100):
+    """Return a generated program in which every number is new.
+
+    Unlike generate_program, the number of distinct literals grows with the
+    size of the program, so tables keyed by lexeme are not bounded by it.
+
+    Args:
+        statements: number of assignment statements
+        variables: number of distinct variable names
+
+    Returns:
+        str: program text
+    """
+    names = ["v{0}".format(index) for index in range(variables)]
+    lines = ["BEGIN", "    {0} := 1;".format(names[0])]
+    for index in range(1, statements):
+        lines.append(
+            "    {0} := {1} + {2};".format(
+                names[index % variables],
+                names[(index - 1) % variables],
+                1000003 * index,
+            ),
+        )
+    lines.append("END.")
+    return "\n".join(lines)
@@ -0,0 +1,71 @@
+# -*- coding:utf-8 -*-
+
+"""Slot resolution benchmark: python -m benchmarks.slot_resolution."""
+
+import sys
+import time
+
+from benchmarks.programs import generate_program
+from interpreter.intereter import parse
+from interpreter.resolver import resolve_slots
+from interpreter.symbol_table import SlotScope
+from interpreter.visitor import CalculationVisitor
+
+
+def measure(tree, make_scope, repeat=3):
+    """Return the best running time in seconds and the last scope.
+
+    Args:
+        tree: abstract syntax tree
+        make_scope: function returning an empty scope
+        repeat: number of runs
+
+    Returns:
+        tuple: seconds, scope
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        scope = make_scope()
+        start = time.perf_counter()
+        CalculationVisitor(scope).visit(tree)
+        best = min(best, time.perf_counter() - start)
+    return best, scope
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    variables = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    tree = parse(generate_program(statements, variables))
+    start = time.perf_counter()
+    resolved, scope = resolve_slots(tree)
+    elapsed = time.perf_counter() - start
+    names = scope.names
+    print(
+        "{0} statements, {1} variables, resolved in {2:.2f} s".format(
+            statements,
+            len(names),
+            elapsed,
+        )
+    )
+    dict_time, dict_scope = measure(tree, dict)
+    slot_time, slot_scope = measure(resolved, lambda: SlotScope(names))
+    assert dict(slot_scope) == dict_scope
+    runs = (
+        ("dict", dict_time, sys.getsizeof(dict_scope)),
+        ("slots", slot_time, sys.getsizeof(slot_scope.values)),
+    )
+    for name, seconds, size in runs:
+        print(
+            "{0:>6}: {1:7.1f} ms, {2:5.2f} us per statement, "
+            "scope {3:5.2f} MB".format(
+                name,
+                seconds * 1e3,
+                seconds / statements * 1e6,
+                size / 1e6,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# -*- coding:utf-8 -*-
+
+"""Streaming execution benchmark: python -m benchmarks.streaming_execution."""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.programs import generate_distinct_program, generate_program
+from interpreter.lexer import get_token_buffer, get_token_stream
+from interpreter.parser import Parser
+from interpreter.visitor import CalculationVisitor
+
+
+def run_whole(path):
+    """Parse the whole program, then execute it.
+
+    Args:
+        path: program file
+
+    Returns:
+        float: seconds until the first statement was executed
+    """
+    start = time.perf_counter()
+    with open(path, encoding="utf-8") as program_file:
+        tree = Parser(get_token_buffer(program_file.read())).parse()
+    visitor = CalculationVisitor({})
+    statements = tree.compound_statement
+    visitor.visit(statements[0])
+    first = time.perf_counter() - start
+    for statement in statements[1:]:
+        visitor.visit(statement)
+    return first
+
+
+def run_stream(path):
+    """Execute the program statement by statement while reading it.
+
+    Args:
+        path: program file
+
+    Returns:
+        float: seconds until the first statement was executed
+    """
+    start = time.perf_counter()
+    visitor = CalculationVisitor({})
+    first = None
+    for statement in Parser(get_token_stream(path)).statements():
+        visitor.visit(statement)
+        if first is None:
+            first = time.perf_counter() - start
+    return first
+
+
+def measure(run, path):
+    """Return time to first statement, total time and peak memory.
+
+    Args:
+        run: function executing the program
+        path: program file
+
+    Returns:
+        tuple: seconds, seconds, bytes
+    """
+    start = time.perf_counter()
+    first = run(path)
+    total = time.perf_counter() - start
+    tracemalloc.start()
+    run(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first, total, peak
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    programs = (
+        ("repeated numbers", generate_program),
+        ("distinct numbers", generate_distinct_program),
+    )
+    for title, generate in programs:
+        descriptor, path = tempfile.mkstemp(suffix=".pas")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as program_file:
+            program_file.write(generate(statements))
+        print("{0} statements, {1}".format(statements, title))
+        try:
+            for name, run in (("whole program", run_whole), ("streaming", run_stream)):
+                first, total, peak = measure(run, path)
+                print(
+                    "{0:>14}: first statement {1:8.1f} ms, total {2:6.2f} s, "
+                    "peak {3:6.1f} MB".format(name, first * 1e3, total, peak / 1e6),
+                )
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# -*- coding:utf-8 -*-
+
+"""Token memory benchmark: python -m benchmarks.token_memory."""
+
+import sys
+import tracemalloc
+
+from benchmarks.programs import generate_program
+from interpreter.lexer import get_token_buffer, get_tokens
+
+
+def measure(lex, text):
+    """Print memory allocated by a lexing function.
+
+    Args:
+        lex: function returning lexed tokens
+        text: program text
+    """
+    tracemalloc.start()
+    tokens = lex(text)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(tokens)
+    print(
+        "{0:>16}: {1} tokens, {2:.1f} MB, {3:.1f} bytes per token".format(
+            lex.__name__,
+            count,
+            allocated / 1e6,
+            allocated / count,
+        ),
+    )
+
+
+def token_list(text):
+    """Return tokens as a list.
+
+    Args:
+        text: program text
+
+    Returns:
+        list: tokens
+    """
+    return list(get_tokens(text))
+
+
+def main():
+    """Run benchmark."""
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 84000
+    text = generate_program(statements)
+    measure(token_list, text)
+    measure(get_token_buffer, text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+# -*- coding:utf-8 -*-
+
+"""Flat AST representation. Nodes are stored in parallel arrays."""
+
+from array import array
+from itertools import repeat
+from types import MappingProxyType
+
+from interpreter.ast import (
+    AssignOperator,
+    BinaryOperation,
+    CompoundOperator,
+    EmptyOperator,
+    Num,
+    Program,
+    UnaryOperation,
+    Variable,
+)
+
+NUM = 0
+VARIABLE = 1
+BINARY = 2
+UNARY = 3
+ASSIGN = 4
+COMPOUND = 5
+EMPTY = 6
+PROGRAM = 7
+
+
+class AstArena(object):
+    """Abstract syntax tree stored as parallel arrays.
+
+    A node is an index into the arrays. Tokens and other objects referenced
+    by nodes are kept once in the constant pool.
+
+    Attributes:
+        kinds: node kind (NUM, VARIABLE, BINARY, ...)
+        constants: index of the object of the node in the constant pool
+        left: first child, or first statement of a compound statement
+        right: second child, or number of statements
+        statements: statements of compound statements
+        root: index of the root node
+
+    The object of a node is the token of a number or a variable, the
+    operator token of an operation, or the parts of a program other than
+    its body. The first child is the left operand, the operand of a unary
+    operation, the assigned variable or the body of a program; the second
+    child is the right operand or the assigned expression.
+    """
+
+    def __init__(self):
+        """Construct an empty arena."""
+        self.kinds = array("B")
+        self.constants = array("I")
+        self.left = array("i")
+        self.right = array("i")
+        self.statements = array("I")
+        self.root = -1
+        self._pool = []
+        self._pool_index = {}
+
+    def add(self, kind, constant=None, left=-1, right=-1):
+        """Add node.
+
+        Args:
+            kind: node kind
+            constant: object referenced by the node
+            left: value of the left field
+            right: value of the right field
+
+        Returns:
+            int: node index
+        """
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.constants.append(_intern(self._pool, self._pool_index, constant))
+        self.left.append(left)
+        self.right.append(right)
+        return index
+
+    def constant(self, index):
+        """Return object referenced by the node.
+
+        Args:
+            index: node index
+
+        Returns:
+            object: token or program parts
+        """
+        return self._pool[self.constants[index]]
+
+    def view(self, index):
+        """Return node object for the node.
+
+        Args:
+            index: node index
+
+        Returns:
+            AST: view of the node
+        """
+        return _VIEWS[self.kinds[index]](self, index)
+
+    @property
+    def tree(self):
+        """Return view of the root node.
+
+        Returns:
+            AST: view of the root
+        """
+        return self.view(self.root)
+
+    def __len__(self):
+        """Return number of nodes.
+
+        Returns:
+            int: number of nodes
+        """
+        return len(self.kinds)
+
+    @property
+    def pool(self):
+        """Return the constant pool.
+
+        Returns:
+            list: objects referenced by nodes
+        """
+        return self._pool
+
+
+def build_arena(tree):
+    """Return arena holding the tree.
+
+    The tree is walked without recursion, so deeply nested expressions do
+    not hit the recursion limit.
+
+    Args:
+        tree: abstract syntax tree
+
+    Returns:
+        AstArena: flat tree
+    """
+    arena = AstArena()
+    root = array("i", [-1])
+    stack = [(tree, root, 0)]
+    while stack:
+        _add_node(arena, *stack.pop(), stack)
+    arena.root = root[0]
+    return arena
+
+
+def _intern(pool, pool_index, constant):
+    constant_id = pool_index.get(id(constant))
+    if constant_id is None:
+        constant_id = len(pool)
+        pool.append(constant)
+        pool_index[id(constant)] = constant_id
+    return constant_id
+
+
+def _add_node(arena, node, field, position, stack):
+    """Add node to the arena and push its children on the stack.
+
+    Args:
+        arena: arena
+        node: node to add
+        field: array to store the node index in
+        position: index in the field
+        stack: stack of (node, field, position) to add
+
+    Raises:
+        AttributeError: if the node has an unknown type
+    """
+    add = _NODE_ADDERS.get(type(node))
+    if add is None:
+        raise AttributeError("No arena kind for {0}".format(type(node)))
+    field[position] = add(arena, node, stack)
+
+
+def _add_num(arena, node, stack):
+    return arena.add(NUM, node.token)
+
+
+def _add_variable(arena, node, stack):
+    return arena.add(VARIABLE, node.token)
+
+
+def _add_binary_operation(arena, node, stack):
+    index = arena.add(BINARY, node.op)
+    stack.append((node.right, arena.right, index))
+    stack.append((node.left, arena.left, index))
+    return index
+
+
+def _add_unary_operation(arena, node, stack):
+    index = arena.add(UNARY, node.op)
+    stack.append((node.expr, arena.left, index))
+    return index
+
+
+def _add_assign_operator(arena, node, stack):
+    index = arena.add(ASSIGN, node.op)
+    stack.append((node.expr, arena.right, index))
+    stack.append((node.variable, arena.left, index))
+    return index
+
+
+def _add_compound_operator(arena, node, stack):
+    statements = node.compound_statement
+    first = len(arena.statements)
+    arena.statements.extend(repeat(0, len(statements)))
+    for offset in reversed(range(len(statements))):
+        stack.append((statements[offset], arena.statements, first + offset))
+    return arena.add(COMPOUND, None, first, len(statements))
+
+
+def _add_empty_operator(arena, node, stack):
+    return arena.add(EMPTY)
+
+
+def _add_program(arena, node, stack):
+    parts = (node.name, node.block, node.variables)
+    index = arena.add(PROGRAM, parts)
+    stack.append((node.compound_statement, arena.left, index))
+    return index
+
+
+# Function adding a node of the type to an arena, used by _add_node.
+_NODE_ADDERS = MappingProxyType(
+    {
+        Num: _add_num,
+        Variable: _add_variable,
+        BinaryOperation: _add_binary_operation,
+        UnaryOperation: _add_unary_operation,
+        AssignOperator: _add_assign_operator,
+        CompoundOperator: _add_compound_operator,
+        EmptyOperator: _add_empty_operator,
+        Program: _add_program,
+    },
+)
+
+# Instance attributes of every view.
+_VIEW_SLOTS = ("arena", "index")
+
+
+class _View(object):
+    """Node of an arena: the arena and the index of the node in it."""
+
+    __slots__ = ()
+
+    def __init__(self, arena, index):
+        """Construct a view.
+
+        Args:
+            arena: arena
+            index: node index
+        """
+        self.arena = arena
+        self.index = index
+
+    def _constant(self):
+        return self.arena.constant(self.index)
+
+    def _left(self):
+        return self.arena.view(self.arena.left[self.index])
+
+    def _right(self):
+        return self.arena.view(self.arena.right[self.index])
+
+
+class NumView(_View, Num):
+    """Num node of an arena."""
+
+    __slots__ = _VIEW_SLOTS
+
+    @property
+    def token(self):
+        """Return the token of the number.
+
+        Returns:
+            token: integer or real token
+        """
+        return self._constant()
+
+
+class VariableView(_View, Variable):
+    """Variable node of an arena."""
+
+    __slots__ = _VIEW_SLOTS
+
+    @property
+    def token(self):
+        """Return the token of the variable.
+
+        Returns:
+            token: variable token
+        """
+        return self._constant()
+
+
+class BinaryOperationView(_View, BinaryOperation):
+    """BinaryOperation node of an arena."""
+
+    __slots__ = _VIEW_SLOTS
+
+    @property
+    def left(self):
+        """Return the left operand.
+
+        Returns:
+            AST: view of the operand
+        """
+        return self._left()
+
+    @property
+    def op(self):
+        """Return the operator token.
+
+        Returns:
+            token: operator token
+        """
+        return self._constant()
+
+    @property
+    def right(self):
+        """Return the right operand.
+
+        Returns:
+            AST: view of the operand
+        """
+        return self._right()
+
+
+class UnaryOperationView(_View, UnaryOperation):
+    """UnaryOperation node of an arena."""
+
+    __slots__ = _VIEW_SLOTS
+
+    @property
+    def op(self):
+        """Return the operator token.
+
+        Returns:
+            token: operator token
+        """
+        return self._constant()
+
+    @property
+    def expr(self):
+        """Return the operand.
+
+        Returns:
+            AST: view of the operand
+        """
+        return self._left()
+
+
+class AssignOperatorView(_View, AssignOperator):
+    """AssignOperator node of an arena."""
+
+    __slots__ = _VIEW_SLOTS
+
+    @property
+    def variable(self):
+        """Return the assigned variable.
+
+        Returns:
+            AST: view of the variable
+        """
+        return self._left()
+
+    @property
+    def op(self):
+        """Return the assignment token.
+
+        Returns:
+            token: assignment token
+        """
+        return self._constant()
+
+    @property
+    def expr(self):
+        """Return the assigned expression.
+
+        Returns:
+            AST: view of the expression
+        """
+        return self._right()
+
+
+class CompoundOperatorView(_View, CompoundOperator):
+    """CompoundOperator node of an arena."""
+
+    __slots__ = _VIEW_SLOTS
+
+    @property
+    def compound_statement(self):
+        """Return the statements.
+
+        Returns:
+            list: views of the statements
+        """
+        arena = self.arena
+        first = arena.left[self.index]
+        statements = arena.statements[first : first + arena.right[self.index]]
+        return [arena.view(statement) for statement in statements]
+
+
+class EmptyOperatorView(_View, EmptyOperator):
+    """EmptyOperator node of an arena."""
+
+    __slots__ = _VIEW_SLOTS
+
+
+class ProgramView(_View, Program):
+    """Program node of an arena."""
+
+    __slots__ = _VIEW_SLOTS
+
+    @property
+    def name(self):
+        """Return the program name.
+
+        Returns:
+            Variable: program name
+        """
+        return self._constant()[0]
+
+    @property
+    def block(self):
+        """Return the declarations.
+
+        Returns:
+            Block: variable declarations
+        """
+        return self._constant()[1]
+
+    @property
+    def compound_statement(self):
+        """Return the program body.
+
+        Returns:
+            AST: view of the body
+        """
+        return self._left()
+
+    @property
+    def variables(self):
+        """Return the declared variables.
+
+        Returns:
+            VariableTable: declared variables
+        """
+        return self._constant()[2]
+
+
+_VIEWS = (
+    NumView,
+    VariableView,
+    BinaryOperationView,
+    UnaryOperationView,
+    AssignOperatorView,
+    CompoundOperatorView,
+    EmptyOperatorView,
+    ProgramView,
+)
+
+# View class of every node class, for visitors that dispatch on type.
+VIEW_TYPES = MappingProxyType(
+    {
+        NumView: Num,
+        VariableView: Variable,
+        BinaryOperationView: BinaryOperation,
+        UnaryOperationView: UnaryOperation,
+        AssignOperatorView: AssignOperator,
+        CompoundOperatorView: CompoundOperator,
+        EmptyOperatorView: EmptyOperator,
+        ProgramView: Program,
+    },
+)
@@ -4,45 +4,61 @@
 
 
 class AST(object):
-    """Implementation of the AST base class."""
+    """Implementation of the AST base class.
+
+    Nodes have __slots__ and no instance dictionary, a program can hold
+    millions of them.
+    """
+
+    __slots__ = ()
 
-    pass
+    def __repr__(self):
+        """Represent object as a string.
+
+        Returns:
+            str: node as a string
+
+        """
+        return str(self)
 
 
 class Num(AST):
     """Implementation of the Int class."""
 
+    __slots__ = ("token",)
+
     def __init__(self, token):
-        """Construct a new int object.
+        """Construct a new number object.
 
         Args:
-            token: integer token
+            token: integer or real token
         """
         self.token = token
-        self.value = token.value
 
-    def __str__(self):
-        """Represent object as a string.
+    @property
+    def value(self):
+        """Return the number.
 
         Returns:
-            str: Num as a string
-
+            value: value of the token
         """
-        return "Num({value})".format(value=self.value)
+        return self.token.value
 
-    def __repr__(self):
+    def __str__(self):
         """Represent object as a string.
 
         Returns:
             str: Num as a string
 
         """
-        return str(self)
+        return "Num({value})".format(value=self.value)
 
 
 class Block(AST):
     """Represents a variable declaration block (VAR x:INTEGER, y,z: REAL)."""
 
+    __slots__ = ("_declarations",)
+
     def __init__(self, declarations):
         """Construct a variable declaration block.
 
@@ -82,19 +98,73 @@ class Block(AST):
             statement_list=" ".join(str(statement) for statement in self._declarations),
         )
 
-    def __repr__(self):
+
+class VariableDeclaration(AST):
+    """Represents a declaration of one variable (x: INTEGER)."""
+
+    __slots__ = ("variable", "type")
+
+    def __init__(self, variable, type_token):
+        """Construct a variable declaration.
+
+        Args:
+            variable (Variable): variable node
+            type_token: type token (INTEGER or REAL)
+        """
+        self.variable = variable
+        self.type = type_token
+
+    def __str__(self):
         """Represent object as a string.
 
         Returns:
-            str: CompoundOperator as a string
+            str: VariableDeclaration as a string
 
         """
-        return str(self)
+        return "VariableDeclaration({variable}: {type_name})".format(
+            variable=self.variable,
+            type_name=self.type.value,
+        )
+
+
+class Program(AST):
+    """Represents a 'PROGRAM name; VAR ...; BEGIN ... END.' program."""
+
+    __slots__ = ("name", "block", "compound_statement", "variables")
+
+    def __init__(self, name, block, compound_statement, variables):
+        """Construct a program.
+
+        Args:
+            name (Variable): program name
+            block (Block): variable declarations
+            compound_statement (CompoundOperator): program body
+            variables (VariableTable): declared variables
+        """
+        self.name = name
+        self.block = block
+        self.compound_statement = compound_statement
+        self.variables = variables
+
+    def __str__(self):
+        """Represent object as a string.
+
+        Returns:
+            str: Program as a string
+
+        """
+        return "Program({name} {block} {compound_statement})".format(
+            name=self.name.value,
+            block=self.block,
+            compound_statement=self.compound_statement,
+        )
 
 
 class BinaryOperation(AST):
     """Implementation of the binary operator."""
 
+    __slots__ = ("left", "op", "right")
+
     def __init__(self, left, op, right):
         """Construct a new binary operator.
 
@@ -120,19 +190,12 @@ class BinaryOperation(AST):
             right_child=self.right,
         )
 
-    def __repr__(self):
-        """Represent object as a string.
-
-        Returns:
-            str: BinaryOperation as a string
-
-        """
-        return str(self)
-
 
 class UnaryOperation(AST):
     """Implementation of the unary operator."""
 
+    __slots__ = ("op", "expr")
+
     def __init__(self, op, expr):
         """Construct a new unary operator.
 
@@ -155,19 +218,12 @@ class UnaryOperation(AST):
             expression=self.expr,
         )
 
-    def __repr__(self):
-        """Represent object as a string.
-
-        Returns:
-            str: UnaryOperation as a string
-
-        """
-        return str(self)
-
 
 class CompoundOperator(AST):
     """Represents a 'BEGIN ... END' block."""
 
+    __slots__ = ("_statement_list",)
+
     def __init__(self):
         """Construct a new iterator."""
         self._statement_list = []
@@ -179,8 +235,7 @@ class CompoundOperator(AST):
             compound_statement: list of operators(node that implements the operator ast)
 
         """
-        for statement in compound_statement:
-            self._statement_list.append(statement)
+        self._statement_list.extend(compound_statement)
 
     def add_statement(self, statement):
         """Add statement in list.
@@ -210,23 +265,16 @@ class CompoundOperator(AST):
         """
         return "CompoundOperator(BEGIN {statement_list} END)".format(
             statement_list=" ".join(
-                str(statement) for statement in self._statement_list
+                str(statement) for statement in self.compound_statement
             ),
         )
 
-    def __repr__(self):
-        """Represent object as a string.
-
-        Returns:
-            str: CompoundOperator as a string
-
-        """
-        return str(self)
-
 
 class AssignOperator(AST):
     """Implementation of assign operator."""
 
+    __slots__ = ("variable", "op", "expr")
+
     def __init__(self, variable, op, expr):
         """Construct a new assign operator.
 
@@ -252,19 +300,12 @@ class AssignOperator(AST):
             expression=self.expr,
         )
 
-    def __repr__(self):
-        """Represent object as a string.
-
-        Returns:
-            str: AssignOperator as a string
-
-        """
-        return str(self)
-
 
 class Variable(AST):
     """Implementation of variable."""
 
+    __slots__ = ("token",)
+
     def __init__(self, token):
         """Construct a new variable.
 
@@ -272,7 +313,24 @@ class Variable(AST):
             token: variable token(type is TokenType.variable)
         """
         self.token = token
-        self.value = token.value
+
+    @property
+    def value(self):
+        """Return the variable name.
+
+        Returns:
+            str: value of the token
+        """
+        return self.token.value
+
+    @property
+    def symbol_id(self):
+        """Return the symbol id of the name.
+
+        Returns:
+            int: symbol id of the token
+        """
+        return self.token.symbol_id
 
     def __str__(self):
         """Represent object as a string.
@@ -283,17 +341,60 @@ class Variable(AST):
         """
         return "Variable({variable})".format(variable=self.value)
 
-    def __repr__(self):
-        """Represent object as a string.
 
-        Returns:
-            str: Variable as a string
+class ResolvedVariable(Variable):
+    """Variable with the slot of its value in a SlotScope."""
+
+    __slots__ = ("slot",)
 
+    def __init__(self, token, slot):
+        """Construct a new resolved variable.
+
+        Args:
+            token: variable token(type is TokenType.variable)
+            slot: index of the value in SlotScope.values
         """
-        return str(self)
+        super().__init__(token)
+        self.slot = slot
+
+
+class ResolvedAssignOperator(AssignOperator):
+    """Assign operator with the slot of the assigned variable."""
+
+    __slots__ = ("slot",)
+
+    def __init__(self, variable, op, expr, slot):
+        """Construct a new resolved assign operator.
+
+        Args:
+            variable (Variable): variable node
+            op: operator token
+            expr: expression to evaluate
+            slot: index of the value in SlotScope.values
+        """
+        super().__init__(variable, op, expr)
+        self.slot = slot
 
 
 class EmptyOperator:
     """Implementation of the AST base class."""
 
-    pass
+    __slots__ = ()
+
+    def __str__(self):
+        """Represent object as a string.
+
+        Returns:
+            str: EmptyOperator as a string
+
+        """
+        return "EmptyOperator"
+
+    def __repr__(self):
+        """Represent object as a string.
+
+        Returns:
+            str: EmptyOperator as a string
+
+        """
+        return str(self)
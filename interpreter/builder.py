@@ -0,0 +1,367 @@
+# -*- coding:utf-8 -*-
+
+"""Building abstract syntax trees without program text."""
+
+import math
+import re
+from types import MappingProxyType
+
+from interpreter.ast import (
+    AssignOperator,
+    BinaryOperation,
+    Block,
+    CompoundOperator,
+    EmptyOperator,
+    Num,
+    Program,
+    UnaryOperation,
+    Variable,
+    VariableDeclaration,
+)
+from interpreter.symbol_table import SymbolTable, VariableTable
+from interpreter.token import (
+    TokenType,
+    make_integer,
+    make_keywords,
+    make_real,
+    make_single_symbol_token,
+    make_variable,
+)
+
+_NAME = re.compile(r"[^\W\d_][^\W_]*\Z")
+
+_BINARY_OPERATORS = MappingProxyType(
+    {operator: make_single_symbol_token(operator) for operator in "+-*/"},
+)
+
+_UNARY_OPERATORS = MappingProxyType(
+    {operator: make_single_symbol_token(operator) for operator in "+-"},
+)
+
+_ASSIGN = make_single_symbol_token(":=")
+
+_EXPRESSIONS = (Num, Variable, BinaryOperation, UnaryOperation)
+
+_EXPRESSION_TYPES = frozenset(_EXPRESSIONS)
+
+_NUMBER_TYPES = frozenset((int, float))
+
+_STATEMENTS = (AssignOperator, CompoundOperator, EmptyOperator)
+
+_TYPES = MappingProxyType(
+    {"INTEGER": TokenType.integer_type, "REAL": TokenType.real_type},
+)
+
+
+class AstBuilder(object):
+    """Builds the same trees the parser builds from program text.
+
+    Names are checked and lower-cased like the lexer does, and every name
+    and number has a single token. A negative number becomes a unary minus
+    applied to a positive one, as in parsed text. Where an expression is
+    expected an int or float is turned into a number and a str into a
+    variable.
+
+    Attributes:
+        symbol_table: names of the variables used in the built trees
+    """
+
+    def __init__(self, symbol_table=None):
+        """Construct a new builder.
+
+        Args:
+            symbol_table: symbol table (a new one by default)
+        """
+        if symbol_table is None:
+            symbol_table = SymbolTable()
+        self.symbol_table = symbol_table
+        self._variables = {}
+        self._numbers = {}
+
+    def num(self, value):
+        """Return number node.
+
+        Args:
+            value: int or float
+
+        Raises:
+            TypeError: if value is not a number
+            ValueError: if value is not finite
+
+        Returns:
+            AST: Num, or UnaryOperation for a negative number
+        """
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError("Number expected, got {0!r}".format(value))
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError("Number is not finite: {0!r}".format(value))
+        if _is_negative(value):
+            return UnaryOperation(_UNARY_OPERATORS["-"], self.num(-value))
+        token = self._numbers.get((type(value), value))
+        if token is None:
+            token = _number_token(value)
+            self._numbers[(type(value), value)] = token
+        return Num(token)
+
+    def var(self, name):
+        """Return variable node.
+
+        A TypeError is raised if name is not a str, a ValueError if it is
+        not a valid name or is a keyword.
+
+        Args:
+            name: variable name
+
+        Returns:
+            Variable: variable node
+        """
+        return Variable(self._variable_token(name))
+
+    def binary(self, operator, left, right):
+        """Return binary operation node.
+
+        Args:
+            operator: "+", "-", "*" or "/"
+            left: left operand
+            right: right operand
+
+        Raises:
+            ValueError: if the operator is unknown
+
+        Returns:
+            BinaryOperation: operation node
+        """
+        token = _BINARY_OPERATORS.get(operator)
+        if token is None:
+            raise ValueError("Unknown binary operator {0!r}".format(operator))
+        return BinaryOperation(self._expression(left), token, self._expression(right))
+
+    def add(self, left, right):
+        """Return left + right.
+
+        Args:
+            left: left operand
+            right: right operand
+
+        Returns:
+            BinaryOperation: operation node
+        """
+        return self.binary("+", left, right)
+
+    def sub(self, left, right):
+        """Return left - right.
+
+        Args:
+            left: left operand
+            right: right operand
+
+        Returns:
+            BinaryOperation: operation node
+        """
+        return self.binary("-", left, right)
+
+    def mul(self, left, right):
+        """Return left * right.
+
+        Args:
+            left: left operand
+            right: right operand
+
+        Returns:
+            BinaryOperation: operation node
+        """
+        return self.binary("*", left, right)
+
+    def div(self, left, right):
+        """Return left / right.
+
+        Args:
+            left: left operand
+            right: right operand
+
+        Returns:
+            BinaryOperation: operation node
+        """
+        return self.binary("/", left, right)
+
+    def unary(self, operator, operand):
+        """Return unary operation node.
+
+        Args:
+            operator: "+" or "-"
+            operand: operand
+
+        Raises:
+            ValueError: if the operator is unknown
+
+        Returns:
+            UnaryOperation: operation node
+        """
+        token = _UNARY_OPERATORS.get(operator)
+        if token is None:
+            raise ValueError("Unknown unary operator {0!r}".format(operator))
+        return UnaryOperation(token, self._expression(operand))
+
+    def assign(self, variable, expression):
+        """Return assignment node.
+
+        Args:
+            variable: variable name or node
+            expression: assigned expression
+
+        Raises:
+            TypeError: if variable is not a name or a variable node
+
+        Returns:
+            AssignOperator: assignment node
+        """
+        if isinstance(variable, str):
+            variable = self.var(variable)
+        elif not isinstance(variable, Variable):
+            raise TypeError("Variable expected, got {0!r}".format(variable))
+        return AssignOperator(variable, _ASSIGN, self._expression(expression))
+
+    def assignments(self, pairs):
+        """Return assignment nodes.
+
+        Args:
+            pairs: iterable of (variable, expression)
+
+        Returns:
+            list: assignment nodes
+        """
+        assign = self.assign
+        return [assign(variable, expression) for variable, expression in pairs]
+
+    def empty(self):
+        """Return empty statement.
+
+        Returns:
+            EmptyOperator: empty statement
+        """
+        return EmptyOperator()
+
+    def compound(self, statements=()):
+        """Return compound statement.
+
+        Args:
+            statements: iterable of statement nodes
+
+        Raises:
+            TypeError: if an item is not a statement
+
+        Returns:
+            CompoundOperator: compound statement (BEGIN END holds an empty one)
+        """
+        statements = list(statements)
+        for statement in statements:
+            if not isinstance(statement, _STATEMENTS):
+                raise TypeError("Statement expected, got {0!r}".format(statement))
+        if not statements:
+            statements.append(EmptyOperator())
+        node = CompoundOperator()
+        node.set_compound_statement(statements)
+        return node
+
+    def program(self, name, declarations, body):
+        """Return program with declarations.
+
+        A ValueError is raised if a variable is declared twice or a type is
+        unknown.
+
+        Args:
+            name: program name
+            declarations: iterable of (variable name, "INTEGER" or "REAL")
+            body: compound statement or iterable of statements
+
+        Returns:
+            Program: program node
+        """
+        block = Block([])
+        variables = VariableTable()
+        for variable_name, type_name in declarations:
+            block.add_declaration(
+                self._declaration(variable_name, type_name, variables),
+            )
+        if not isinstance(body, CompoundOperator):
+            body = self.compound(body)
+        return Program(self.var(name), block, body, variables)
+
+    def _declaration(self, variable_name, type_name, variables):
+        """Return declaration node and declare the variable in the table.
+
+        Args:
+            variable_name: variable name
+            type_name: "INTEGER" or "REAL"
+            variables: table of the declared variables
+
+        Raises:
+            ValueError: if the variable is declared or the type is unknown
+
+        Returns:
+            VariableDeclaration: declaration node
+        """
+        type_keyword = str(type_name).upper()
+        if type_keyword not in _TYPES:
+            raise ValueError("Unknown type {0!r}".format(type_name))
+        variable = self.var(variable_name)
+        if variables.declare(variable.value, _TYPES[type_keyword]) is None:
+            raise ValueError("Duplicate identifier {0!r}".format(variable.value))
+        return VariableDeclaration(variable, make_keywords()[type_keyword])
+
+    def _variable_token(self, name):
+        if not isinstance(name, str):
+            raise TypeError("Variable name expected, got {0!r}".format(name))
+        token = self._variables.get(name)
+        if token is not None:
+            return token
+        if not _NAME.match(name):
+            raise ValueError("Invalid variable name {0!r}".format(name))
+        if name.upper() in make_keywords():
+            raise ValueError("Keyword used as a variable name: {0!r}".format(name))
+        lower = name.lower()
+        token = self._variables.get(lower)
+        if token is None:
+            token = make_variable(lower, self.symbol_table.intern(lower))
+            self._variables[lower] = token
+        self._variables[name] = token
+        return token
+
+    def _expression(self, operand):
+        operand_type = type(operand)
+        if operand_type in _EXPRESSION_TYPES:
+            return operand
+        if operand_type is str:
+            return Variable(self._variable_token(operand))
+        if operand_type in _NUMBER_TYPES:
+            return self.num(operand)
+        return self._subclass_expression(operand)
+
+    def _subclass_expression(self, operand):
+        if isinstance(operand, _EXPRESSIONS):
+            return operand
+        if isinstance(operand, str):
+            return self.var(operand)
+        if isinstance(operand, (int, float)) and not isinstance(operand, bool):
+            return self.num(operand)
+        raise TypeError("Expression expected, got {0!r}".format(operand))
+
+
+def _is_negative(value):
+    if value:
+        return value < 0
+    return math.copysign(1, value) < 0
+
+
+def _number_token(value):
+    """Return token of a non-negative number.
+
+    Args:
+        value: finite int or float
+
+    Returns:
+        Token: integer or real token
+    """
+    if isinstance(value, float):
+        return make_real(value)
+    return make_integer(value)
@@ -0,0 +1,340 @@
+# -*- coding:utf-8 -*-
+
+"""Compiling AST to bytecode and running it on a stack machine."""
+
+from array import array
+from types import MappingProxyType
+
+from interpreter.arena import (
+    ASSIGN,
+    BINARY,
+    COMPOUND,
+    EMPTY,
+    NUM,
+    PROGRAM,
+    UNARY,
+    VARIABLE,
+    VIEW_TYPES,
+)
+from interpreter.ast import (
+    AssignOperator,
+    BinaryOperation,
+    CompoundOperator,
+    EmptyOperator,
+    Num,
+    Program,
+    UnaryOperation,
+    Variable,
+)
+from interpreter.token import TokenType
+
+LOAD_CONST = 0
+LOAD_VARIABLE = 1
+STORE = 2
+ADD = 3
+SUBTRACT = 4
+MULTIPLY = 5
+DIVIDE = 6
+NEGATE = 7
+
+OPCODE_NAMES = (
+    "LOAD_CONST",
+    "LOAD_VARIABLE",
+    "STORE",
+    "ADD",
+    "SUBTRACT",
+    "MULTIPLY",
+    "DIVIDE",
+    "NEGATE",
+)
+
+_NEGATE = (NEGATE, 0)
+
+# Opcodes with a variable slot as the argument.
+_NAMED_OPCODES = frozenset((LOAD_VARIABLE, STORE))
+
+_OPERATIONS = MappingProxyType(
+    {opcode: (opcode, 0) for opcode in (ADD, SUBTRACT, MULTIPLY, DIVIDE)},
+)
+
+_NODE_KINDS = MappingProxyType(
+    {
+        Num: NUM,
+        Variable: VARIABLE,
+        BinaryOperation: BINARY,
+        UnaryOperation: UNARY,
+        AssignOperator: ASSIGN,
+        CompoundOperator: COMPOUND,
+        EmptyOperator: EMPTY,
+        Program: PROGRAM,
+    },
+)
+
+# Node kinds of the node types and of the arena views.
+_KINDS = MappingProxyType(
+    {
+        **_NODE_KINDS,
+        **{
+            view_type: _NODE_KINDS[node_type]
+            for view_type, node_type in VIEW_TYPES.items()
+        },
+    },
+)
+
+_BINARY_OPCODES = MappingProxyType(
+    {
+        TokenType.plus: ADD,
+        TokenType.minus: SUBTRACT,
+        TokenType.multiply: MULTIPLY,
+        TokenType.divide: DIVIDE,
+    },
+)
+
+
+class Bytecode(object):
+    """Compiled program.
+
+    An instruction is an opcode and an argument: the index of a constant
+    for LOAD_CONST, the slot of a variable for LOAD_VARIABLE and STORE, and
+    0 for the others. The code has no jumps, so instructions run in order.
+
+    Attributes:
+        operations: opcode of every instruction
+        arguments: argument of every instruction
+        constants: numbers used by the program
+        names: variable names, the slot of a variable is its index
+    """
+
+    __slots__ = ("operations", "arguments", "constants", "names")
+
+    def __init__(self):
+        """Construct empty code."""
+        self.operations = array("B")
+        self.arguments = array("I")
+        self.constants = []
+        self.names = []
+
+    def __len__(self):
+        """Return number of instructions.
+
+        Returns:
+            int: number of instructions
+        """
+        return len(self.operations)
+
+    def __iter__(self):
+        """Iterate over instructions.
+
+        Returns:
+            iterator: (opcode, argument) pairs
+        """
+        return zip(self.operations, self.arguments)
+
+    def __str__(self):
+        """Return disassembly, one instruction per line.
+
+        Returns:
+            str: disassembly
+        """
+        lines = []
+        for operation, argument in self:
+            name = OPCODE_NAMES[operation]
+            if operation == LOAD_CONST:
+                name = "{0} {1!r}".format(name, self.constants[argument])
+            elif operation in _NAMED_OPCODES:
+                name = "{0} {1}".format(name, self.names[argument])
+            lines.append(name)
+        return "\n".join(lines)
+
+
+class Compiler(object):
+    """Compiles AST to bytecode."""
+
+    def __init__(self):
+        """Construct a new compiler."""
+        self._code = Bytecode()
+        self._constants = {}
+        self._slots = {}
+
+    def compile(self, tree):
+        """Return bytecode of a tree.
+
+        Nodes are compiled in post-order without recursion, so deeply
+        nested expressions do not hit the recursion limit. An instruction
+        that has to follow the operands of a node waits on the work stack
+        as an (opcode, argument) tuple. A compiled expression leaves its
+        value on the stack.
+
+        A division by a literal zero compiles to LOAD_CONST 0 and its left
+        operand is not compiled. Unary plus emits nothing.
+
+        Args:
+            tree: abstract syntax tree or expression
+
+        Raises:
+            AttributeError: if the tree holds a node of an unknown type
+
+        Returns:
+            Bytecode: compiled code
+        """
+        emit_operation = self._code.operations.append
+        emit_argument = self._code.arguments.append
+        work = [tree]
+        while work:
+            node = work.pop()
+            node_type = type(node)
+            if node_type is tuple:
+                emit_operation(node[0])
+                emit_argument(node[1])
+                continue
+            kind = _KINDS.get(node_type)
+            if kind is None:
+                raise AttributeError("No handler found for {0}".format(node_type))
+            if kind == NUM:
+                emit_operation(LOAD_CONST)
+                emit_argument(self._constant(node.value))
+            elif kind == VARIABLE:
+                emit_operation(LOAD_VARIABLE)
+                emit_argument(self._slot(node.value))
+            elif kind == BINARY:
+                self._push_binary_operation(node, work)
+            elif kind == UNARY:
+                if node.op.type == TokenType.minus:
+                    work.append(_NEGATE)
+                work.append(node.expr)
+            elif kind == ASSIGN:
+                work.append((STORE, self._slot(node.variable.value)))
+                work.append(node.expr)
+            elif kind == COMPOUND:
+                work.extend(reversed(node.compound_statement))
+            elif kind == PROGRAM:
+                work.append(node.compound_statement)
+        return self._code
+
+    def _push_binary_operation(self, node, work):
+        opcode = _BINARY_OPCODES.get(node.op.type, DIVIDE)
+        if opcode == DIVIDE and _is_zero(node.right):
+            work.append((LOAD_CONST, self._constant(0)))
+            return
+        work.append(_OPERATIONS[opcode])
+        work.append(node.right)
+        work.append(node.left)
+
+    def _constant(self, value):
+        key = (type(value), value)
+        index = self._constants.get(key)
+        if index is None:
+            index = len(self._code.constants)
+            self._code.constants.append(value)
+            self._constants[key] = index
+        return index
+
+    def _slot(self, name):
+        slot = self._slots.get(name)
+        if slot is None:
+            slot = len(self._code.names)
+            self._code.names.append(name)
+            self._slots[name] = slot
+        return slot
+
+
+class VirtualMachine(object):
+    """Runs bytecode with the results of CalculationVisitor."""
+
+    def __init__(self, global_scope):
+        """Construct a new machine.
+
+        Args:
+            global_scope (dict): global scope for storing variables
+        """
+        self._global_scope = global_scope
+
+    def run(self, code):
+        """Run code.
+
+        Variables are copied from the global scope into slots before the
+        run and back after it, also when the run fails with a NameError
+        for a variable used before it is assigned.
+
+        Args:
+            code: Bytecode
+
+        Raises:
+            Exception: error of the run, after the variables are copied back
+
+        Returns:
+            result: value of a compiled expression, None for statements
+        """
+        slots = [self._global_scope.get(name) for name in code.names]
+        try:
+            result = _execute(code, slots)
+        except Exception:
+            self._store(code.names, slots)
+            raise
+        self._store(code.names, slots)
+        return result
+
+    def _store(self, names, slots):
+        for name, value in zip(names, slots):
+            if value is not None:
+                self._global_scope[name] = value
+
+
+def compile_tree(tree):
+    """Return bytecode of a tree.
+
+    Args:
+        tree: abstract syntax tree
+
+    Returns:
+        Bytecode: compiled code
+    """
+    return Compiler().compile(tree)
+
+
+def _is_zero(node):
+    return isinstance(node, Num) and node.value == 0
+
+
+def _execute(code, slots):
+    """Run the instructions of code.
+
+    Args:
+        code: Bytecode
+        slots: values of the variables, None for unassigned ones
+
+    Raises:
+        NameError: if a variable is used before it is assigned
+
+    Returns:
+        result: value left on the stack, or None
+    """
+    constants = code.constants
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for operation, argument in zip(code.operations, code.arguments):
+        if operation == LOAD_VARIABLE:
+            value = slots[argument]
+            if value is None:
+                raise NameError(repr(code.names[argument]))
+            push(value)
+        elif operation == LOAD_CONST:
+            push(constants[argument])
+        elif operation == STORE:
+            slots[argument] = pop()
+        elif operation == ADD:
+            right = pop()
+            stack[-1] += right
+        elif operation == SUBTRACT:
+            right = pop()
+            stack[-1] -= right
+        elif operation == MULTIPLY:
+            right = pop()
+            stack[-1] *= right
+        elif operation == DIVIDE:
+            right = pop()
+            stack[-1] /= right
+        elif operation == NEGATE:
+            stack[-1] = -stack[-1]
+    return stack[-1] if stack else None
@@ -0,0 +1,180 @@
+# -*- coding:utf-8 -*-
+
+"""Cache of parsed programs keyed by a hash of the program text."""
+
+import hashlib
+import os
+import pickle  # noqa: S403
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Bump when the pickled form of cached values changes.
+_FORMAT_VERSION = b"2"
+
+_DISK_ERRORS = (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError)
+
+
+class SourceCache(object):
+    """LRU cache of values built from a program text.
+
+    Entries are keyed by the SHA-256 of the text, so the text itself is not
+    kept in memory. With a directory every built value is also pickled
+    into it and a new cache over the same directory starts warm. Only
+    point it at a directory the process trusts: entries are unpickled.
+
+    Attributes:
+        maxsize: largest number of entries kept in memory
+        directory: directory of the disk cache or None
+        hits: number of lookups served from memory
+        disk_hits: number of lookups served from the directory
+        misses: number of lookups that built the value
+        evictions: number of entries dropped from memory
+    """
+
+    def __init__(self, maxsize=1024, directory=None):
+        """Construct an empty cache.
+
+        Args:
+            maxsize: largest number of entries kept in memory
+            directory: directory of the disk cache (created if missing)
+
+        Raises:
+            ValueError: if maxsize is negative
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative")
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text, build):
+        """Return the cached value of the text, building it on a miss.
+
+        Exceptions raised by build are not cached.
+
+        Args:
+            text: program text
+            build: function returning the value for the text
+
+        Returns:
+            value: cached or built value
+        """
+        key = source_key(text)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        value = _load(self.directory, key)
+        if value is None:
+            value = build(text)
+            _store(self.directory, key, value)
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.disk_hits += 1
+        self._remember(key, value)
+        return value
+
+    def clear(self):
+        """Drop all entries from memory and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self):
+        """Return number of entries in memory.
+
+        Returns:
+            int: number of entries
+        """
+        return len(self._entries)
+
+    def __contains__(self, text):
+        """Return True if the value of the text is in memory.
+
+        Args:
+            text: program text
+
+        Returns:
+            bool: True if the value is in memory
+        """
+        return source_key(text) in self._entries
+
+    def _remember(self, key, value):
+        with self._lock:
+            if not self.maxsize:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+def source_key(text):
+    """Return cache key of a program text.
+
+    Args:
+        text: program text
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256(_FORMAT_VERSION)
+    digest.update(text.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def _entry_path(directory, key):
+    return os.path.join(directory, "{0}.pickle".format(key))
+
+
+def _load(directory, key):
+    if directory is None:
+        return None
+    try:
+        with open(_entry_path(directory, key), "rb") as cache_file:
+            return pickle.load(cache_file)  # noqa: S301
+    except _DISK_ERRORS:
+        return None
+
+
+def _store(directory, key, value):
+    """Write the value to the directory, skipping it if that fails.
+
+    The file is written under a temporary name and renamed, so a
+    concurrent reader never sees a partial entry.
+
+    Args:
+        directory: directory of the disk cache or None
+        key: entry key
+        value: value to write
+    """
+    if directory is None:
+        return
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        _write_entry(descriptor, temporary, _entry_path(directory, key), value)
+    except (OSError, RecursionError, pickle.PicklingError):
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def _write_entry(descriptor, temporary, path, value):
+    with os.fdopen(descriptor, "wb") as cache_file:
+        pickle.dump(value, cache_file, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
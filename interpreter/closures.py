@@ -0,0 +1,245 @@
+# -*- coding:utf-8 -*-
+
+"""Compiling AST to nested Python closures."""
+
+from types import MappingProxyType
+
+from interpreter.ast import (
+    AssignOperator,
+    BinaryOperation,
+    CompoundOperator,
+    EmptyOperator,
+    Num,
+    Program,
+    UnaryOperation,
+    Variable,
+)
+from interpreter.dispatcher import NodeDispatcher
+from interpreter.token import TokenType
+
+
+class ClosureCompiler(NodeDispatcher):
+    """Turns every AST node into a closure once.
+
+    A closure takes the global scope and returns the value of its node, so
+    running a program is a chain of plain calls: node types and operators
+    are resolved when the closures are made, not on every run. The results
+    are those of CalculationVisitor.
+    """
+
+    _handlers = {
+        Num: "_compile_num",
+        BinaryOperation: "_compile_binary_operation",
+        UnaryOperation: "_compile_unary_operation",
+        CompoundOperator: "_compile_compound_operator",
+        EmptyOperator: "_compile_empty_operator",
+        AssignOperator: "_compile_assign_operator",
+        Variable: "_compile_variable",
+        Program: "_compile_program",
+    }
+
+    def compile(self, node):
+        """Return closure of a node.
+
+        The AttributeError of dispatch is raised for a node of an unknown
+        type.
+
+        Args:
+            node: node to compile
+
+        Returns:
+            function: closure taking the global scope
+        """
+        return self.dispatch(node)
+
+    def _compile_num(self, node):
+        value = node.value
+
+        def num(scope):
+            return value
+
+        return num
+
+    def _compile_variable(self, node):
+        """Compile Variable node.
+
+        Args:
+            node: variable
+
+        Returns:
+            function: closure raising NameError if the variable is not in scope
+        """
+        name = node.value
+
+        def variable(scope):
+            value = scope.get(name)
+            if value is None:
+                raise NameError(repr(name))
+            return value
+
+        return variable
+
+    def _compile_binary_operation(self, node):
+        """Compile BinaryOperation node.
+
+        A literal zero divisor gives a closure returning 0, and the left
+        operand is not compiled at all. A number on the right is kept in the
+        closure instead of being called.
+
+        Args:
+            node: binary operation
+
+        Returns:
+            function: closure of the operation
+        """
+        operator = node.op.type
+        if operator == TokenType.divide and _is_zero(node.right):
+            return _zero
+        left = self.compile(node.left)
+        if isinstance(node.right, Num):
+            make = _CONSTANT_OPERATIONS.get(operator, _divide_constant)
+            return make(left, node.right.value)
+        make = _OPERATIONS.get(operator, _divide)
+        return make(left, self.compile(node.right))
+
+    def _compile_unary_operation(self, node):
+        """Compile UnaryOperation node. Unary plus adds no closure.
+
+        Args:
+            node: unary operation
+
+        Returns:
+            function: closure of the operation
+        """
+        operand = self.compile(node.expr)
+        if node.op.type == TokenType.minus:
+            return lambda scope: -operand(scope)
+        return operand
+
+    def _compile_compound_operator(self, node):
+        """Compile CompoundOperator node. Empty statements are dropped.
+
+        Args:
+            node: compound operator
+
+        Returns:
+            function: closure running the statements
+        """
+        statements = tuple(
+            self.compile(statement)
+            for statement in node.compound_statement
+            if not isinstance(statement, EmptyOperator)
+        )
+
+        def compound(scope):
+            for statement in statements:
+                statement(scope)
+
+        return compound
+
+    def _compile_empty_operator(self, node):
+        return _empty
+
+    def _compile_assign_operator(self, node):
+        """Compile AssignOperator node.
+
+        Args:
+            node: assignment
+
+        Returns:
+            function: closure saving the value in the global scope
+        """
+        name = node.variable.value
+        expression = self.compile(node.expr)
+
+        def assign(scope):
+            scope[name] = expression(scope)
+
+        return assign
+
+    def _compile_program(self, node):
+        return self.compile(node.compound_statement)
+
+
+def compile_closures(tree):
+    """Return closure running a tree.
+
+    Compile once and call the closure for every run.
+
+    Args:
+        tree: abstract syntax tree
+
+    Returns:
+        function: closure taking the global scope (dict) and returning the
+            value of an expression, None for statements
+    """
+    return ClosureCompiler().compile(tree)
+
+
+def _add(left, right):
+    return lambda scope: left(scope) + right(scope)
+
+
+def _subtract(left, right):
+    return lambda scope: left(scope) - right(scope)
+
+
+def _multiply(left, right):
+    return lambda scope: left(scope) * right(scope)
+
+
+def _divide(left, right):
+    return lambda scope: left(scope) / right(scope)
+
+
+def _add_constant(operand, constant):
+    return lambda scope: operand(scope) + constant
+
+
+def _subtract_constant(operand, constant):
+    return lambda scope: operand(scope) - constant
+
+
+def _multiply_constant(operand, constant):
+    return lambda scope: operand(scope) * constant
+
+
+def _divide_constant(operand, constant):
+    return lambda scope: operand(scope) / constant
+
+
+# Function making the closure of an operation, by operator.
+_OPERATIONS = MappingProxyType(
+    {
+        TokenType.plus: _add,
+        TokenType.minus: _subtract,
+        TokenType.multiply: _multiply,
+        TokenType.divide: _divide,
+    },
+)
+
+# Same for an operation with a number on the right.
+_CONSTANT_OPERATIONS = MappingProxyType(
+    {
+        TokenType.plus: _add_constant,
+        TokenType.minus: _subtract_constant,
+        TokenType.multiply: _multiply_constant,
+        TokenType.divide: _divide_constant,
+    },
+)
+
+
+def _is_zero(node):
+    return isinstance(node, Num) and node.value == 0
+
+
+def _empty(scope):
+    """Run an empty statement.
+
+    Args:
+        scope: global scope
+    """
+
+
+def _zero(scope):
+    return 0
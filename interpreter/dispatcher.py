@@ -0,0 +1,44 @@
+# -*- coding:utf-8 -*-
+
+"""Calling a method chosen by the type of an AST node."""
+
+from interpreter.arena import VIEW_TYPES
+
+
+class NodeDispatcher(object):
+    """Base of the passes that have a method for every node type.
+
+    A subclass names the method of every node class in _handlers. Views of
+    an AstArena get the method of their node class.
+    """
+
+    _handlers = {}
+
+    def __init__(self):
+        """Bind the methods named in _handlers."""
+        self._methods = {
+            node_type: getattr(self, name) for node_type, name in self._handlers.items()
+        }
+        for view_type, node_type in VIEW_TYPES.items():
+            method = self._methods.get(node_type)
+            if method is not None:
+                self._methods[view_type] = method
+
+    def dispatch(self, node):
+        """Return the result of the method for the type of the node.
+
+        Args:
+            node: node of a tree
+
+        Raises:
+            AttributeError: if the node has an unknown type
+
+        Returns:
+            result: result of the method
+        """
+        method = self._methods.get(type(node))
+        if method is None:
+            raise AttributeError(
+                "No handler found for {0}".format(type(node)),
+            )
+        return method(node)
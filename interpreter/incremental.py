@@ -0,0 +1,366 @@
+# -*- coding:utf-8 -*-
+
+"""Incremental parsing of an edited token buffer."""
+
+from bisect import bisect_left, bisect_right
+
+from interpreter.ast import CompoundOperator, Program
+from interpreter.lexer import relex_token_buffer
+from interpreter.parser import InvalidSyntaxError, Parser
+from interpreter.token import TokenType
+from interpreter.token_buffer import TokenCursor
+
+
+class ParseTree(object):
+    """AST of a token buffer that is updated after edits.
+
+    Besides the AST the tree keeps the token span of every statement of
+    every compound statement. After an edit only the statements of the
+    innermost compound statement that hold the changed tokens are parsed
+    again. The compound statements on the path from the root to it are
+    new nodes, all other nodes are the objects of the previous AST.
+
+    Attributes:
+        buffer: token buffer of the program
+        ast: abstract syntax tree of the buffer
+        full_parses: number of times the whole buffer was parsed
+    """
+
+    def __init__(self, buffer):
+        """Parse the buffer.
+
+        The InvalidSyntaxError of the parser is raised for an invalid
+        program.
+
+        Args:
+            buffer: token buffer
+        """
+        self.buffer = buffer
+        self.ast = None
+        self.full_parses = 0
+        self._root = None
+        self._length = 0
+        self._parse()
+
+    def edit(self, offset, deleted_length, inserted_text):
+        """Edit the program text and update the AST.
+
+        Args:
+            offset: position of the edit
+            deleted_length: number of deleted characters
+            inserted_text: inserted text
+
+        Returns:
+            tree: abstract syntax tree of the new text
+        """
+        _, start, stop = relex_token_buffer(
+            self.buffer,
+            self.buffer.source,
+            offset,
+            deleted_length,
+            inserted_text,
+        )
+        return self.reparse(start, stop)
+
+    def reparse(self, start, stop):
+        """Update the AST after the buffer was relexed.
+
+        The whole buffer is parsed again if the edit touches the program
+        header or declarations, or if the new statements do not end at a
+        statement boundary of the old AST. The InvalidSyntaxError of the
+        parser is raised if the new program is invalid.
+
+        Args:
+            start: index of the first changed token
+            stop: index after the last changed token in the updated buffer
+
+        Returns:
+            tree: abstract syntax tree of the buffer
+        """
+        shift = len(self.buffer) - self._length
+        node = self._reparse_body(start, stop - shift, shift)
+        if node is None:
+            return self._parse()
+        self._length = len(self.buffer)
+        self._set_body(node)
+        return self.ast
+
+    def _set_body(self, node):
+        """Replace the compound statement of the AST.
+
+        Args:
+            node: new compound statement of the program
+        """
+        if isinstance(self.ast, Program):
+            self.ast = Program(
+                self.ast.name,
+                self.ast.block,
+                node,
+                self.ast.variables,
+            )
+        else:
+            self.ast = node
+
+    def _reparse_body(self, start, stop, shift):
+        """Return compound statement of the program with the edit parsed.
+
+        Args:
+            start: index of the first changed token
+            stop: index after the last changed token in the old buffer
+            shift: change of the number of tokens
+
+        Returns:
+            CompoundOperator: new compound statement of the program, or
+                None if the whole buffer has to be parsed again
+        """
+        if self._root is None or not self._root.contains(start, stop):
+            return None
+        path, span, first, last = _statement_path(self._root, start, stop)
+        try:
+            new_span, last = self._reparse_statements(span, first, last, shift)
+        except InvalidSyntaxError:
+            return None
+        if new_span is None:
+            return None
+        return _replace_path(path, span.splice(first, last, new_span, shift), shift)
+
+    def _parse(self):
+        self._root = None
+        self.full_parses += 1
+        parser = _SpanParser(self.buffer)
+        self.ast = parser.parse()
+        self._root = parser.last_span
+        self._length = len(self.buffer)
+        return self.ast
+
+    def _reparse_statements(self, span, first, last, shift):
+        """Parse statements from the start of statement first.
+
+        Parsing stops at the first separator that is at least at the end
+        of statement last and is a separator of the old AST.
+
+        Args:
+            span: span of the compound statement
+            first: index of the first changed statement
+            last: index of the last changed statement
+            shift: change of the number of tokens
+
+        Returns:
+            tuple: new statements and their spans (_CompoundSpan) and the
+                index of the last replaced statement, or (None, None) if
+                they do not end at an old statement boundary
+        """
+        cursor = TokenCursor(self.buffer)
+        cursor.index = span.starts[first]
+        parser = _SpanParser(cursor)
+        new_span = _CompoundSpan(None, span.begin)
+        while True:
+            parser.add_statement(new_span)
+            index = parser.current_index
+            while span.ends[last] + shift < index:
+                last += 1
+                if last == len(span.ends):
+                    return None, None
+            if span.ends[last] + shift == index:
+                return new_span, last
+            if parser.current_type != TokenType.semi:
+                return None, None
+            parser.eat_semi()
+
+
+def _statement_path(span, start, stop):
+    """Return the innermost compound statement holding the changed tokens.
+
+    Args:
+        span: span of the outermost compound statement
+        start: index of the first changed token
+        stop: index after the last changed token in the old buffer
+
+    Returns:
+        tuple: (parent span, statement index) pairs from the root down,
+            span of the compound statement, index of its first and of its
+            last changed statement
+    """
+    path = []
+    while True:
+        first = bisect_left(span.ends, start)
+        last = bisect_right(span.starts, stop) - 1
+        child = span.children[first]
+        if first != last or child is None or not child.contains(start, stop):
+            return path, span, first, last
+        path.append((span, first))
+        span = child
+
+
+def _replace_path(path, node, shift):
+    """Return root compound statement with a new innermost statement.
+
+    Args:
+        path: (parent span, statement index) pairs from the root down
+        node: new innermost compound statement
+        shift: change of the number of tokens
+
+    Returns:
+        CompoundOperator: new root compound statement
+    """
+    for parent, index in reversed(path):
+        parent.ends[index] += shift
+        _shift_statements(parent, index + 1, shift)
+        node = parent.replace(index, node)
+    return node
+
+
+class _CompoundSpan(object):
+    """Token spans of the statements of a compound statement."""
+
+    __slots__ = ("node", "begin", "starts", "ends", "children", "statements")
+
+    def __init__(self, node, begin):
+        """Construct an empty span.
+
+        Args:
+            node: compound statement
+            begin: index of the BEGIN token
+        """
+        self.node = node
+        self.begin = begin
+        self.starts = []
+        self.ends = []
+        self.children = []
+        self.statements = []
+
+    def contains(self, start, stop):
+        """Return True if the tokens lie between BEGIN and END.
+
+        Args:
+            start: index of the first token
+            stop: index after the last token
+
+        Returns:
+            bool: True if the tokens lie between BEGIN and END
+        """
+        return self.begin < start and stop <= self.ends[-1]
+
+    def splice(self, first, last, new_span, shift):
+        """Replace statements with new ones and return the new node.
+
+        Args:
+            first: index of the first replaced statement
+            last: index of the last replaced statement
+            new_span: new statements
+            shift: change of the number of tokens
+
+        Returns:
+            CompoundOperator: new compound statement
+        """
+        stop = last + 1
+        _shift_statements(self, stop, shift)
+        self.starts[first:stop] = new_span.starts
+        self.ends[first:stop] = new_span.ends
+        self.children[first:stop] = new_span.children
+        statements = list(self.node.compound_statement)
+        statements[first:stop] = new_span.statements
+        return self._rebuild(statements)
+
+    def replace(self, index, statement):
+        """Replace one statement and return the new node.
+
+        Args:
+            index: index of the statement
+            statement: new statement
+
+        Returns:
+            CompoundOperator: new compound statement
+        """
+        statements = list(self.node.compound_statement)
+        statements[index] = statement
+        return self._rebuild(statements)
+
+    def _rebuild(self, statements):
+        self.node = CompoundOperator()
+        self.node.set_compound_statement(statements)
+        return self.node
+
+
+class _SpanParser(Parser):
+    """Parser that records the token spans of statements."""
+
+    def __init__(self, lexer):
+        """Construct a new parser.
+
+        Args:
+            lexer: token buffer or cursor over it
+        """
+        self.last_span = None
+        super().__init__(lexer)
+
+    @property
+    def current_index(self):
+        """Return index of the current token.
+
+        Returns:
+            int: token index
+        """
+        return self._index
+
+    def add_statement(self, span):
+        """Parse a statement and add it with its span.
+
+        Args:
+            span: span of the enclosing compound statement
+        """
+        span.starts.append(self._index)
+        self.last_span = None
+        statement = self._statement()
+        span.ends.append(self._index)
+        span.statements.append(statement)
+        child = self.last_span
+        span.children.append(child if child and child.node is statement else None)
+
+    def eat_semi(self):
+        """Eat the statement separator."""
+        self._eat(TokenType.semi)
+
+    def _compound_statement(self):
+        """Return the result of a nonterminal term.
+
+        Returns:
+            compound statement : BEGIN statement list END
+        """
+        span = _CompoundSpan(None, self._index)
+        self._eat(TokenType.begin)
+        self.add_statement(span)
+        while self.current_type == TokenType.semi:
+            self._eat(TokenType.semi)
+            self.add_statement(span)
+        self._eat(TokenType.end)
+        span.node = CompoundOperator()
+        span.node.set_compound_statement(span.statements)
+        span.statements = []
+        self.last_span = span
+        return span.node
+
+
+def _shift_statements(span, first, shift):
+    """Move the spans of statements from first on, with their children.
+
+    Args:
+        span: span of a compound statement
+        first: index of the first moved statement
+        shift: value added to token indexes
+    """
+    if not shift:
+        return
+    stack = [(span, first)]
+    while stack:
+        span, first = stack.pop()
+        _shift_items(span.starts, first, shift)
+        _shift_items(span.ends, first, shift)
+        for child in span.children[first:]:
+            if child is not None:
+                child.begin += shift
+                stack.append((child, 0))
+
+
+def _shift_items(items, first, shift):
+    items[first:] = [item + shift for item in items[first:]]
@@ -2,21 +2,138 @@
 
 """Interpreter's implementation."""
 
-from interpreter.lexer import get_token
+from types import MappingProxyType
+
+from interpreter.bytecode import VirtualMachine, compile_tree
+from interpreter.cache import SourceCache
+from interpreter.closures import compile_closures
+from interpreter.lexer import get_token_buffer, get_token_stream
 from interpreter.parser import Parser
+from interpreter.resolver import resolve_slots
+from interpreter.symbol_table import SlotScope
+from interpreter.transpiler import compile_python
 from interpreter.visitor import CalculationVisitor
 
+# Parsed programs shared by interpret() calls without an explicit cache.
+DEFAULT_CACHE = SourceCache()
+
+ENGINES = ("visitor", "slots", "bytecode", "closure", "python")
+
+# Compiled programs of the engines that compile the AST, kept in memory
+# only because closures and functions cannot be pickled.
+COMPILED_CACHES = MappingProxyType({engine: SourceCache() for engine in ENGINES[1:]})
+
+
+def _resolve(ast):
+    tree, scope = resolve_slots(ast)
+    return tree, tuple(scope.names)
+
+
+def _run_slots(compiled, global_scope):
+    tree, names = compiled
+    slot_scope = SlotScope(names)
+    CalculationVisitor(slot_scope).visit(tree)
+    global_scope.update(slot_scope)
+
+
+def _run_bytecode(compiled, global_scope):
+    VirtualMachine(global_scope).run(compiled)
+
+
+def _run_function(compiled, global_scope):
+    compiled(global_scope)
+
+
+_COMPILERS = MappingProxyType(
+    {
+        "slots": _resolve,
+        "bytecode": compile_tree,
+        "closure": compile_closures,
+        "python": compile_python,
+    },
+)
+
+# Function running a compiled program on the global scope, by engine.
+_RUNNERS = MappingProxyType(
+    {
+        "slots": _run_slots,
+        "bytecode": _run_bytecode,
+        "closure": _run_function,
+        "python": _run_function,
+    },
+)
+
+
+def parse(text):
+    """Return AST of a program.
+
+    Args:
+        text: program text
+
+    Returns:
+        tree: abstract syntax tree
+    """
+    return Parser(get_token_buffer(text)).parse()
 
-def interpret(text):
+
+def interpret(text, cache=None, engine="visitor"):
     """Execute program.
 
+    The AST is taken from the cache, so a program seen before is not lexed
+    and parsed again. The compiling engines also keep the compiled program
+    in COMPILED_CACHES, so it is compiled once and run many times.
+
+    The "visitor" engine walks the AST, "slots" walks it with variables
+    resolved to slots of a list, "bytecode" runs it compiled on the stack
+    machine, "closure" runs it compiled to closures and "python" runs it
+    translated to a Python function.
+
     Args:
         text: program text
+        cache: SourceCache of parsed programs (DEFAULT_CACHE by default)
+        engine: name of the engine, one of ENGINES
+
+    Raises:
+        ValueError: if the engine is unknown
+
+    Returns:
+        dict: values of the variables after execution
+    """
+    if engine not in ENGINES:
+        raise ValueError("Unknown engine {0!r}".format(engine))
+    if cache is None:
+        cache = DEFAULT_CACHE
+    global_scope = {}
+    if engine == "visitor":
+        CalculationVisitor(global_scope).visit(cache.get(text, parse))
+        return global_scope
+    compiled = COMPILED_CACHES[engine].get(
+        text,
+        lambda source: _COMPILERS[engine](cache.get(source, parse)),
+    )
+    _RUNNERS[engine](compiled, global_scope)
+    return global_scope
+
+
+def interpret_stream(source, global_scope=None):
+    """Execute program while it is being read.
+
+    Every top-level statement is executed as soon as it is parsed and then
+    dropped, and the lexer keeps a bounded table of shared literal tokens,
+    so memory grows with the largest statement and the number of distinct
+    variable names, not with the number of statements. The first
+    statements run before the rest of the program is read.
+
+    Args:
+        source: path to the program, or a file object (see get_token_stream)
+        global_scope: dict for the variables (a new one by default)
 
     Returns:
-        result: calculation result
+        dict: values of the variables after execution
     """
-    parser = Parser(get_token(text))
-    ast = parser.parse()
-    visitor = CalculationVisitor()
-    return visitor.visit(ast)
+    if global_scope is None:
+        global_scope = {}
+    visitor = CalculationVisitor(global_scope)
+    for statement in Parser(get_token_stream(source)).statements():
+        visitor.visit(statement)
+    return global_scope
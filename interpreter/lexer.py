@@ -3,16 +3,27 @@
 """Lexer implementation. Simple lexer for large subset of Pascal language."""
 
 
-from itertools import takewhile
-
+import codecs
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, product, takewhile
+from operator import ne
+from types import MappingProxyType
+
+from interpreter.symbol_table import SymbolTable
 from interpreter.token import (
+    TokenType,
     make_eof,
     make_integer,
     make_keywords,
+    make_real,
     make_single_symbol_token,
     make_single_symbols,
     make_variable,
 )
+from interpreter.token_buffer import TokenBuffer
 
 
 class TextIterator(object):
@@ -68,24 +79,223 @@ class TextIterator(object):
         return self.current_char
 
 
-def get_tokens(text):
+_TOKEN_REGEX = re.compile(
+    r"""
+    (?P<skip>\s+|\{[^}]*\}?)
+    |(?P<word>[^\W\d_][^\W_]*)
+    |(?P<real>\d+\.\d+)
+    |(?P<integer>\d+)
+    |(?P<symbol>:=|[-+*/().;:,])
+    |(?P<unknown>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_LITERALS = frozenset(("word", "integer", "real"))
+
+
+def _make_keyword_variants():
+    """Return keyword tokens by every upper and lower case spelling.
+
+    Returns:
+        mapping: key(str), value(Token)
+    """
+    variants = {}
+    for keyword, token in make_keywords().items():
+        pairs = ((char.upper(), char.lower()) for char in keyword)
+        for spelling in product(*pairs):
+            variants["".join(spelling)] = token
+    return MappingProxyType(variants)
+
+
+_KEYWORD_VARIANTS = _make_keyword_variants()
+
+_LITERAL_TYPES = frozenset((TokenType.variable, TokenType.integer, TokenType.real))
+
+_CHUNK_SIZE = 64 * 1024
+
+# Characters opening and closing a comment.
+_COMMENT_START = "{"
+
+_COMMENT_END = "}"
+
+# Largest number of shared literal tokens kept while lexing a stream.
+_STREAM_LITERALS = 8 * 1024
+
+
+def get_tokens(text, engine=None, workers=1):
     """Return tokens.
 
     Args:
         text: program text
+        engine: token generator function (get_token by default)
+        workers: number of processes lexing the text (default engine only)
 
     Returns:
         tokens: token iterator
     """
+    if workers > 1:
+        return iter(get_token_buffer(text, workers=workers))
+    if engine is None:
+        engine = get_token
     tokens = []
-    for token in get_token(text):
+    for token in engine(text):
         tokens.append(token)
     return iter(tokens)
 
 
-def get_token(text):
+def get_token(text, symbol_table=None):
     """Return token generator.
 
+    The whole text is scanned by a single compiled regular expression,
+    so the work per token is one match instead of one call per character.
+    Repeated identifiers and numbers share one token object, so every
+    distinct number literal is converted once. Keywords are recognized in
+    any letter case, identifiers are lower-cased, and variable tokens carry
+    the id of their name in the symbol table.
+
+    Args:
+        text: program text
+        symbol_table: table to add variable names to (a new one by default)
+
+    Yields:
+        tokens: token iterator
+    """
+    if symbol_table is None:
+        symbol_table = SymbolTable()
+    literals = dict(_KEYWORD_VARIANTS)
+    symbols = make_single_symbols()
+    for match in _TOKEN_REGEX.finditer(text):
+        kind = match.lastgroup
+        if kind == "symbol":
+            yield symbols[match.group()]
+        elif kind in _LITERALS:
+            lexeme = match.group()
+            token = literals.get(lexeme)
+            if token is None:
+                token = _make_literal(kind, lexeme, literals, symbol_table)
+                literals[lexeme] = token
+            yield token
+    yield make_eof()
+
+
+def get_token_buffer(text, workers=1, symbol_table=None):
+    """Return all tokens of the text packed into a token buffer.
+
+    With several workers the text is split after semicolons that are not
+    inside comments, the parts are lexed in a process pool and joined.
+
+    Args:
+        text: program text
+        workers: number of processes lexing the text
+        symbol_table: table to add variable names to (a new one by default)
+
+    Returns:
+        TokenBuffer: tokens with their source offsets
+    """
+    if workers > 1:
+        buffer = _lex_parallel(text, workers, symbol_table)
+    else:
+        buffer = _lex_buffer(text, symbol_table)
+        buffer.source = text
+    buffer.append(make_eof(), len(text), len(text))
+    return buffer
+
+
+def relex_token_buffer(buffer, text, offset, deleted_length, inserted_text):
+    """Update token buffer after an edit of the program text.
+
+    Lexing restarts after the last token that ends at least two characters
+    before the edit (a number followed by "." depends on the character after
+    the dot) and stops as soon as a new token starts where an old token after
+    the edit starts, because from that point on the token stream is the same
+    as before. Relexed tokens before the edit that did not change are not
+    replaced. The tokens after the edit are moved by TokenBuffer.replace
+    without rewriting their offsets, and the literal table is kept on the
+    buffer, so the cost of an edit does not grow with the size of the
+    buffer (apart from copying the text).
+
+    Args:
+        buffer: token buffer of the text, updated in place
+        text: program text before the edit
+        offset: position of the edit
+        deleted_length: number of deleted characters
+        inserted_text: inserted text
+
+    Returns:
+        tuple: new program text, index of the first changed token and index
+            after the last changed token in the updated buffer
+    """
+    new_text = "".join(
+        (text[:offset], inserted_text, text[offset + deleted_length :]),
+    )
+    shift = len(inserted_text) - deleted_length
+    first = buffer.find_end(offset - 1)
+    restart = buffer.end(first - 1) if first else 0
+    old = buffer.find_start(offset + deleted_length, first)
+    if buffer.literals is None:
+        buffer.literals = _buffer_literals(buffer)
+    symbols = make_single_symbols()
+    tokens = []
+    for match in _TOKEN_REGEX.finditer(new_text, restart):
+        token = _match_token(match, buffer.literals, symbols, buffer.symbol_table)
+        if token is None:
+            continue
+        token_start = match.start()
+        while buffer.start(old) + shift < token_start:
+            old += 1
+        if buffer.start(old) + shift == token_start:
+            break
+        tokens.append((token, token_start, match.end()))
+    else:
+        old = len(buffer) - 1
+    same = 0
+    for token, token_start, _ in tokens:
+        index = first + same
+        if index >= old or buffer.start(index) != token_start:
+            break
+        if buffer[index] is not token:
+            break
+        same += 1
+    first += same
+    tokens = tokens[same:]
+    buffer.replace(first, old, tokens, shift)
+    buffer.source = new_text
+    return new_text, first, first + len(tokens)
+
+
+def get_token_stream(source, chunk_size=_CHUNK_SIZE, symbol_table=None):
+    """Return token generator reading the program in bounded chunks.
+
+    Tokens and comments that straddle a chunk boundary are carried over to
+    the next chunk, so memory does not grow with the size of the program.
+
+    An object read from returns str or utf-8 bytes from read(size), as a
+    text file, a binary file or an mmap does.
+
+    Args:
+        source: path to the program, or an object with a read(size) method
+        chunk_size: number of characters (or bytes) read at once
+        symbol_table: table to add variable names to (a new one by default)
+
+    Yields:
+        tokens: token iterator
+    """
+    if symbol_table is None:
+        symbol_table = SymbolTable()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as program_file:
+            chunks = _read_chunks(program_file, chunk_size)
+            yield from _lex_chunks(chunks, symbol_table)
+    else:
+        yield from _lex_chunks(_read_chunks(source, chunk_size), symbol_table)
+
+
+def get_token_by_char(text):
+    """Return token generator walking the text one character at a time.
+
+    This is the original lexer engine, kept for comparison with get_token.
+
     Args:
         text: program text
 
@@ -98,15 +308,15 @@ def get_token(text):
     for char in iterator:
         if char.isspace():
             continue
-        if char == "{":
+        if char == _COMMENT_START:
             _skip_comment(iterator)
             continue
         if char.isalpha():
             word = _parse_word(char, iterator)
             char = iterator.current_item
-            yield keywords.get(word, make_variable(word))
+            yield keywords.get(word.upper()) or make_variable(word.lower())
         if char.isdigit():
-            token = make_integer(_parse_integer(char, iterator))
+            token = _make_number(_parse_number(char, iterator))
             char = iterator.current_item
             yield token
         if char == ":" and iterator.next_char == "=":
@@ -118,8 +328,246 @@ def get_token(text):
     yield make_eof()
 
 
+def _read_chunks(source, chunk_size):
+    decoder = None
+    chunk = source.read(chunk_size)
+    while chunk:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+            yield decoder.decode(chunk)
+        else:
+            yield chunk
+        chunk = source.read(chunk_size)
+    if decoder is not None:
+        yield decoder.decode(b"", final=True)
+
+
+def _lex_chunks(chunks, symbol_table):
+    """Yield tokens of the chunks.
+
+    The table of shared identifier and number tokens is reset to the
+    keywords when it outgrows _STREAM_LITERALS, so a program with ever new
+    numbers is still lexed in bounded memory.
+
+    Args:
+        chunks: iterable of program text parts
+        symbol_table: symbol table
+
+    Yields:
+        tokens: token iterator
+    """
+    literals = dict(_KEYWORD_VARIANTS)
+    symbols = make_single_symbols()
+    pending = ""
+    for chunk in chunks:
+        if len(literals) > _STREAM_LITERALS:
+            literals = dict(_KEYWORD_VARIANTS)
+        text = pending + chunk
+        pending = ""
+        for match in _TOKEN_REGEX.finditer(text):
+            if match.end() >= len(text) - 1:
+                pending = _carry_over(match, text)
+                break
+            token = _match_token(match, literals, symbols, symbol_table)
+            if token is not None:
+                yield token
+    for match in _TOKEN_REGEX.finditer(pending):
+        token = _match_token(match, literals, symbols, symbol_table)
+        if token is not None:
+            yield token
+    yield make_eof()
+
+
+def _lex_buffer(text, symbol_table=None):
+    buffer = TokenBuffer(symbol_table=symbol_table)
+    literals = dict(_KEYWORD_VARIANTS)
+    symbols = make_single_symbols()
+    for match in _TOKEN_REGEX.finditer(text):
+        token = _match_token(match, literals, symbols, buffer.symbol_table)
+        if token is not None:
+            buffer.append(token, match.start(), match.end())
+    buffer.literals = literals
+    return buffer
+
+
+def _lex_parallel(text, workers, symbol_table):
+    bounds = _split_points(text, workers)
+    slices = map(slice, bounds, bounds[1:])
+    parts = [text[part] for part in slices]
+    buffer = TokenBuffer(text, symbol_table)
+    canonical = _canonical_tokens()
+    with ProcessPoolExecutor(workers) as executor:
+        for start, part in zip(bounds, executor.map(_lex_buffer, parts)):
+            values = [
+                _canonical_token(canonical, token, buffer.symbol_table)
+                for token in part.values
+            ]
+            buffer.extend(part, start, values)
+    return buffer
+
+
+def _canonical_token(canonical, token, symbol_table):
+    """Return the token to use in place of a token lexed by a worker.
+
+    Args:
+        canonical: tokens by type and value, updated with new tokens
+        token: token from a worker
+        symbol_table: symbol table of the joined buffer
+
+    Returns:
+        token: shared token with the same type and value
+    """
+    key = (token.type, token.value)
+    known = canonical.get(key)
+    if known is None:
+        known = token
+        if token.type == TokenType.variable:
+            known = make_variable(token.value, symbol_table.intern(token.value))
+        canonical[key] = known
+    return known
+
+
+def _split_points(text, parts):
+    """Return offsets splitting the text into parts at safe points.
+
+    A safe point follows a semicolon outside a comment: the semicolon is
+    always a token of its own, so lexing can restart right after it.
+
+    Args:
+        text: program text
+        parts: desired number of parts
+
+    Returns:
+        list: offsets of part starts followed by the text length
+    """
+    bounds = [0]
+    for part in range(1, parts):
+        target = len(text) * part // parts
+        point = _next_safe_point(text, bounds[-1], target)
+        if point is None:
+            break
+        if point > bounds[-1]:
+            bounds.append(point)
+    bounds.append(len(text))
+    return bounds
+
+
+def _next_safe_point(text, position, target):
+    """Return offset after the first semicolon outside comments after target.
+
+    Args:
+        text: program text
+        position: offset outside any comment, not after target
+        target: offset to search from
+
+    Returns:
+        int: offset or None if there is no such semicolon
+    """
+    while True:
+        brace = text.find(_COMMENT_START, position)
+        if brace == -1 or brace >= target:
+            break
+        position = text.find(_COMMENT_END, brace)
+        if position == -1:
+            return None
+        position += 1
+    position = max(position, target)
+    while True:
+        semi = text.find(";", position)
+        if semi == -1:
+            return None
+        brace = text.find(_COMMENT_START, position, semi)
+        if brace == -1:
+            return semi + 1
+        position = text.find(_COMMENT_END, brace)
+        if position == -1:
+            return None
+        position += 1
+
+
+def _canonical_tokens():
+    """Return keyword and symbol tokens by type and value.
+
+    Returns:
+        dict: key((TokenType, value)), value(Token)
+    """
+    tokens = chain(make_keywords().values(), make_single_symbols().values())
+    return {(token.type, token.value): token for token in tokens}
+
+
+def _buffer_literals(buffer):
+    literals = dict(_KEYWORD_VARIANTS)
+    for token in buffer.values:
+        if token.type in _LITERAL_TYPES:
+            literals.setdefault(str(token.value), token)
+    return literals
+
+
+def _carry_over(match, text):
+    """Return the text at the end of a chunk to lex again.
+
+    A token may still grow with the next chunk when it ends at the last or
+    the next to last character ("12" followed by "." may become "12.5").
+
+    Args:
+        match: first match ending near the end of the chunk
+        text: chunk text
+
+    Returns:
+        str: text to prepend to the next chunk
+    """
+    if match.lastgroup != "skip":
+        return text[match.start() :]
+    skipped = match.group()
+    if skipped.startswith(_COMMENT_START) and not skipped.endswith(_COMMENT_END):
+        return _COMMENT_START
+    return text[match.end() :]
+
+
+def _match_token(match, literals, symbols, symbol_table):
+    kind = match.lastgroup
+    if kind == "symbol":
+        return symbols[match.group()]
+    elif kind in _LITERALS:
+        lexeme = match.group()
+        token = literals.get(lexeme)
+        if token is None:
+            token = _make_literal(kind, lexeme, literals, symbol_table)
+            literals[lexeme] = token
+        return token
+    return None
+
+
+def _make_literal(kind, lexeme, literals, symbol_table):
+    """Return token for a lexeme missing from the literal table.
+
+    Keywords are in the table in every spelling, so a missing word is an
+    identifier; its spellings share the token of the lower-cased name.
+
+    Args:
+        kind: name of the matched group
+        lexeme: matched text
+        literals: tokens by lexeme
+        symbol_table: symbol table
+
+    Returns:
+        token: variable or number token
+    """
+    if kind == "word":
+        name = lexeme.lower()
+        token = literals.get(name)
+        if token is None:
+            token = make_variable(name, symbol_table.intern(name))
+            literals[name] = token
+        return token
+    elif kind == "real":
+        return make_real(lexeme)
+    return make_integer(lexeme)
+
+
 def _skip_comment(text):
-    for _ in takewhile(lambda char: char != "}", text):
+    for _ in takewhile(partial(ne, _COMMENT_END), text):
         pass
 
 
@@ -127,7 +575,7 @@ def _parse_number(letter, text):
     digits = [letter]
     for digit in takewhile(lambda dig: dig.isdigit(), text):
         digits.append(digit)
-    if text.current_char == ".":
+    if text.current_char == "." and text.next_char and text.next_char.isdigit():
         digits.append(text.current_char)
         for digit in takewhile(lambda dig: dig.isdigit(), text):
             digits.append(digit)
@@ -135,11 +583,10 @@ def _parse_number(letter, text):
     return int("".join(digits))
 
 
-def _parse_integer(letter, text):
-    digits = [letter]
-    for digit in takewhile(lambda dig: dig.isdigit(), text):
-        digits.append(digit)
-    return int("".join(digits))
+def _make_number(number):
+    if isinstance(number, float):
+        return make_real(number)
+    return make_integer(number)
 
 
 def _parse_word(letter, text):
@@ -0,0 +1,300 @@
+# -*- coding:utf-8 -*-
+
+"""Constant folding and algebraic simplification of AST."""
+
+from operator import add, attrgetter, mul, sub, truediv
+from types import MappingProxyType
+
+from interpreter.arena import VIEW_TYPES
+from interpreter.ast import (
+    AssignOperator,
+    BinaryOperation,
+    CompoundOperator,
+    EmptyOperator,
+    Num,
+    Program,
+    UnaryOperation,
+    Variable,
+)
+from interpreter.dispatcher import NodeDispatcher
+from interpreter.token import TokenType, make_integer, make_real
+
+
+class ConstantFolder(NodeDispatcher):
+    """Simplifies a tree without changing the results of CalculationVisitor.
+
+    The pass
+        - computes operations on numbers (2 * (3 + 4) becomes 14),
+        - applies x + 0, 0 + x, x - 0, x * 1, 1 * x, +x and -(-x) to x,
+        - replaces a variable by its number while the number assigned last
+          is known (a := 2; b := a * 3 becomes a := 2; b := 6).
+
+    Statements run in order, so the value of a variable is known from its
+    assignment to the next assignment of something else. Identities are
+    only applied with integer 0 and 1, which keep the type of x. The one
+    difference left is that x + 0 keeps a negative zero x negative, which
+    compares equal to the result of the visitor. A division by a literal
+    zero gives 0 without its left operand, as in the visitor, and a right
+    operand that only folds to 0 is left alone so the division still
+    raises ZeroDivisionError. Operations raising an error are not folded.
+    The given tree is left as it is: subtrees that fold to something else
+    are rebuilt, the others are shared with the result.
+
+    Attributes:
+        removed: number of nodes removed by the last fold
+    """
+
+    _handlers = {
+        Num: "_fold_num",
+        BinaryOperation: "_fold_binary_operation",
+        UnaryOperation: "_fold_unary_operation",
+        CompoundOperator: "_fold_compound_operator",
+        EmptyOperator: "_fold_empty_operator",
+        AssignOperator: "_fold_assign_operator",
+        Variable: "_fold_variable",
+        Program: "_fold_program",
+    }
+
+    def __init__(self):
+        """Construct a new folder."""
+        super().__init__()
+        self.removed = 0
+        self._values = {}
+
+    def fold(self, tree):
+        """Return simplified tree.
+
+        The AttributeError of dispatch is raised if the tree holds a node
+        of an unknown type.
+
+        Args:
+            tree: abstract syntax tree or expression
+
+        Returns:
+            tree: simplified tree
+        """
+        self._values = {}
+        folded = self.dispatch(tree)
+        self.removed = count_nodes(tree) - count_nodes(folded)
+        return folded
+
+    def _fold_num(self, node):
+        return node
+
+    def _fold_variable(self, node):
+        value = self._values.get(node.value)
+        if value is None:
+            return node
+        return _number(value)
+
+    def _fold_binary_operation(self, node):
+        """Fold BinaryOperation node.
+
+        Args:
+            node: binary operation
+
+        Returns:
+            AST: simplified operation
+        """
+        operator = node.op.type
+        if operator not in _OPERATIONS:
+            operator = TokenType.divide
+        if operator == TokenType.divide and _is_number(node.right, 0):
+            return _number(0)
+        left = self.dispatch(node.left)
+        right = self.dispatch(node.right)
+        if operator == TokenType.divide and _is_number(right, 0):
+            right = node.right
+        folded = _simplify(operator, left, right)
+        if folded is not None:
+            return folded
+        if left is node.left and right is node.right:
+            return node
+        return BinaryOperation(left, node.op, right)
+
+    def _fold_unary_operation(self, node):
+        """Fold UnaryOperation node.
+
+        Args:
+            node: unary operation
+
+        Returns:
+            AST: simplified operation
+        """
+        operand = self.dispatch(node.expr)
+        if node.op.type != TokenType.minus:
+            return operand
+        if isinstance(operand, Num):
+            return _number(-operand.value)
+        if isinstance(operand, UnaryOperation) and operand.op.type == TokenType.minus:
+            return operand.expr
+        if operand is node.expr:
+            return node
+        return UnaryOperation(node.op, operand)
+
+    def _fold_compound_operator(self, node):
+        statements = [self.dispatch(statement) for statement in node.compound_statement]
+        compound = CompoundOperator()
+        compound.set_compound_statement(statements)
+        return compound
+
+    def _fold_empty_operator(self, node):
+        return node
+
+    def _fold_assign_operator(self, node):
+        """Fold AssignOperator node and remember a number assigned.
+
+        Args:
+            node: assignment
+
+        Returns:
+            AssignOperator: assignment of the simplified expression
+        """
+        expression = self.dispatch(node.expr)
+        name = node.variable.value
+        if isinstance(expression, Num):
+            self._values[name] = expression.value
+        else:
+            self._values.pop(name, None)
+        if expression is node.expr:
+            return node
+        return AssignOperator(node.variable, node.op, expression)
+
+    def _fold_program(self, node):
+        return Program(
+            node.name,
+            node.block,
+            self.dispatch(node.compound_statement),
+            node.variables,
+        )
+
+
+def fold_constants(tree):
+    """Return simplified tree and the number of nodes removed.
+
+    Args:
+        tree: abstract syntax tree
+
+    Returns:
+        tuple: simplified tree, number of removed nodes
+    """
+    folder = ConstantFolder()
+    folded = folder.fold(tree)
+    return folded, folder.removed
+
+
+def count_nodes(tree):
+    """Return number of nodes of the tree.
+
+    Declarations of a program are not counted.
+
+    Args:
+        tree: abstract syntax tree
+
+    Returns:
+        int: number of nodes
+    """
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        children = _CHILDREN.get(type(node))
+        if children is not None:
+            stack.extend(children(node))
+    return count
+
+
+def _expression(node):
+    return (node.expr,)
+
+
+def _compound_statement(node):
+    return (node.compound_statement,)
+
+
+_NODE_CHILDREN = MappingProxyType(
+    {
+        BinaryOperation: attrgetter("left", "right"),
+        UnaryOperation: _expression,
+        AssignOperator: attrgetter("variable", "expr"),
+        CompoundOperator: attrgetter("compound_statement"),
+        Program: _compound_statement,
+    },
+)
+
+# Child nodes counted by count_nodes, by node type and arena view type.
+_CHILDREN = MappingProxyType(
+    {
+        **_NODE_CHILDREN,
+        **{
+            view_type: _NODE_CHILDREN[node_type]
+            for view_type, node_type in VIEW_TYPES.items()
+            if node_type in _NODE_CHILDREN
+        },
+    },
+)
+
+_OPERATIONS = MappingProxyType(
+    {
+        TokenType.plus: add,
+        TokenType.minus: sub,
+        TokenType.multiply: mul,
+        TokenType.divide: truediv,
+    },
+)
+
+# Operand that leaves the other one unchanged, on the right and on the left.
+_RIGHT_IDENTITIES = MappingProxyType(
+    {
+        TokenType.plus: 0,
+        TokenType.minus: 0,
+        TokenType.multiply: 1,
+    },
+)
+
+_LEFT_IDENTITIES = MappingProxyType(
+    {
+        TokenType.plus: 0,
+        TokenType.multiply: 1,
+    },
+)
+
+
+def _simplify(operator, left, right):
+    """Return operation of folded operands computed or reduced to one side.
+
+    Args:
+        operator: token type of the operation
+        left: folded left operand
+        right: folded right operand
+
+    Returns:
+        AST: simplified operation, None if it cannot be simplified
+    """
+    if isinstance(left, Num) and isinstance(right, Num):
+        try:
+            return _number(_OPERATIONS[operator](left.value, right.value))
+        except ArithmeticError:
+            return None
+    if _is_integer(right, _RIGHT_IDENTITIES.get(operator)):
+        return left
+    if _is_integer(left, _LEFT_IDENTITIES.get(operator)):
+        return right
+    return None
+
+
+def _number(value):
+    if isinstance(value, float):
+        return Num(make_real(value))
+    return Num(make_integer(value))
+
+
+def _is_number(node, value):
+    return isinstance(node, Num) and node.value == value
+
+
+def _is_integer(node, value):
+    if not isinstance(node, Num) or isinstance(node.value, bool):
+        return False
+    return isinstance(node.value, int) and node.value == value
@@ -2,38 +2,82 @@
 
 """Parser's implementation."""
 
+from collections import deque
+from types import MappingProxyType
+
 from interpreter.ast import (
     AssignOperator,
     BinaryOperation,
+    Block,
     CompoundOperator,
     EmptyOperator,
     Num,
+    Program,
     UnaryOperation,
     Variable,
+    VariableDeclaration,
 )
-from interpreter.token import TokenType
+from interpreter.symbol_table import VariableTable
+from interpreter.token import Token, TokenType
+from interpreter.token_buffer import TokenBuffer, TokenCursor
 
 
 class Parser(object):
     """The Parser class is used to build an abstract syntax tree from stream token.
 
+    The header is None for a program without a PROGRAM header.
+
     Attributes:
-        lexer: return a token from a stream
+        lexer: return a token from a stream (None for a token buffer)
         current_token: pointer to the currently processed token
+        current_type: type of the current token
+        errors: syntax errors found in recovery mode (None otherwise)
+        header: name, Block and VariableTable of a PROGRAM read by statements()
 
     Methods:
         parse(): return ATS from stream token
+        statements(): yield top-level statements as soon as they are parsed
+        peek(distance): return type of a token after the current one
 
     """
 
-    def __init__(self, lexer):
+    def __init__(self, lexer, recover=False):
         """Construct a new parser.
 
+        A token buffer is read by index: token types are compared as integer
+        codes straight from the buffer and lookahead needs no extra lexing.
+
+        In recovery mode a syntax error does not stop parsing: it is added
+        to errors, the tokens up to the next SEMI, END or DOT are skipped and
+        the broken statement is replaced with an empty one. Only errors of
+        a TokenBuffer have a position: tokens of a stream do not know their
+        offsets, so the errors found while reading one have position None.
+
         Args:
-            lexer: it can return a token from a stream
+            lexer: it can return a token from a stream, or a TokenBuffer
+            recover: collect all syntax errors instead of raising the first
         """
-        self.lexer = lexer
-        self.current_token = next(lexer)
+        self.errors = [] if recover else None
+        self.header = None
+        self._error_index = -1
+        self._lookahead = deque()
+        self._buffer = None
+        self._index = 0
+        if isinstance(lexer, TokenCursor):
+            self._index = lexer.index
+            lexer = lexer.buffer
+        if isinstance(lexer, TokenBuffer):
+            self.lexer = None
+            self._buffer = lexer
+            self._types = lexer.types
+            self._values = lexer.values
+            self._value_ids = lexer.value_ids
+            self._advance = self._advance_index
+            self._index -= 1
+        else:
+            self.lexer = iter(lexer)
+            self._advance = self._advance_stream
+        self._advance()
 
     def parse(self):
         """Return AST from stream token.
@@ -42,19 +86,194 @@ class Parser(object):
             tree: abstract syntax tree of expression
         """
         ast = self._program()
-        if self.current_token.type != TokenType.eof:
-            self._error()
+        self._expect(TokenType.eof)
         return ast
 
+    def statements(self):
+        """Yield top-level statements of the program one at a time.
+
+        A statement is yielded as soon as it is parsed and the parser keeps
+        no reference to it, so with a token stream memory is bounded by the
+        largest statement rather than by the whole program. The program
+        header is parsed before the first statement and stored in header.
+
+        Yields:
+            statements: top-level statements of the program
+        """
+        self.header = self._program_header()
+        self._expect(TokenType.begin)
+        yield from self._statement_list()
+        self._expect(TokenType.end)
+        self._expect(TokenType.dot)
+        self._expect(TokenType.eof)
+
+    def peek(self, distance=1):
+        """Return type of a token after the current one.
+
+        Looking ahead does not move the parser. A token stream is read only
+        as far as needed and the tokens read are kept until they are parsed.
+
+        Args:
+            distance: number of tokens to look ahead
+
+        Returns:
+            TokenType: token type (eof past the end of the stream)
+        """
+        if self._buffer is not None:
+            index = min(self._index + distance, len(self._types) - 1)
+            return self._types[index]
+        while len(self._lookahead) < distance:
+            token = next(self.lexer, None)
+            if token is None:
+                return TokenType.eof
+            self._lookahead.append(token)
+        return self._lookahead[distance - 1].type
+
     def _program(self):
         """Return the result of a nonterminal term.
 
+        A program without a header is a bare compound statement, as before.
+
         Returns:
-            program : compound statement DOT
+            program : PROGRAM variable SEMI block DOT |
+                      compound statement DOT
         """
-        ast = self._compound_statement()
-        self._eat(TokenType.dot)
-        return ast
+        header = self._program_header()
+        compound_statement = self._compound_statement()
+        self._expect(TokenType.dot)
+        if header is None:
+            return compound_statement
+        name, block, variables = header
+        return Program(name, block, compound_statement, variables)
+
+    def _program_header(self):
+        """Return the result of a nonterminal term.
+
+        Returns:
+            header : PROGRAM variable SEMI declarations |
+                     empty
+        """
+        if self.current_type != TokenType.program:
+            return None
+        self._eat(TokenType.program)
+        name = self._program_name()
+        self._expect(TokenType.semi)
+        variables = VariableTable()
+        block = self._declarations(variables)
+        return name, block, variables
+
+    def _program_name(self):
+        """Return variable node of the program name.
+
+        In recovery mode a missing name is replaced with an empty one.
+
+        Raises:
+            InvalidSyntaxError: if the name is missing, outside recovery mode
+
+        Returns:
+            Variable: variable node
+        """
+        try:
+            return self._variable()
+        except InvalidSyntaxError as error:
+            if self.errors is None:
+                raise
+            self._recover(error, _DECLARATION_SYNC | {TokenType.var})
+        return Variable(Token(TokenType.variable, ""))
+
+    def _declarations(self, variables):
+        """Return the result of a nonterminal term.
+
+        Every declared variable is added to the table with the next slot.
+
+        Args:
+            variables: table of the declared variables
+
+        Returns:
+            declarations : VAR (variable_declaration SEMI)+ |
+                           empty
+        """
+        block = Block([])
+        if self.current_type != TokenType.var:
+            return block
+        self._eat(TokenType.var)
+        while True:
+            for declaration in self._declaration_line(variables):
+                block.add_declaration(declaration)
+            if self.current_type != TokenType.variable:
+                return block
+
+    def _declaration_line(self, variables):
+        """Return declarations up to the SEMI after them.
+
+        In recovery mode a broken line is skipped and gives no declarations.
+
+        Args:
+            variables: table of the declared variables
+
+        Raises:
+            InvalidSyntaxError: if the line is invalid, outside recovery mode
+
+        Returns:
+            list: VariableDeclaration nodes
+        """
+        try:
+            declarations = self._variable_declaration(variables)
+        except InvalidSyntaxError as error:
+            if self.errors is None:
+                raise
+            self._recover(error, _DECLARATION_SYNC)
+            if self.current_type == TokenType.semi:
+                self._advance()
+            return []
+        self._eat(TokenType.semi)
+        return declarations
+
+    def _variable_declaration(self, variables):
+        """Return the result of a nonterminal term.
+
+        Args:
+            variables: table of the declared variables
+
+        Returns:
+            variable_declaration : variable (COMMA variable)* COLON type_spec
+        """
+        names = [self._declared_variable(variables)]
+        while self.current_type == TokenType.comma:
+            self._eat(TokenType.comma)
+            names.append(self._declared_variable(variables))
+        self._eat(TokenType.colon)
+        type_token = self._type_spec()
+        for name in names:
+            variables.declare(name.value, type_token.type)
+        return [VariableDeclaration(variable, type_token) for variable in names]
+
+    def _declared_variable(self, variables):
+        """Return variable node of a new declaration.
+
+        Args:
+            variables: table of the declared variables
+
+        Returns:
+            Variable: variable node
+        """
+        if self.current_type == TokenType.variable:
+            if self.current_token.value in variables:
+                self._report("Duplicate identifier")
+        return self._variable()
+
+    def _type_spec(self):
+        """Return the result of a nonterminal term.
+
+        Returns:
+            type_spec : INTEGER | REAL
+        """
+        token = self.current_token
+        if self.current_type == TokenType.real_type:
+            self._eat(TokenType.real_type)
+        else:
+            self._eat(TokenType.integer_type)
+        return token
 
     def _compound_statement(self):
         """Return the result of a nonterminal term.
@@ -62,40 +281,52 @@ class Parser(object):
         Returns:
             compound statement : BEGIN statement list END
         """
-        self._eat(TokenType.begin)
+        self._expect(TokenType.begin)
 
         root = CompoundOperator()
         root.set_compound_statement(self._statement_list())
 
-        self._eat(TokenType.end)
+        self._expect(TokenType.end)
         return root
 
     def _statement_list(self):
-        """Return the result of a nonterminal term.
+        """Yield the result of a nonterminal term.
 
-        Returns:
+        Yields:
             statement list : statement |
                              statement SEMI statement list
         """
-        statements = [self._statement()]
+        yield self._statement()
 
-        while self.current_token.type == TokenType.semi:
-            self._eat(TokenType.semi)
-            statements.append(self._statement())
-        return statements
+        while True:
+            if self.current_type == TokenType.semi:
+                self._eat(TokenType.semi)
+                yield self._statement()
+            elif self.errors is None or self.current_type in _SYNC:
+                return
+            else:
+                self._recover(self._syntax_error(), _SYNC)
 
     def _statement(self):
         """Return the result of a nonterminal term.
 
+        Raises:
+            InvalidSyntaxError: if the statement is invalid, outside recovery mode
+
         Returns:
             statement : compound_statement   |
                         assignment_statement |
                         empty
         """
-        if self.current_token.type == TokenType.begin:
-            return self._compound_statement()
-        elif self.current_token.type == TokenType.variable:
-            return self._assignment_statement()
+        try:
+            if self.current_type == TokenType.begin:
+                return self._compound_statement()
+            elif self.current_type == TokenType.variable:
+                return self._assignment_statement()
+        except InvalidSyntaxError as error:
+            if self.errors is None:
+                raise
+            self._recover(error, _SYNC)
         return self._empty()
 
     def _assignment_statement(self):
@@ -126,68 +357,84 @@ class Parser(object):
     def _expr(self):
         """Return the result of a nonterminal term.
 
-        Returns:
-            expr   : term ((PLUS | MINUS) term)*
-            term   : factor ((MUL | DIV) factor)*
-            factor : INTEGER | LPAREN expr RPAREN
-        """
-        node = self._term()
+        The grammar is parsed without recursion: operators wait on an
+        explicit stack until an operator of lower or equal precedence
+        (all operators are left associative) or the end of the expression.
 
-        while self.current_token.type in {TokenType.plus, TokenType.minus}:
-            token = self.current_token
-            if token.type == TokenType.plus:
-                self._eat(TokenType.plus)
-            elif token.type == TokenType.minus:
-                self._eat(TokenType.minus)
+        The terms and factors are::
 
-            node = BinaryOperation(left=node, op=token, right=self._term())
+            term   : factor ((MUL | DIV) factor)*
+            factor : plus  factor |
+                     minus factor |
+                     integer      |
+                     real         |
+                     lparen expr rparen |
+                     variable
 
-        return node
+        Returns:
+            expr : term ((PLUS | MINUS) term)*
+        """
+        operands = []
+        operators = []
+        depth = 0
+        while True:
+            depth += self._operand(operands, operators)
+            depth = self._close_parens(operands, operators, depth)
+            precedence = _BINARY_PRECEDENCE.get(self.current_type)
+            if precedence is None:
+                break
+            _reduce(operands, operators, precedence)
+            operators.append((precedence, self.current_token))
+            self._advance()
+        if depth:
+            self._error()
+        _reduce(operands, operators, _ADDITIVE)
+        return operands.pop()
 
-    def _term(self):
-        """Return the result of a nonterminal term.
+    def _close_parens(self, operands, operators, depth):
+        """Reduce the parenthesized operations closed by RPAREN tokens.
+
+        Args:
+            operands: stack of nodes
+            operators: stack of (precedence, token) pairs
+            depth: number of open parenthesis
 
         Returns:
-            term : factor ((MUL | DIV) factor)*
+            int: number of parenthesis left open
         """
-        node = self._factor()
-        while self.current_token.type in {TokenType.multiply, TokenType.divide}:
-            token = self.current_token
-            if token.type == TokenType.multiply:
-                self._eat(TokenType.multiply)
-            elif token.type == TokenType.divide:
-                self._eat(TokenType.divide)
+        while depth and self.current_type == TokenType.rparen:
+            _reduce(operands, operators, _ADDITIVE)
+            operators.pop()
+            depth -= 1
+            self._advance()
+            _apply_unary(operands, operators)
+        return depth
 
-            node = BinaryOperation(left=node, op=token, right=self._factor())
-
-        return node
+    def _operand(self, operands, operators):
+        """Push the next factor, leaving open parenthesis on the stack.
 
-    def _factor(self):
-        """Return the result of a nonterminal factor.
+        Args:
+            operands: stack of nodes
+            operators: stack of (precedence, token) pairs
 
         Returns:
-            factor : plus  factor |
-                     minus factor |
-                     integer      |
-                     lparen expr rparen |
-                     variable
+            int: number of open parenthesis
         """
-        token = self.current_token
-        if token.type == TokenType.plus:
-            self._eat(TokenType.plus)
-            return UnaryOperation(token, self._factor())
-        elif token.type == TokenType.minus:
-            self._eat(TokenType.minus)
-            return UnaryOperation(token, self._factor())
-        elif token.type == TokenType.integer:
-            self._eat(TokenType.integer)
-            return Num(token)
-        elif token.type == TokenType.lparen:
-            self._eat(TokenType.lparen)
-            node = self._expr()
-            self._eat(TokenType.rparen)
-            return node
-        return self._variable()
+        depth = 0
+        while self.current_type in _PREFIX:
+            if self.current_type == TokenType.lparen:
+                operators.append((_PAREN, self.current_token))
+                depth += 1
+            else:
+                operators.append((_UNARY, self.current_token))
+            self._advance()
+        if self.current_type in _NUMBERS:
+            operands.append(Num(self.current_token))
+            self._advance()
+        else:
+            operands.append(self._variable())
+        _apply_unary(operands, operators)
+        return depth
 
     def _eat(self, token_type):
         """Compare the current token type with the passed token.
@@ -195,21 +442,174 @@ class Parser(object):
         Args:
             token_type: error message or correct value
         """
-        if self.current_token.type == token_type:
-            self.current_token = next(self.lexer)
+        if self.current_type == token_type:
+            self._advance()
         else:
             self._error()
 
-    def _error(self):
+    def _expect(self, token_type):
+        """Eat the token, or in recovery mode note its absence and go on.
+
+        Args:
+            token_type: expected token type
+        """
+        if self.current_type == token_type:
+            if token_type != TokenType.eof:
+                self._advance()
+        elif self.errors is None:
+            self._error()
+        else:
+            self._record(self._syntax_error())
+
+    def _recover(self, error, sync_types):
+        """Note the error and skip tokens up to a synchronizing token.
+
+        Only called in recovery mode, outside of it the error is raised.
+
+        Args:
+            error: syntax error
+            sync_types: token types to stop at
+        """
+        self._record(error)
+        while self.current_type not in sync_types:
+            self._advance()
+
+    def _report(self, message):
+        """Raise an error, or note it in recovery mode.
+
+        Args:
+            message: error message
+        """
+        if self.errors is None:
+            self._error(message)
+        self._record(self._syntax_error(message))
+
+    def _record(self, error):
+        """Add error to the list unless one was found at the same token.
+
+        Args:
+            error: syntax error
+        """
+        if self._index != self._error_index:
+            self._error_index = self._index
+            self.errors.append(error)
+
+    def _advance_index(self):
+        """Move to the next token of the token buffer."""
+        index = self._index + 1
+        self._index = index
+        self.current_type = self._types[index]
+        self.current_token = self._values[self._value_ids[index]]
+
+    def _advance_stream(self):
+        """Move to the next token of the stream."""
+        self._index += 1
+        if self._lookahead:
+            self.current_token = self._lookahead.popleft()
+        else:
+            self.current_token = next(self.lexer)
+        self.current_type = self.current_token.type
+
+    def _error(self, message="Invalid syntax"):
         """Raise exception.
 
+        Args:
+            message: error message
+
         Raises:
             InvalidSyntaxError: raise exception
         """
-        raise InvalidSyntaxError("Invalid syntax")
+        raise InvalidSyntaxError(message, self._error_position())
+
+    def _syntax_error(self, message="Invalid syntax"):
+        """Return exception for the current token.
+
+        Args:
+            message: error message
+
+        Returns:
+            InvalidSyntaxError: exception with the token position, known only
+                when parsing a TokenBuffer
+        """
+        return InvalidSyntaxError(message, self._error_position())
+
+    def _error_position(self):
+        """Return line and column of the current token.
+
+        Returns:
+            tuple: line and column, None unless parsing a TokenBuffer
+        """
+        if self._buffer is None:
+            return None
+        return self._buffer.position(self._index)
+
+
+_PAREN = 0
+
+_UNARY = 1
+
+_ADDITIVE = 2
+
+_MULTIPLICATIVE = 3
+
+_BINARY_PRECEDENCE = MappingProxyType(
+    {
+        TokenType.plus: _ADDITIVE,
+        TokenType.minus: _ADDITIVE,
+        TokenType.multiply: _MULTIPLICATIVE,
+        TokenType.divide: _MULTIPLICATIVE,
+    },
+)
+
+_PREFIX = frozenset((TokenType.plus, TokenType.minus, TokenType.lparen))
+
+_NUMBERS = frozenset((TokenType.integer, TokenType.real))
+
+_SYNC = frozenset((TokenType.semi, TokenType.end, TokenType.dot, TokenType.eof))
+
+_DECLARATION_SYNC = _SYNC | {TokenType.begin}
+
+
+def _apply_unary(operands, operators):
+    """Wrap the top operand into the unary operators on top of the stack.
+
+    Args:
+        operands: stack of nodes
+        operators: stack of (precedence, token) pairs
+    """
+    while operators and operators[-1][0] == _UNARY:
+        _, token = operators.pop()
+        operands.append(UnaryOperation(token, operands.pop()))
+
+
+def _reduce(operands, operators, precedence):
+    """Build binary operations of at least the given precedence.
+
+    Parenthesis and unary operators have lower precedence than any binary
+    operator, so reducing stops at them.
+
+    Args:
+        operands: stack of nodes
+        operators: stack of (precedence, token) pairs
+        precedence: lowest precedence to reduce
+    """
+    while operators and operators[-1][0] >= precedence:
+        _, token = operators.pop()
+        right = operands.pop()
+        operands.append(BinaryOperation(left=operands.pop(), op=token, right=right))
 
 
 class InvalidSyntaxError(Exception):
     """Simple exception."""
 
-    pass
+    def __init__(self, message, position=None):
+        """Construct a new exception.
+
+        Args:
+            message: error message
+            position: line and column of the unexpected token, if known
+        """
+        if position is not None:
+            message = "{0} at line {1}, column {2}".format(message, *position)
+        super().__init__(message)
+        self.position = position
@@ -0,0 +1,130 @@
+# -*- coding:utf-8 -*-
+
+"""Resolving variable names to slots of a SlotScope."""
+
+from interpreter.ast import (
+    AssignOperator,
+    BinaryOperation,
+    CompoundOperator,
+    EmptyOperator,
+    Num,
+    Program,
+    ResolvedAssignOperator,
+    ResolvedVariable,
+    UnaryOperation,
+    Variable,
+)
+from interpreter.dispatcher import NodeDispatcher
+from interpreter.symbol_table import SlotScope
+
+
+class SlotResolver(NodeDispatcher):
+    """Gives every variable of a tree a slot in a scope.
+
+    Variable and AssignOperator nodes are replaced by ResolvedVariable and
+    ResolvedAssignOperator carrying the slot, so CalculationVisitor running
+    on the scope reads and writes values by index. Declared variables of a
+    program get their slots first, in the order of their VariableSymbol
+    slots. Every node above a variable is copied, so the resolved tree and
+    the original can both be run.
+
+    Attributes:
+        scope: SlotScope holding the slots
+    """
+
+    _handlers = {
+        Num: "_resolve_leaf",
+        BinaryOperation: "_resolve_binary_operation",
+        UnaryOperation: "_resolve_unary_operation",
+        CompoundOperator: "_resolve_compound_operator",
+        EmptyOperator: "_resolve_leaf",
+        AssignOperator: "_resolve_assign_operator",
+        Variable: "_resolve_variable",
+        Program: "_resolve_program",
+        ResolvedVariable: "_resolve_variable",
+        ResolvedAssignOperator: "_resolve_assign_operator",
+    }
+
+    def __init__(self, scope=None):
+        """Construct a new resolver.
+
+        Args:
+            scope: SlotScope to add the slots to (a new one by default)
+        """
+        super().__init__()
+        if scope is None:
+            scope = SlotScope()
+        self.scope = scope
+
+    def resolve(self, tree):
+        """Return tree with resolved variables.
+
+        The AttributeError of dispatch is raised if the tree holds a node
+        of an unknown type.
+
+        Args:
+            tree: abstract syntax tree
+
+        Returns:
+            tree: tree to run on the scope
+        """
+        return self.dispatch(tree)
+
+    def _resolve_leaf(self, node):
+        return node
+
+    def _resolve_variable(self, node):
+        return ResolvedVariable(node.token, self.scope.slot(node.value))
+
+    def _resolve_binary_operation(self, node):
+        return BinaryOperation(
+            self.resolve(node.left),
+            node.op,
+            self.resolve(node.right),
+        )
+
+    def _resolve_unary_operation(self, node):
+        return UnaryOperation(node.op, self.resolve(node.expr))
+
+    def _resolve_compound_operator(self, node):
+        compound = CompoundOperator()
+        compound.set_compound_statement(
+            [self.resolve(statement) for statement in node.compound_statement],
+        )
+        return compound
+
+    def _resolve_assign_operator(self, node):
+        variable = self.resolve(node.variable)
+        return ResolvedAssignOperator(
+            variable,
+            node.op,
+            self.resolve(node.expr),
+            variable.slot,
+        )
+
+    def _resolve_program(self, node):
+        for symbol in node.variables:
+            self.scope.slot(symbol.name)
+        return Program(
+            node.name,
+            node.block,
+            self.resolve(node.compound_statement),
+            node.variables,
+        )
+
+
+def resolve_slots(tree, scope=None):
+    """Return tree with resolved variables and the scope to run it on.
+
+    Run the tree with CalculationVisitor(scope). A tree resolved once can
+    be run on SlotScope(scope.names) as often as needed.
+
+    Args:
+        tree: abstract syntax tree
+        scope: SlotScope to add the slots to (a new one by default)
+
+    Returns:
+        tuple: resolved tree, SlotScope
+    """
+    resolver = SlotResolver(scope)
+    return resolver.resolve(tree), resolver.scope
@@ -0,0 +1,427 @@
+# -*- coding:utf-8 -*-
+
+"""Binary format of parsed programs.
+
+A serialized program is an AstArena: a header, the distinct tokens, the
+node arrays as raw little-endian bytes and the declarations of the program::
+
+    magic "PASAST", format version (u8)
+    token count (u32), tokens
+    node count (u32), kinds (u8), constants (u32), left (i32), right (i32)
+    statement count (u32), statements (u32)
+    root (i32)
+    declaration flag (u8): program name token (u32), declaration count (u32),
+        variable token and type token of every declaration (u32 pairs)
+
+A token is its type (u8), a value tag (u8), the value and the symbol id
+(i32, -1 if none). A node constant is a token index, or the token count for
+nodes without a token, or the token count plus one for the program node.
+"""
+
+import struct
+import sys
+from array import array
+from itertools import chain
+from types import MappingProxyType
+
+from interpreter.arena import AstArena, build_arena
+from interpreter.ast import Block, Variable, VariableDeclaration
+from interpreter.symbol_table import VariableTable
+from interpreter.token import Token, TokenType
+
+FORMAT_VERSION = 1
+
+_MAGIC = b"PASAST"
+
+_HEADER = struct.Struct("<6sB")
+
+_COUNT = struct.Struct("<I")
+
+_ROOT = struct.Struct("<i")
+
+_TOKEN = struct.Struct("<BBi")
+
+_INT = struct.Struct("<q")
+
+_FLOAT = struct.Struct("<d")
+
+_STR_TAG = 0
+
+_INT_TAG = 1
+
+_FLOAT_TAG = 2
+
+_BIG_INT_TAG = 3
+
+_INT_RANGE = range(-(2**63), 2**63)
+
+# Array type code of token indexes and counts.
+_U32 = "I"
+
+
+def dumps(tree):
+    """Return binary form of a program.
+
+    Args:
+        tree: abstract syntax tree or AstArena
+
+    Returns:
+        bytes: serialized program
+    """
+    arena = tree if isinstance(tree, AstArena) else build_arena(tree)
+    tokens, constants, declarations = _token_table(arena)
+    return b"".join(
+        chain(
+            _token_chunks(tokens),
+            _node_chunks(arena, constants),
+            _declaration_chunks(declarations),
+        ),
+    )
+
+
+def loads(data):
+    """Return program from its binary form.
+
+    The program is returned as an arena, its tree property is the root node
+    (views are instances of the node classes and run in the visitor).
+
+    Args:
+        data: serialized program
+
+    Raises:
+        ValueError: if data is not a serialized program of this version
+
+    Returns:
+        AstArena: flat tree
+    """
+    reader = _Reader(data)
+    magic, version = reader.unpack(_HEADER)
+    if magic != _MAGIC:
+        raise ValueError("Not a serialized program")
+    if version != FORMAT_VERSION:
+        raise ValueError("Unsupported format version {0}".format(version))
+    tokens = [_unpack_token(reader) for _ in range(reader.count())]
+    arena = _read_arena(reader)
+    arena.pool.extend(tokens)
+    arena.pool.append(None)
+    if reader.read(1) == b"\x01":
+        arena.pool.append(_make_program_parts(reader, tokens))
+    reader.finish()
+    return arena
+
+
+def dump(tree, program_file):
+    """Write binary form of a program to a file.
+
+    Args:
+        tree: abstract syntax tree or AstArena
+        program_file: binary file
+    """
+    program_file.write(dumps(tree))
+
+
+def load(program_file):
+    """Read program from a binary file.
+
+    Args:
+        program_file: binary file
+
+    Returns:
+        AstArena: flat tree
+    """
+    return loads(program_file.read())
+
+
+def _token_table(arena):
+    """Return the distinct tokens of an arena and the ids that use them.
+
+    Args:
+        arena: arena
+
+    Returns:
+        tuple: distinct tokens, constant of every node (array), program
+            declaration ids (see _declaration_tokens)
+    """
+    tokens, token_ids, parts = _pool_tokens(arena.pool)
+    declarations = _declaration_tokens(parts, tokens, token_ids)
+    pool_ids = [_constant_id(pooled, tokens, token_ids) for pooled in arena.pool]
+    return (
+        tokens,
+        array(_U32, [pool_ids[pool_id] for pool_id in arena.constants]),
+        declarations,
+    )
+
+
+def _pool_tokens(pool):
+    """Return the distinct tokens of a constant pool.
+
+    Args:
+        pool: constant pool of an arena
+
+    Returns:
+        tuple: distinct tokens, token ids by token and program parts or None
+    """
+    tokens = []
+    token_ids = {}
+    parts = None
+    for constant in pool:
+        if isinstance(constant, tuple):
+            parts = constant
+        elif constant is not None:
+            _token_id(constant, tokens, token_ids)
+    return tokens, token_ids, parts
+
+
+def _token_chunks(tokens):
+    chunks = [_HEADER.pack(_MAGIC, FORMAT_VERSION), _COUNT.pack(len(tokens))]
+    chunks.extend(_pack_token(token) for token in tokens)
+    return chunks
+
+
+def _node_chunks(arena, constants):
+    chunks = [_COUNT.pack(len(arena)), arena.kinds.tobytes()]
+    chunks.extend(map(_array_bytes, (constants, arena.left, arena.right)))
+    chunks.extend(
+        (
+            _COUNT.pack(len(arena.statements)),
+            _array_bytes(arena.statements),
+            _ROOT.pack(arena.root),
+        ),
+    )
+    return chunks
+
+
+def _declaration_chunks(declarations):
+    if declarations is None:
+        return (b"\x00",)
+    return (b"\x01", _array_bytes(declarations))
+
+
+def _read_arena(reader):
+    """Return arena with the node arrays read.
+
+    Args:
+        reader: data reader
+
+    Returns:
+        AstArena: arena with an empty constant pool
+    """
+    arena = AstArena()
+    node_count = reader.count()
+    arena.kinds = reader.array("B", node_count)
+    arena.constants = reader.array(_U32, node_count)
+    arena.left = reader.array("i", node_count)
+    arena.right = reader.array("i", node_count)
+    arena.statements = reader.array(_U32, reader.count())
+    arena.root = reader.unpack(_ROOT)[0]
+    return arena
+
+
+def _token_id(token, tokens, token_ids):
+    token_id = token_ids.get(id(token))
+    if token_id is None:
+        token_id = len(tokens)
+        tokens.append(token)
+        token_ids[id(token)] = token_id
+    return token_id
+
+
+def _constant_id(constant, tokens, token_ids):
+    if constant is None:
+        return len(tokens)
+    if isinstance(constant, tuple):
+        return len(tokens) + 1
+    return token_ids[id(constant)]
+
+
+def _declaration_tokens(parts, tokens, token_ids):
+    """Return token ids of the program name and declarations.
+
+    Args:
+        parts: program name, Block and VariableTable, or None
+        tokens: list of distinct tokens
+        token_ids: token index by object id
+
+    Returns:
+        array: name id, declaration count, variable and type ids
+    """
+    if parts is None:
+        return None
+    name, block, _ = parts
+    declarations = array(_U32, [_token_id(name.token, tokens, token_ids)])
+    declarations.append(len(block.declarations))
+    for declaration in block.declarations:
+        declarations.append(_token_id(declaration.variable.token, tokens, token_ids))
+        declarations.append(_token_id(declaration.type, tokens, token_ids))
+    return declarations
+
+
+def _make_program_parts(reader, tokens):
+    """Return program name, Block and VariableTable.
+
+    Args:
+        reader: data reader
+        tokens: distinct tokens
+
+    Returns:
+        tuple: program name, Block and VariableTable
+    """
+    name, count = reader.array(_U32, 2)
+    ids = iter(reader.array(_U32, count * 2))
+    block, variables = _make_declarations(zip(ids, ids), tokens)
+    return Variable(tokens[name]), block, variables
+
+
+def _make_declarations(id_pairs, tokens):
+    """Return Block and VariableTable of declarations.
+
+    Args:
+        id_pairs: variable token id and type token id of every declaration
+        tokens: distinct tokens
+
+    Returns:
+        tuple: Block and VariableTable
+    """
+    block = Block([])
+    variables = VariableTable()
+    for variable_id, type_id in id_pairs:
+        variable = Variable(tokens[variable_id])
+        block.add_declaration(VariableDeclaration(variable, tokens[type_id]))
+        variables.declare(variable.value, tokens[type_id].type)
+    return block, variables
+
+
+def _pack_token(token):
+    symbol_id = -1 if token.symbol_id is None else token.symbol_id
+    value = token.value
+    if isinstance(value, float):
+        return _TOKEN.pack(token.type, _FLOAT_TAG, symbol_id) + _FLOAT.pack(value)
+    if isinstance(value, int) and value in _INT_RANGE:
+        return _TOKEN.pack(token.type, _INT_TAG, symbol_id) + _INT.pack(value)
+    tag = _STR_TAG
+    if isinstance(value, int):
+        tag = _BIG_INT_TAG
+        value = str(value)
+    encoded = value.encode("utf-8")
+    return b"".join(
+        (_TOKEN.pack(token.type, tag, symbol_id), _COUNT.pack(len(encoded)), encoded),
+    )
+
+
+def _unpack_token(reader):
+    token_type, tag, symbol_id = reader.unpack(_TOKEN)
+    read_value = _VALUE_READERS.get(tag)
+    if read_value is None:
+        raise ValueError("Unknown token value tag {0}".format(tag))
+    symbol_id = None if symbol_id < 0 else symbol_id
+    return Token(TokenType(token_type), read_value(reader), symbol_id)
+
+
+def _read_int(reader):
+    return reader.unpack(_INT)[0]
+
+
+def _read_float(reader):
+    return reader.unpack(_FLOAT)[0]
+
+
+def _read_str(reader):
+    return reader.read(reader.count()).decode("utf-8")
+
+
+def _read_big_int(reader):
+    return int(_read_str(reader))
+
+
+# Function reading the value of a token, by value tag.
+_VALUE_READERS = MappingProxyType(
+    {
+        _STR_TAG: _read_str,
+        _INT_TAG: _read_int,
+        _FLOAT_TAG: _read_float,
+        _BIG_INT_TAG: _read_big_int,
+    },
+)
+
+
+def _array_bytes(values):
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class _Reader(object):
+    """Reads values from serialized data."""
+
+    def __init__(self, data):
+        """Construct a new reader.
+
+        Args:
+            data: serialized program
+        """
+        self._data = memoryview(data)
+        self._offset = 0
+
+    def read(self, size):
+        """Return next bytes.
+
+        Args:
+            size: number of bytes
+
+        Raises:
+            ValueError: if the data ends too early
+
+        Returns:
+            bytes: data
+        """
+        end = self._offset + size
+        if end > len(self._data):
+            raise ValueError("Truncated serialized program")
+        chunk = self._data[self._offset : end]
+        self._offset = end
+        return chunk.tobytes()
+
+    def unpack(self, layout):
+        """Return values of a struct.
+
+        Args:
+            layout: struct.Struct
+
+        Returns:
+            tuple: values
+        """
+        return layout.unpack(self.read(layout.size))
+
+    def count(self):
+        """Return an unsigned 32-bit number.
+
+        Returns:
+            int: number
+        """
+        return self.unpack(_COUNT)[0]
+
+    def array(self, typecode, length):
+        """Return array of numbers.
+
+        Args:
+            typecode: array type code
+            length: number of items
+
+        Returns:
+            array: numbers
+        """
+        values = array(typecode)
+        values.frombytes(self.read(values.itemsize * length))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def finish(self):
+        """Check all data was read.
+
+        Raises:
+            ValueError: if there is data after the program
+        """
+        if self._offset != len(self._data):
+            raise ValueError("Unexpected data after serialized program")
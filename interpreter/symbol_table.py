@@ -0,0 +1,293 @@
+# -*- coding:utf-8 -*-
+
+"""Symbol table's implementation. Variable names are numbered from zero."""
+
+from collections.abc import MutableMapping
+
+from interpreter.token import TokenType
+
+
+class SymbolTable(object):
+    """Names of the variables of a program numbered in order of appearance."""
+
+    def __init__(self):
+        """Construct an empty symbol table."""
+        self._names = []
+        self._symbol_ids = {}
+
+    def intern(self, name):
+        """Return id of the name, adding the name if it is new.
+
+        Args:
+            name: variable name
+
+        Returns:
+            int: symbol id
+        """
+        symbol_id = self._symbol_ids.get(name)
+        if symbol_id is None:
+            symbol_id = len(self._names)
+            self._names.append(name)
+            self._symbol_ids[name] = symbol_id
+        return symbol_id
+
+    def lookup(self, name):
+        """Return id of the name.
+
+        Args:
+            name: variable name
+
+        Returns:
+            int: symbol id or None if the name is unknown
+        """
+        return self._symbol_ids.get(name)
+
+    def name(self, symbol_id):
+        """Return name by id.
+
+        Args:
+            symbol_id: symbol id
+
+        Returns:
+            str: variable name
+        """
+        return self._names[symbol_id]
+
+    @property
+    def names(self):
+        """Return names ordered by id.
+
+        Returns:
+            list: variable names
+        """
+        return self._names
+
+    def __len__(self):
+        """Return number of names.
+
+        Returns:
+            int: number of names
+        """
+        return len(self._names)
+
+    def __contains__(self, name):
+        """Return True if the name is in the table.
+
+        Args:
+            name: variable name
+
+        Returns:
+            bool: True if the name is in the table
+        """
+        return name in self._symbol_ids
+
+
+class VariableSymbol(object):
+    """Declared variable."""
+
+    __slots__ = ("name", "type", "slot")
+
+    def __init__(self, name, var_type, slot):
+        """Construct a new variable symbol.
+
+        Args:
+            name: variable name
+            var_type: TokenType.integer_type or TokenType.real_type
+            slot: index of the variable in the program storage
+        """
+        self.name = name
+        self.type = var_type
+        self.slot = slot
+
+    def __str__(self):
+        """Represent object as a string.
+
+        Returns:
+            str: VariableSymbol as a string
+        """
+        return "VariableSymbol({0}: {1}, slot {2})".format(
+            self.name,
+            TokenType(self.type).name,
+            self.slot,
+        )
+
+
+class VariableTable(object):
+    """Declared variables of a program with dense slot indexes."""
+
+    def __init__(self):
+        """Construct an empty table."""
+        self._symbols = []
+        self._by_name = {}
+
+    def declare(self, name, var_type):
+        """Add variable and give it the next free slot.
+
+        Args:
+            name: variable name
+            var_type: TokenType.integer_type or TokenType.real_type
+
+        Returns:
+            VariableSymbol: new symbol or None if the name is already declared
+        """
+        if name in self._by_name:
+            return None
+        symbol = VariableSymbol(name, var_type, len(self._symbols))
+        self._symbols.append(symbol)
+        self._by_name[name] = symbol
+        return symbol
+
+    def lookup(self, name):
+        """Return declared variable.
+
+        Args:
+            name: variable name
+
+        Returns:
+            VariableSymbol: symbol or None if the name is not declared
+        """
+        return self._by_name.get(name)
+
+    def __len__(self):
+        """Return number of variables.
+
+        Returns:
+            int: number of variables
+        """
+        return len(self._symbols)
+
+    def __iter__(self):
+        """Return variables ordered by slot.
+
+        Returns:
+            iterator: variable symbols
+        """
+        return iter(self._symbols)
+
+    def __contains__(self, name):
+        """Return True if the variable is declared.
+
+        Args:
+            name: variable name
+
+        Returns:
+            bool: True if the variable is declared
+        """
+        return name in self._by_name
+
+
+class SlotScope(MutableMapping):
+    """Values of variables kept in a list indexed by slot.
+
+    Every name gets the next slot when it is first seen. Resolved nodes read
+    and write values directly, other callers use the scope as a dict of the
+    variables that have a value. None in a slot means no value.
+
+    Attributes:
+        values: values ordered by slot
+    """
+
+    def __init__(self, names=()):
+        """Construct a scope with slots for the names and no values.
+
+        Args:
+            names: variable names in slot order
+        """
+        self.values = []
+        self._names = []
+        self._slots = {}
+        for name in names:
+            self.slot(name)
+
+    def slot(self, name):
+        """Return slot of the name, adding a slot if the name is new.
+
+        Args:
+            name: variable name
+
+        Returns:
+            int: slot
+        """
+        slot = self._slots.get(name)
+        if slot is None:
+            slot = len(self._names)
+            self._names.append(name)
+            self._slots[name] = slot
+            self.values.append(None)
+        return slot
+
+    @property
+    def names(self):
+        """Return names ordered by slot.
+
+        Returns:
+            list: variable names
+        """
+        return self._names
+
+    def __getitem__(self, name):
+        """Return value of the variable.
+
+        Args:
+            name: variable name
+
+        Raises:
+            KeyError: if the variable has no value
+
+        Returns:
+            value: value of the variable
+        """
+        slot = self._slots.get(name)
+        value = None if slot is None else self.values[slot]
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        """Set value of the variable.
+
+        Args:
+            name: variable name
+            value: new value
+        """
+        self.values[self.slot(name)] = value
+
+    def __delitem__(self, name):
+        """Remove value of the variable, the slot is kept.
+
+        Args:
+            name: variable name
+
+        Raises:
+            KeyError: if the variable has no value
+        """
+        slot = self._slots.get(name)
+        if slot is None or self.values[slot] is None:
+            raise KeyError(name)
+        self.values[slot] = None
+
+    def __iter__(self):
+        """Return names of the variables with a value ordered by slot.
+
+        Returns:
+            iterator: variable names
+        """
+        return (
+            name for name, value in zip(self._names, self.values) if value is not None
+        )
+
+    def __len__(self):
+        """Return number of variables with a value.
+
+        Returns:
+            int: number of variables
+        """
+        return len(self.values) - self.values.count(None)
+
+    def __repr__(self):
+        """Represent object as a string.
+
+        Returns:
+            str: SlotScope as a string
+        """
+        return "SlotScope({0!r})".format(dict(self))
@@ -2,47 +2,61 @@
 
 """Token's implementation. A token is an object that has a value and type."""
 
-from enum import Enum
-
-
-class TokenType(Enum):
-    """Token's type implementation."""
-
-    integer = (0,)
-    plus = (1,)
-    minus = (2,)
-    multiply = (3,)
-    divide = (4,)
-    eof = (5,)
-    error = (6,)
-    lparen = (7,)
-    rparen = (8,)
-    dot = (9,)
-    semi = (10,)
-    assigin = (11,)
-    begin = (12,)
-    end = (13,)
-    variable = (14,)
-    program = (15,)
-    var = (16,)
-    integer_type = (17,)
-    real_type = (18,)
-    colon = (19,)
-    comma = (20,)
+from enum import IntEnum
+from types import MappingProxyType
+
+
+class TokenType(IntEnum):
+    """Token's type implementation. Values are compact integer codes."""
+
+    integer = 0
+    plus = 1
+    minus = 2
+    multiply = 3
+    divide = 4
+    eof = 5
+    error = 6
+    lparen = 7
+    rparen = 8
+    dot = 9
+    semi = 10
+    assigin = 11
+    begin = 12
+    end = 13
+    variable = 14
+    program = 15
+    var = 16
+    integer_type = 17
+    real_type = 18
+    colon = 19
+    comma = 20
+    real = 21
+
+    def __str__(self):
+        """Represent the token type as a string.
+
+        Returns:
+            str: token type as string
+        """
+        return "{0}.{1}".format(type(self).__name__, self.name)
 
 
 class Token(object):
     """Token's implementation."""
 
-    def __init__(self, token_type, token_value):
+    __slots__ = ("type", "value", "symbol_id")
+
+    def __init__(self, token_type, token_value, symbol_id=None):
         """Construct a new either.
 
         Args:
             token_type: token type
             token_value: token value
+            symbol_id: id of a variable name in the symbol table
         """
         self.value = token_value
         self.type = token_type
+        self.symbol_id = symbol_id
 
     def __str__(self):
         """Represent the class objects as a string.
@@ -53,13 +67,8 @@ class Token(object):
         return "Token: type: {0}, value: {1}".format(self.type, self.value)
 
 
-def make_single_symbols():
-    """Return reserved interpreter symbols.
-
-    Returns:
-        dict: key(str), value(Token)
-    """
-    return {
+_SINGLE_SYMBOLS = MappingProxyType(
+    {
         "+": Token(TokenType.plus, "+"),
         "-": Token(TokenType.minus, "-"),
         "*": Token(TokenType.multiply, "*"),
@@ -71,36 +80,57 @@ def make_single_symbols():
         ":=": Token(TokenType.assigin, ":="),
         ":": Token(TokenType.colon, ":"),
         ",": Token(TokenType.comma, ","),
-    }
+    },
+)
+
+_KEYWORDS = MappingProxyType(
+    {
+        "BEGIN": Token(TokenType.begin, "BEGIN"),
+        "END": Token(TokenType.end, "END"),
+        "PROGRAM": Token(TokenType.program, "PROGRAM"),
+        "VAR": Token(TokenType.var, "VAR"),
+        "INTEGER": Token(TokenType.integer_type, "INTEGER_TYPE"),
+        "REAL": Token(TokenType.real_type, "REAL_TYPE"),
+    },
+)
+
+_ERROR = Token(TokenType.error, "?")
+
+_EOF = Token(TokenType.eof, "")
+
+
+def make_single_symbols():
+    """Return reserved interpreter symbols.
+
+    The table and its tokens are shared, they must not be modified.
+
+    Returns:
+        mapping: key(str), value(Token)
+    """
+    return _SINGLE_SYMBOLS
 
 
 def make_keywords():
     """Return reserved interpreter symbols.
 
+    The table and its tokens are shared, they must not be modified.
+
     Returns:
-        dict: key(str), value(Token)
+        mapping: key(str), value(Token)
     """
-    return {
-        "BEGIN": Token(TokenType.begin, "BEGIN"),
-        "END": Token(TokenType.end, "END"),
-        "PROGRAM": Token(TokenType.program, "PROGRAM"),
-        "VAR": Token(TokenType.program, "VAR"),
-        "INTEGER": Token(TokenType.integer_type, "INTEGER_TYPE"),
-        "REAL": Token(TokenType.real_type, "REAL_TYPE"),
-    }
+    return _KEYWORDS
 
 
 def make_keyword_token(keyword):
     """Return token for keyword.
 
     Args:
-        keyword(str): reserved symbol sign
+        keyword(str): reserved symbol sign in any letter case
 
     Returns:
         token: an reserved symbol token or error token
     """
-    keywords = make_keywords()
-    return keywords.get(keyword, Token(TokenType.error, "?"))
+    return _KEYWORDS.get(keyword.upper(), _ERROR)
 
 
 def make_single_symbol_token(reserved_symbol):
@@ -112,8 +142,7 @@ def make_single_symbol_token(reserved_symbol):
     Returns:
         token: an reserved symbol token or error token
     """
-    symbols = make_single_symbols()
-    return symbols.get(reserved_symbol, Token(TokenType.error, "?"))
+    return _SINGLE_SYMBOLS.get(reserved_symbol, _ERROR)
 
 
 def make_integer(token_value):
@@ -128,22 +157,35 @@ def make_integer(token_value):
     return Token(TokenType.integer, int(token_value))
 
 
+def make_real(token_value):
+    """Return real token.
+
+    Args:
+        token_value: token value
+
+    Returns:
+        token: a real token
+    """
+    return Token(TokenType.real, float(token_value))
+
+
 def make_eof():
     """Return integer token.
 
     Returns:
         token: eof token
     """
-    return Token(TokenType.eof, "")
+    return _EOF
 
 
-def make_variable(variable_name):
+def make_variable(variable_name, symbol_id=None):
     """Return variable token.
 
     Args:
         variable_name: variable name
+        symbol_id: id of the name in the symbol table
 
     Returns:
         token: variable token
     """
-    return Token(TokenType.variable, variable_name)
+    return Token(TokenType.variable, variable_name, symbol_id)
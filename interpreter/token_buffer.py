@@ -0,0 +1,402 @@
+# -*- coding:utf-8 -*-
+
+"""Token buffer's implementation. Tokens are stored in compact parallel arrays."""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from operator import add
+
+from interpreter.symbol_table import SymbolTable
+from interpreter.token import TokenType
+
+_NEWLINE = re.compile("\n")
+
+# Largest number of pending offset shifts before they are applied.
+_MAX_SHIFTS = 256
+
+# Array type codes of the offsets and of the value ids.
+_OFFSET = "q"
+
+_VALUE_ID = "I"
+
+
+class TokenBuffer(object):
+    """Lexed program stored as parallel arrays.
+
+    Attributes:
+        source: program text
+        symbol_table: names of the variables in the buffer
+        types: token type codes, TokenType values (array of unsigned bytes)
+        starts: start offset of every token in the source
+        ends: end offset of every token in the source
+        value_ids: index of every token in the value table
+        literals: tokens by lexeme kept by the lexer for relexing, or None
+
+    A Token object is only handed out on access, and it comes from the
+    value table, so each distinct lexeme has a single Token.
+
+    Offsets of the tokens after a replaced range are not rewritten: the
+    shift is recorded and added on access by start() and end(), and the
+    recorded shifts are applied to the arrays when there are too many of
+    them or when starts or ends is read.
+    """
+
+    def __init__(self, source="", symbol_table=None):
+        """Construct an empty buffer.
+
+        Args:
+            source: program text
+            symbol_table: symbol table (a new one by default)
+        """
+        if symbol_table is None:
+            symbol_table = SymbolTable()
+        self.source = source
+        self.symbol_table = symbol_table
+        self.types = array("B")
+        self.value_ids = array(_VALUE_ID)
+        self.literals = None
+        self._starts = array(_OFFSET)
+        self._ends = array(_OFFSET)
+        self._values = []
+        self._value_index = {}
+        self._line_index = None
+        # Tokens from _shift_indexes[i] on are moved by _shift_totals[i].
+        self._shift_indexes = []
+        self._shift_totals = []
+
+    def append(self, token, start, end):
+        """Add token to the end of the buffer.
+
+        Args:
+            token: token to add
+            start: start offset of the token in the source
+            end: end offset of the token in the source
+        """
+        shift = self.shift_at(len(self.types))
+        self.types.append(token.type)
+        self._starts.append(start - shift)
+        self._ends.append(end - shift)
+        self.value_ids.append(self._intern(token))
+
+    def extend(self, other, shift, values=None):
+        """Add tokens of another buffer to the end of the buffer.
+
+        Args:
+            other: token buffer
+            shift: value added to the offsets of the added tokens
+            values: tokens to store instead of other.values, in the same order
+        """
+        if values is None:
+            values = other.values
+        value_ids = [self._intern(token) for token in values]
+        self.types.extend(other.types)
+        self.starts.extend(map(add, other.starts, repeat(shift)))
+        self.ends.extend(map(add, other.ends, repeat(shift)))
+        self.value_ids.extend(value_ids[value_id] for value_id in other.value_ids)
+
+    def replace(self, start, stop, tokens, shift):
+        """Replace a range of tokens and move the tokens after it.
+
+        The tokens after the range are moved by recording the shift, so
+        the cost does not grow with the number of tokens after the range.
+
+        Args:
+            start: index of the first replaced token
+            stop: index after the last replaced token
+            tokens: list of (token, start offset, end offset) to insert
+            shift: value added to the offsets of the tokens after the range
+        """
+        before = self.shift_at(start)
+        types, starts, ends, value_ids = self._stored(tokens, before)
+        self.types[start:stop] = types
+        self._starts[start:stop] = starts
+        self._ends[start:stop] = ends
+        self.value_ids[start:stop] = value_ids
+        self._move_shifts(start, stop, start + len(tokens), shift)
+
+    def start(self, index):
+        """Return start offset of the token.
+
+        Args:
+            index: token index
+
+        Returns:
+            int: offset in the source
+        """
+        return self._starts[index] + self.shift_at(index)
+
+    def end(self, index):
+        """Return end offset of the token.
+
+        Args:
+            index: token index
+
+        Returns:
+            int: offset in the source
+        """
+        return self._ends[index] + self.shift_at(index)
+
+    def find_start(self, offset, low=0):
+        """Return index of the first token starting at or after the offset.
+
+        Args:
+            offset: offset in the source
+            low: index to start the search at
+
+        Returns:
+            int: token index
+        """
+        return bisect_left(_Offsets(self, self._starts), offset, low)
+
+    def find_end(self, offset, low=0):
+        """Return index of the first token ending at or after the offset.
+
+        Args:
+            offset: offset in the source
+            low: index to start the search at
+
+        Returns:
+            int: token index
+        """
+        return bisect_left(_Offsets(self, self._ends), offset, low)
+
+    def shift_at(self, index):
+        """Return pending shift of the offsets of the token.
+
+        Args:
+            index: token index
+
+        Returns:
+            int: value to add to the stored offsets
+        """
+        position = bisect_right(self._shift_indexes, index)
+        return self._shift_totals[position - 1] if position else 0
+
+    @property
+    def starts(self):
+        """Return start offsets of the tokens.
+
+        Returns:
+            array: start offset of every token in the source
+        """
+        self._apply_shifts()
+        return self._starts
+
+    @property
+    def ends(self):
+        """Return end offsets of the tokens.
+
+        Returns:
+            array: end offset of every token in the source
+        """
+        self._apply_shifts()
+        return self._ends
+
+    def type_at(self, index):
+        """Return type of the token.
+
+        Args:
+            index: token index
+
+        Returns:
+            TokenType: token type
+        """
+        return TokenType(self.types[index])
+
+    def position(self, index):
+        """Return line and column of the token, both counted from 1.
+
+        The line index of the source is built on the first call.
+
+        Args:
+            index: token index
+
+        Returns:
+            tuple: line and column
+        """
+        if self._line_index is None or self._line_index.text is not self.source:
+            self._line_index = LineIndex(self.source)
+        return self._line_index.position(self.start(index))
+
+    @property
+    def values(self):
+        """Return the table of distinct tokens.
+
+        Returns:
+            list: tokens referenced by value_ids
+        """
+        return self._values
+
+    def __len__(self):
+        """Return number of tokens.
+
+        Returns:
+            int: number of tokens
+        """
+        return len(self.types)
+
+    def __getitem__(self, index):
+        """Return token by index.
+
+        Args:
+            index: token index
+
+        Returns:
+            token: token
+        """
+        return self._values[self.value_ids[index]]
+
+    def __iter__(self):
+        """Return a cursor over the tokens.
+
+        Returns:
+            TokenCursor: token iterator
+        """
+        return TokenCursor(self)
+
+    def _stored(self, tokens, shift):
+        """Return arrays of tokens with the offsets stored for a shift.
+
+        Args:
+            tokens: list of (token, start offset, end offset)
+            shift: pending shift of the offsets where the tokens go
+
+        Returns:
+            tuple: types, start offsets, end offsets and value ids
+        """
+        return (
+            array("B", [token.type for token, _, _ in tokens]),
+            array(_OFFSET, [start - shift for _, start, _ in tokens]),
+            array(_OFFSET, [end - shift for _, _, end in tokens]),
+            array(_VALUE_ID, [self._intern(token) for token, _, _ in tokens]),
+        )
+
+    def _move_shifts(self, start, stop, new_stop, shift):
+        """Record that the tokens from stop on move to new_stop and by shift.
+
+        Args:
+            start: index of the first replaced token
+            stop: index after the last replaced token
+            new_stop: index after the last inserted token
+            shift: value added to the offsets of the moved tokens
+        """
+        last = bisect_right(self._shift_indexes, stop)
+        indexes = [index + new_stop - stop for index in self._shift_indexes[last:]]
+        totals = [total + shift for total in self._shift_totals[last:]]
+        total = self.shift_at(stop) + shift
+        if total != self.shift_at(start):
+            indexes.insert(0, new_stop)
+            totals.insert(0, total)
+        first = bisect_right(self._shift_indexes, start)
+        self._shift_indexes[first:] = indexes
+        self._shift_totals[first:] = totals
+        if len(self._shift_indexes) > _MAX_SHIFTS:
+            self._apply_shifts()
+
+    def _apply_shifts(self):
+        bounds = self._shift_indexes + [len(self.types)]
+        for first, last, shift in zip(bounds, bounds[1:], self._shift_totals):
+            if shift:
+                _shift_range(self._starts, first, last, shift)
+                _shift_range(self._ends, first, last, shift)
+        self._shift_indexes = []
+        self._shift_totals = []
+
+    def _intern(self, token):
+        value_id = self._value_index.get(token)
+        if value_id is None:
+            value_id = len(self._values)
+            self._values.append(token)
+            self._value_index[token] = value_id
+        return value_id
+
+
+class _Offsets(object):
+    """Sequence of the offsets of a buffer with the pending shifts added."""
+
+    def __init__(self, buffer, offsets):
+        self._buffer = buffer
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        return self._offsets[index] + self._buffer.shift_at(index)
+
+
+def _shift_range(offsets, first, last, shift):
+    shifted = map(add, offsets[first:last], repeat(shift))
+    offsets[first:last] = array(_OFFSET, shifted)
+
+
+class LineIndex(object):
+    """Offsets of line starts for converting offsets to line and column."""
+
+    def __init__(self, text):
+        """Construct a new line index.
+
+        Args:
+            text: program text
+        """
+        self.text = text
+        self.line_starts = [0]
+        self.line_starts.extend(match.end() for match in _NEWLINE.finditer(text))
+
+    def position(self, offset):
+        """Return line and column of the offset, both counted from 1.
+
+        Args:
+            offset: offset in the text
+
+        Returns:
+            tuple: line and column
+        """
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+
+class TokenCursor(object):
+    """Iterator over a token buffer that knows the index of the next token."""
+
+    def __init__(self, buffer):
+        """Construct a new cursor.
+
+        Args:
+            buffer: token buffer
+        """
+        self.buffer = buffer
+        self.index = 0
+
+    def __iter__(self):
+        """Return an iterator object.
+
+        Returns:
+            iterator: an iterator object
+        """
+        return self
+
+    def position(self):
+        """Return line and column of the last returned token.
+
+        Returns:
+            tuple: line and column
+        """
+        return self.buffer.position(self.index - 1)
+
+    def __next__(self):
+        """Return the next token.
+
+        Raises:
+            StopIteration: if there are no further tokens.
+
+        Returns:
+            token: the next token
+        """
+        index = self.index
+        if index >= len(self.buffer):
+            raise StopIteration
+        self.index = index + 1
+        return self.buffer[index]
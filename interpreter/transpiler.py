@@ -0,0 +1,280 @@
+# -*- coding:utf-8 -*-
+
+"""Translating AST to Python code objects."""
+
+import ast
+import sys
+from itertools import starmap
+from types import MappingProxyType
+
+from interpreter.ast import (
+    AssignOperator,
+    BinaryOperation,
+    CompoundOperator,
+    EmptyOperator,
+    Num,
+    Program,
+    UnaryOperation,
+    Variable,
+)
+from interpreter.dispatcher import NodeDispatcher
+from interpreter.token import TokenType
+
+# The generated function. Variables live in locals named _LOCAL_PREFIX +
+# their index, so any Pascal name works, also one Python would change by
+# NFKC normalization or reject.
+_TEMPLATE = """
+def program(scope):
+    try:
+        pass
+    finally:
+        pass
+"""
+
+_LOCAL_PREFIX = "v"
+
+_FILENAME = "<pascal>"
+
+_EXPRESSIONS = (Num, Variable, BinaryOperation, UnaryOperation)
+
+_OPERATORS = MappingProxyType(
+    {
+        TokenType.plus: ast.Add,
+        TokenType.minus: ast.Sub,
+        TokenType.multiply: ast.Mult,
+        TokenType.divide: ast.Div,
+    },
+)
+
+
+class Transpiler(NodeDispatcher):
+    """Translates AST to a Python function.
+
+    Every variable becomes a local of the function. The locals are read
+    from the global scope when the function starts and written back when
+    it ends, also when it fails. The first use of a variable that was not
+    assigned before is checked and raises NameError, as in
+    CalculationVisitor; later uses read the local directly.
+    """
+
+    _handlers = {
+        Num: "_translate_num",
+        BinaryOperation: "_translate_binary_operation",
+        UnaryOperation: "_translate_unary_operation",
+        CompoundOperator: "_translate_compound_operator",
+        EmptyOperator: "_translate_empty_operator",
+        AssignOperator: "_translate_assign_operator",
+        Variable: "_translate_variable",
+        Program: "_translate_program",
+    }
+
+    def __init__(self):
+        """Construct a new transpiler."""
+        super().__init__()
+        self._names = {}
+        self._assigned = set()
+
+    def transpile(self, tree):
+        """Return Python module defining function program(scope).
+
+        The function runs the tree on the global scope (dict) and returns
+        the value of an expression, None for statements. It calls global
+        function missing(name) for a variable used before it is assigned.
+        The AttributeError of dispatch is raised if the tree holds a node
+        of an unknown type.
+
+        Args:
+            tree: abstract syntax tree or expression
+
+        Returns:
+            ast.Module: Python module
+        """
+        module = ast.parse(_TEMPLATE)
+        function = module.body[0]
+        try_statement = function.body[0]
+        try_statement.body = self._translate_body(tree)
+        stores = list(starmap(_store_back, self._names.items()))
+        try_statement.finalbody = stores or [ast.Pass()]
+        function.body = list(starmap(_load, self._names.items()))
+        function.body.append(try_statement)
+        return ast.fix_missing_locations(module)
+
+    def _translate_body(self, tree):
+        if isinstance(tree, _EXPRESSIONS):
+            return [ast.Return(value=self.dispatch(tree))]
+        return self.dispatch(tree) or [ast.Pass()]
+
+    def _translate_num(self, node):
+        return ast.Constant(value=node.value)
+
+    def _translate_variable(self, node):
+        """Translate Variable node.
+
+        Args:
+            node: variable
+
+        Returns:
+            ast.expr: the local, checked on its first use before assignment
+        """
+        name = node.value
+        local = self._local(name)
+        if name in self._assigned:
+            return ast.Name(id=local, ctx=ast.Load())
+        self._assigned.add(name)
+        return ast.IfExp(
+            test=ast.Compare(
+                left=ast.Name(id=local, ctx=ast.Load()),
+                ops=[ast.IsNot()],
+                comparators=[ast.Constant(value=None)],
+            ),
+            body=ast.Name(id=local, ctx=ast.Load()),
+            orelse=ast.Call(
+                func=ast.Name(id="missing", ctx=ast.Load()),
+                args=[ast.Constant(value=name)],
+                keywords=[],
+            ),
+        )
+
+    def _translate_binary_operation(self, node):
+        """Translate BinaryOperation node.
+
+        x / 0 with a literal 0 becomes the constant 0 and x is dropped,
+        which is what the visitor returns for it.
+
+        Args:
+            node: binary operation
+
+        Returns:
+            ast.expr: operation
+        """
+        operator = _OPERATORS.get(node.op.type, ast.Div)
+        right = node.right
+        if operator is ast.Div and isinstance(right, Num) and right.value == 0:
+            return ast.Constant(value=0)
+        return ast.BinOp(
+            left=self.dispatch(node.left),
+            op=operator(),
+            right=self.dispatch(right),
+        )
+
+    def _translate_unary_operation(self, node):
+        operand = self.dispatch(node.expr)
+        if node.op.type == TokenType.minus:
+            return ast.UnaryOp(op=ast.USub(), operand=operand)
+        return operand
+
+    def _translate_compound_operator(self, node):
+        statements = []
+        for statement in node.compound_statement:
+            statements.extend(self.dispatch(statement))
+        return statements
+
+    def _translate_empty_operator(self, node):
+        return []
+
+    def _translate_assign_operator(self, node):
+        """Translate AssignOperator node.
+
+        Args:
+            node: assignment
+
+        Returns:
+            list: assignment to the local
+        """
+        value = self.dispatch(node.expr)
+        name = node.variable.value
+        self._assigned.add(name)
+        target = ast.Name(id=self._local(name), ctx=ast.Store())
+        return [ast.Assign(targets=[target], value=value)]
+
+    def _translate_program(self, node):
+        return self.dispatch(node.compound_statement)
+
+    def _local(self, name):
+        local = self._names.get(name)
+        if local is None:
+            local = "{0}{1}".format(_LOCAL_PREFIX, len(self._names))
+            self._names[name] = local
+        return local
+
+
+def compile_python(tree):
+    """Return Python function running a tree.
+
+    The tree is translated and compiled once. Call the function for every
+    run.
+
+    Args:
+        tree: abstract syntax tree
+
+    Returns:
+        function: function taking the global scope (dict) and returning the
+            value of an expression, None for statements
+    """
+    module = Transpiler().transpile(tree)
+    namespace = {"missing": _missing}
+    exec(compile(module, _FILENAME, "exec"), namespace)  # noqa: S102, WPS421
+    return namespace["program"]
+
+
+def _load(name, local):
+    """Return statement reading a variable from the scope.
+
+    Args:
+        name: variable name
+        local: name of the local
+
+    Returns:
+        ast.stmt: local = scope.get(name)
+    """
+    return ast.Assign(
+        targets=[ast.Name(id=local, ctx=ast.Store())],
+        value=ast.Call(
+            func=ast.Attribute(
+                value=ast.Name(id="scope", ctx=ast.Load()),
+                attr="get",
+                ctx=ast.Load(),
+            ),
+            args=[ast.Constant(value=name)],
+            keywords=[],
+        ),
+    )
+
+
+def _store_back(name, local):
+    """Return statement writing an assigned variable to the scope.
+
+    Args:
+        name: variable name
+        local: name of the local
+
+    Returns:
+        ast.stmt: if local is not None: scope[name] = local
+    """
+    key = ast.Constant(value=name)
+    if sys.version_info < (3, 9):
+        key = ast.Index(value=key)
+    return ast.If(
+        test=ast.Compare(
+            left=ast.Name(id=local, ctx=ast.Load()),
+            ops=[ast.IsNot()],
+            comparators=[ast.Constant(value=None)],
+        ),
+        body=[
+            ast.Assign(
+                targets=[
+                    ast.Subscript(
+                        value=ast.Name(id="scope", ctx=ast.Load()),
+                        slice=key,
+                        ctx=ast.Store(),
+                    ),
+                ],
+                value=ast.Name(id=local, ctx=ast.Load()),
+            ),
+        ],
+        orelse=[],
+    )
+
+
+def _missing(name):
+    raise NameError(repr(name))
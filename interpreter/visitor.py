@@ -3,15 +3,20 @@
 """Implementing a Visitor template for AST."""
 
 
+from interpreter.arena import VIEW_TYPES
 from interpreter.ast import (
     AssignOperator,
     BinaryOperation,
     CompoundOperator,
     EmptyOperator,
     Num,
+    Program,
+    ResolvedAssignOperator,
+    ResolvedVariable,
     UnaryOperation,
     Variable,
 )
+from interpreter.symbol_table import SlotScope
 from interpreter.token import TokenType
 
 
@@ -21,30 +26,45 @@ class CalculationVisitor(object):
     def __init__(self, global_scope):
         """Construct a new visitor.
 
+        Nodes resolved for a SlotScope (see interpreter.resolver) read and
+        write its values by slot when the global scope is that SlotScope,
+        and by name otherwise.
+
         Args:
             global_scope (dict): global scope for storing variables
         """
         self._global_scope = global_scope
+        self._methods = {
+            Num: self._visit_num,
+            BinaryOperation: self._visit_binary_operation,
+            UnaryOperation: self._visit_unary_operation,
+            CompoundOperator: self._visit_compaund_operator,
+            EmptyOperator: self._visit_empty_operator,
+            AssignOperator: self._visit_assigin_operator,
+            Variable: self._visit_variable,
+            Program: self._visit_program,
+        }
+        for view_type, node_type in VIEW_TYPES.items():
+            self._methods[view_type] = self._methods[node_type]
+        self._methods[ResolvedVariable] = self._visit_variable
+        self._methods[ResolvedAssignOperator] = self._visit_assigin_operator
+        if isinstance(global_scope, SlotScope):
+            self._values = global_scope.values
+            self._methods[ResolvedVariable] = self._visit_resolved_variable
+            self._methods[ResolvedAssignOperator] = self._visit_resolved_assign_operator
 
     def visit(self, node):
         """Visit all nodes in AST.
 
+        Nodes of an AstArena are visited through their views.
+
         Args:
             node: node to run
 
         Returns:
             result: calculation result (tree traversal result)
         """
-        methods = {
-            Num: self._visit_num,
-            BinaryOperation: self._visit_binary_operation,
-            UnaryOperation: self._visit_unary_operation,
-            CompoundOperator: self._visit_compaund_operator,
-            EmptyOperator: self._visit_empty_operator,
-            AssignOperator: self._visit_assigin_operator,
-            Variable: self._visit_variable,
-        }
-        method = methods.get(type(node), self._error)
+        method = self._methods.get(type(node), self._error)
         return method(node)
 
     def _visit_num(self, node):
@@ -101,6 +121,14 @@ class CalculationVisitor(object):
         for statement in node.compound_statement:
             self.visit(statement)
 
+    def _visit_program(self, node):
+        """Visit Program node and run its compound statement.
+
+        Args:
+            node: program
+        """
+        self.visit(node.compound_statement)
+
     def _visit_empty_operator(self, node):
         pass
 
@@ -131,6 +159,31 @@ class CalculationVisitor(object):
             raise NameError(repr(var_name))
         return val
 
+    def _visit_resolved_assign_operator(self, node):
+        """Visit resolved assignment and save the value in its slot.
+
+        Args:
+            node: resolved assign operator
+        """
+        self._values[node.slot] = self.visit(node.expr)
+
+    def _visit_resolved_variable(self, node):
+        """Visit resolved variable and return the value in its slot.
+
+        Args:
+            node: resolved variable
+
+        Raises:
+             NameError: if the variable has no value
+
+        Returns:
+            value: value of variable
+        """
+        val = self._values[node.slot]
+        if val is None:
+            raise NameError(repr(node.value))
+        return val
+
     def _error(self, node):
         """Raise error.
 
@@ -0,0 +1,21 @@
+# -*- coding:utf-8 -*-
+
+"""Helpers shared by the tests."""
+
+
+def run_error(function, *args):
+    """Call function and return the runtime error of the program it runs.
+
+    Args:
+        function: function running a program
+        args: arguments of the function
+
+    Returns:
+        tuple: type and message of a NameError or ZeroDivisionError, None if
+            the program ran without one
+    """
+    try:
+        function(*args)
+    except (NameError, ZeroDivisionError) as error:
+        return type(error), str(error)
+    return None
@@ -0,0 +1,108 @@
+# -*- coding:utf-8 -*-
+
+"""Flat AST tests."""
+
+import pytest
+from interpreter.arena import (
+    ASSIGN,
+    BINARY,
+    COMPOUND,
+    EMPTY,
+    NUM,
+    VARIABLE,
+    BinaryOperationView,
+    build_arena,
+)
+from interpreter.ast import Num, Variable
+from interpreter.lexer import get_token_buffer
+from interpreter.parser import Parser
+from interpreter.token import make_integer
+from interpreter.visitor import CalculationVisitor
+
+_PROGRAMS = (
+    "BEGIN a := 2; b := a * (a - 3) + 10 / 4; c := -b; END.",
+    "BEGIN BEGIN x := 1.5 END; y := +x; BEGIN END END.",
+    "PROGRAM p; VAR a : INTEGER; b : REAL; BEGIN a := 1; b := a / 0 END.",
+)
+
+
+def _parse(text):
+    return Parser(get_token_buffer(text)).parse()
+
+
+def test_arena_layout():
+    """Check nodes are stored in parallel arrays."""
+    arena = build_arena(_parse("BEGIN a := 1 + 2; END."))
+
+    assert list(arena.kinds) == [COMPOUND, ASSIGN, VARIABLE, BINARY, NUM, NUM, EMPTY]
+    assert arena.root == 0
+    assert list(arena.statements) == [1, 6]
+    assert (arena.left[0], arena.right[0]) == (0, 2)
+    assert (arena.left[1], arena.right[1]) == (2, 3)
+    assert (arena.left[3], arena.right[3]) == (4, 5)
+    assert arena.constant(3).value == "+"
+    assert arena.constant(4).value == 1
+    assert len(arena) == 7
+
+
+def test_constants_are_shared():
+    """Check a token used by many nodes is stored once in the pool."""
+    arena = build_arena(_parse("BEGIN a := a + a + a; b := a END."))
+
+    variables = [
+        arena.constants[index]
+        for index in range(len(arena))
+        if arena.kinds[index] == VARIABLE
+    ]
+
+    assert len(variables) == 6
+    assert len(set(variables)) == 2
+
+
+@pytest.mark.parametrize("text", _PROGRAMS)
+def test_views_match_tree(text):
+    """Check views print like the nodes and run in the visitor.
+
+    Args:
+        text: program text
+    """
+    tree = _parse(text)
+    view = build_arena(tree).tree
+    expected_scope = {}
+    scope = {}
+
+    CalculationVisitor(expected_scope).visit(tree)
+    CalculationVisitor(scope).visit(view)
+
+    assert str(view) == str(tree)
+    assert scope == expected_scope
+
+
+def test_view_types():
+    """Check views are instances of the node classes."""
+    arena = build_arena(_parse("BEGIN a := b / 0 END."))
+    expression = arena.tree.compound_statement[0].expr
+
+    assert type(expression) is BinaryOperationView
+    assert isinstance(expression.right, Num)
+    assert isinstance(arena.tree.compound_statement[0].variable, Variable)
+    assert CalculationVisitor({"b": 1}).visit(expression) == 0
+
+
+def test_deep_tree():
+    """Check a deeply nested expression is stored without recursion."""
+    depth = 100000
+    text = "BEGIN a := {0}1{1} END.".format("(" * depth, ")" * depth)
+    arena = build_arena(_parse(text))
+
+    assert len(arena) == 4
+    assert arena.constant(3).value == 1
+
+
+def test_nodes_have_no_dict():
+    """Check nodes do not carry an instance dictionary."""
+    node = Num(make_integer(1))
+
+    assert not hasattr(node, "__dict__")
+    with pytest.raises(AttributeError):
+        node.extra = 1
@@ -0,0 +1,120 @@
+# -*- coding:utf-8 -*-
+
+"""AST builder tests."""
+
+import pytest
+from interpreter.builder import AstBuilder
+from interpreter.intereter import parse
+from interpreter.serialization import dumps, loads
+from interpreter.visitor import CalculationVisitor
+
+
+def test_builds_parsed_tree():
+    """Check a built program equals the parsed text."""
+    build = AstBuilder()
+    tree = build.compound(
+        [
+            build.assign("a", 2),
+            build.assign(
+                "B", build.add(build.mul("a", build.sub("a", 3)), build.div(10, 4))
+            ),
+            build.compound([build.assign("c", build.unary("-", "b"))]),
+            build.assign("d", -1.5),
+            build.empty(),
+        ],
+    )
+    text = "BEGIN a := 2; b := a * (a - 3) + 10 / 4; BEGIN c := -b END; d := -1.5; END."
+
+    assert str(tree) == str(parse(text))
+
+
+def test_builds_program():
+    """Check a built program with declarations equals the parsed text."""
+    build = AstBuilder()
+    tree = build.program(
+        "Example",
+        [("a", "INTEGER"), ("b", "integer"), ("y", "REAL")],
+        build.assignments(
+            [("a", 2), ("b", build.mul("a", 10)), ("y", build.div("b", 4))]
+        ),
+    )
+    parsed = parse(
+        "PROGRAM Example; VAR a, b : INTEGER; y : REAL; "
+        "BEGIN a := 2; b := a * 10; y := b / 4 END.",
+    )
+    scope = {}
+
+    CalculationVisitor(scope).visit(tree)
+
+    assert str(tree) == str(parsed)
+    assert [(symbol.name, symbol.type) for symbol in tree.variables] == [
+        (symbol.name, symbol.type) for symbol in parsed.variables
+    ]
+    assert scope == {"a": 2, "b": 20, "y": 5.0}
+    assert str(loads(dumps(tree)).tree) == str(parsed)
+
+
+def test_shared_tokens():
+    """Check names and numbers get one token with a symbol id."""
+    build = AstBuilder()
+    first = build.assign("Total", build.add("total", 1))
+    second = build.assign("total", 1)
+
+    assert first.variable.token is second.variable.token
+    assert first.expr.left.token is first.variable.token
+    assert first.expr.right.token is second.expr.token
+    assert first.variable.symbol_id == 0
+    assert build.num(1.0).token is not build.num(1).token
+    assert build.symbol_table.names == ["total"]
+
+
+def test_negative_zero():
+    """Check negative zero is negated also after positive zero was built."""
+    build = AstBuilder()
+    zero = build.num(0.0)
+    negative = build.num(-0.0)
+
+    assert str(negative) == str(
+        parse("BEGIN a := -0.0 END.").compound_statement[0].expr
+    )
+    assert negative.expr.token is zero.token
+    assert str(build.num(0.0)) == str(zero)
+
+
+def test_empty_compound():
+    """Check an empty compound statement holds an empty statement."""
+    assert str(AstBuilder().compound()) == str(parse("BEGIN END."))
+
+
+@pytest.mark.parametrize(
+    "make, error",
+    [
+        (lambda build: build.var("1a"), ValueError),
+        (lambda build: build.var("a_b"), ValueError),
+        (lambda build: build.var("begin"), ValueError),
+        (lambda build: build.var(None), TypeError),
+        (lambda build: build.num("1"), TypeError),
+        (lambda build: build.num(True), TypeError),
+        (lambda build: build.num(float("nan")), ValueError),
+        (lambda build: build.binary("%", 1, 2), ValueError),
+        (lambda build: build.unary("*", 1), ValueError),
+        (lambda build: build.add(1, build.assign("a", 1)), TypeError),
+        (lambda build: build.add(1, None), TypeError),
+        (lambda build: build.assign(build.num(1), 1), TypeError),
+        (lambda build: build.compound([build.num(1)]), TypeError),
+        (
+            lambda build: build.program("p", [("a", "REAL"), ("A", "REAL")], []),
+            ValueError,
+        ),
+        (lambda build: build.program("p", [("a", "TEXT")], []), ValueError),
+    ],
+)
+def test_validation(make, error):
+    """Check invalid trees are rejected.
+
+    Args:
+        make: function building a tree
+        error: expected exception
+    """
+    with pytest.raises(error):
+        make(AstBuilder())
@@ -0,0 +1,44 @@
+# -*- coding:utf-8 -*-
+
+"""Bytecode compiler and virtual machine tests."""
+
+from interpreter.bytecode import VirtualMachine, compile_tree
+from interpreter.intereter import parse
+
+
+def test_disassembly():
+    """Check constants and variables are shared and shown by name."""
+    code = compile_tree(parse("BEGIN a := 2; b := a * 2 + a / 0 END."))
+
+    assert str(code).splitlines() == [
+        "LOAD_CONST 2",
+        "STORE a",
+        "LOAD_VARIABLE a",
+        "LOAD_CONST 2",
+        "MULTIPLY",
+        "LOAD_CONST 0",
+        "ADD",
+        "STORE b",
+    ]
+    assert code.constants == [2, 0]
+    assert code.names == ["a", "b"]
+    assert len(code) == 8
+
+
+def test_integer_and_real_constants():
+    """Check equal integer and real constants are kept apart."""
+    code = compile_tree(parse("BEGIN a := 1 + 1.0 END."))
+
+    assert code.constants == [1, 1.0]
+    assert VirtualMachine({}).run(code) is None
+
+
+def test_deep_expression():
+    """Check deeply nested expressions are compiled without recursion."""
+    depth = 5000
+    text = "BEGIN a := {0}1{1} END.".format("(" * depth, " + 1)" * depth)
+    scope = {}
+
+    VirtualMachine(scope).run(compile_tree(parse(text)))
+
+    assert scope == {"a": depth + 1}
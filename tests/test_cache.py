@@ -0,0 +1,124 @@
+# -*- coding:utf-8 -*-
+
+"""Program cache tests."""
+
+import os
+
+import pytest
+from interpreter.cache import SourceCache, source_key
+from interpreter.intereter import interpret, parse
+from interpreter.parser import InvalidSyntaxError
+
+
+class _CountingParse(object):
+    """Parse function that counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return parse(text)
+
+
+def test_hits_and_misses():
+    """Check a program is parsed once and then served from memory."""
+    cache = SourceCache()
+    build = _CountingParse()
+
+    first = cache.get("BEGIN a := 1 END.", build)
+    second = cache.get("BEGIN a := 1 END.", build)
+
+    assert first is second
+    assert build.calls == 1
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+    assert "BEGIN a := 1 END." in cache
+    assert "BEGIN a := 2 END." not in cache
+
+
+def test_lru_eviction():
+    """Check the least recently used program is evicted first."""
+    cache = SourceCache(maxsize=2)
+    build = _CountingParse()
+    programs = ["BEGIN a := {0} END.".format(index) for index in range(3)]
+
+    cache.get(programs[0], build)
+    cache.get(programs[1], build)
+    cache.get(programs[0], build)
+    cache.get(programs[2], build)
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert programs[0] in cache
+    assert programs[1] not in cache
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
+
+
+def test_zero_size():
+    """Check a cache of size zero keeps nothing in memory."""
+    cache = SourceCache(maxsize=0)
+    build = _CountingParse()
+
+    cache.get("BEGIN END.", build)
+    cache.get("BEGIN END.", build)
+
+    assert build.calls == 2
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        SourceCache(maxsize=-1)
+
+
+def test_errors_are_not_cached():
+    """Check a program with a syntax error is parsed on every call."""
+    cache = SourceCache()
+
+    for _ in range(2):
+        with pytest.raises(InvalidSyntaxError):
+            cache.get("BEGIN a := END.", parse)
+
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+def test_disk_cache(tmp_path):
+    """Check a new cache over the same directory starts warm."""
+    text = "PROGRAM p; VAR a : INTEGER; b : REAL; BEGIN a := 2; b := a * 1.5 END."
+    SourceCache(directory=str(tmp_path)).get(text, parse)
+    warm = SourceCache(directory=str(tmp_path))
+    build = _CountingParse()
+
+    ast = warm.get(text, build)
+
+    assert build.calls == 0
+    assert (warm.hits, warm.disk_hits, warm.misses) == (0, 1, 0)
+    assert [symbol.name for symbol in ast.variables] == ["a", "b"]
+    assert interpret(text, warm) == {"a": 2, "b": 3.0}
+    assert warm.hits == 1
+
+
+def test_corrupt_disk_entry(tmp_path):
+    """Check an unreadable entry is rebuilt and written again."""
+    text = "BEGIN a := 1 END."
+    path = os.path.join(str(tmp_path), "{0}.pickle".format(source_key(text)))
+    with open(path, "wb") as cache_file:
+        cache_file.write(b"not a pickle")
+    cache = SourceCache(directory=str(tmp_path))
+
+    cache.get(text, parse)
+
+    assert cache.misses == 1
+    assert SourceCache(directory=str(tmp_path)).get(text, None) is not None
+
+
+def test_interpret():
+    """Check interpret returns the variables and reuses the parsed program."""
+    cache = SourceCache()
+    text = "BEGIN a := 2; b := a * 10 + 1 END."
+
+    assert interpret(text, cache) == {"a": 2, "b": 21}
+    assert interpret(text, cache) == {"a": 2, "b": 21}
+    assert (cache.hits, cache.misses) == (1, 1)
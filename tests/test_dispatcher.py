@@ -0,0 +1,31 @@
+# -*- coding:utf-8 -*-
+
+"""Node dispatcher tests."""
+
+import pytest
+from interpreter.arena import build_arena
+from interpreter.ast import Num
+from interpreter.dispatcher import NodeDispatcher
+from interpreter.intereter import parse
+
+
+class _NumberDispatcher(NodeDispatcher):
+    _handlers = {Num: "_number"}
+
+    def _number(self, node):
+        return node.value
+
+
+def test_views_use_node_methods():
+    """Check a view is handled by the method of its node class."""
+    tree = parse("BEGIN a := 42 END.")
+    number = build_arena(tree).tree.compound_statement[0].expr
+
+    assert type(number) is not Num
+    assert _NumberDispatcher().dispatch(number) == 42
+
+
+def test_unknown_node():
+    """Check a node without a method is rejected."""
+    with pytest.raises(AttributeError, match="No handler found"):
+        _NumberDispatcher().dispatch(parse("BEGIN END."))
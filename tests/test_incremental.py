@@ -0,0 +1,156 @@
+# -*- coding:utf-8 -*-
+
+"""Incremental parsing tests."""
+
+import random
+import re
+
+import pytest
+from interpreter.incremental import ParseTree
+from interpreter.lexer import get_token_buffer
+from interpreter.parser import InvalidSyntaxError, Parser
+
+_PROGRAM = """BEGIN
+    a := 1;
+    BEGIN
+        b := a * 2;
+        c := (b + 3) / 4;
+        BEGIN d := 5 END
+    END;
+    e := a - 1;
+    f := -e
+END."""
+
+_EDIT_PIECES = (
+    "1",
+    "7",
+    " ",
+    ";",
+    "a",
+    "x",
+    ":=",
+    "+",
+    "*",
+    "(",
+    ")",
+    "BEGIN ",
+    " END",
+    "y := 2;",
+)
+
+
+def _full_parse(text):
+    try:
+        return str(Parser(get_token_buffer(text)).parse())
+    except InvalidSyntaxError:
+        return None
+
+
+def _edit(tree, text, offset, deleted_length, inserted_text):
+    new_text = text[:offset] + inserted_text + text[offset + deleted_length :]
+    try:
+        ast = str(tree.edit(offset, deleted_length, inserted_text))
+    except InvalidSyntaxError:
+        ast = None
+    return new_text, ast
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_full_parse(seed):
+    """Check random edits give the same AST as parsing the new text.
+
+    Args:
+        seed: random seed
+    """
+    rnd = random.Random(seed)
+    text = _PROGRAM
+    tree = ParseTree(get_token_buffer(text))
+    for _ in range(60):
+        offset = rnd.randint(0, len(text))
+        deleted_length = rnd.randint(0, min(4, len(text) - offset))
+        inserted_text = "".join(
+            rnd.choice(_EDIT_PIECES) for _ in range(rnd.randint(0, 2))
+        )
+        text, ast = _edit(tree, text, offset, deleted_length, inserted_text)
+
+        assert ast == _full_parse(text)
+        if ast is None:
+            text = _PROGRAM
+            tree = ParseTree(get_token_buffer(text))
+
+
+@pytest.mark.parametrize(
+    "declarations",
+    ["", "PROGRAM p; VAR a, b, c, d, e, f, x, y : INTEGER;\n"],
+)
+def test_matches_full_parse_on_statement_edits(declarations):
+    """Check edits that keep the program valid are mostly incremental.
+
+    Args:
+        declarations: program header
+    """
+    rnd = random.Random(0)
+    text = declarations + _PROGRAM
+    tree = ParseTree(get_token_buffer(text))
+    for _ in range(200):
+        offset = rnd.choice([match.end() + 1 for match in re.finditer(":=", text)])
+        inserted_text = rnd.choice(("1 + ", "x * ", "(2) - "))
+        text, ast = _edit(tree, text, offset, 0, inserted_text)
+
+        assert ast == _full_parse(text)
+    assert tree.full_parses == 1
+
+
+def test_unchanged_nodes_are_kept():
+    """Check only the compound statements on the edited path are new nodes."""
+    tree = ParseTree(get_token_buffer(_PROGRAM))
+    old = tree.ast
+    old_inner = old.compound_statement[1]
+
+    new = tree.edit(_PROGRAM.index("(b + 3)"), 1, "b * (")
+
+    new_inner = new.compound_statement[1]
+    assert new is not old
+    assert new_inner is not old_inner
+    assert str(new) == _full_parse(tree.buffer.source)
+    assert new.compound_statement[0] is old.compound_statement[0]
+    assert new.compound_statement[2:] == old.compound_statement[2:]
+    assert new_inner.compound_statement[0] is old_inner.compound_statement[0]
+    assert new_inner.compound_statement[2] is old_inner.compound_statement[2]
+    assert str(old_inner.compound_statement[1]) == (
+        "AssignOperator(Variable(c) := BinaryOperation(BinaryOperation(Variable(b) + Num(3)) / Num(4)))"
+    )
+    assert tree.full_parses == 1
+
+
+def test_statement_split_and_merge():
+    """Check adding and removing a separator splits and merges statements."""
+    text = "BEGIN a := 1; b := 2 END."
+    tree = ParseTree(get_token_buffer(text))
+    first = tree.ast.compound_statement[0]
+
+    ast = tree.edit(text.index(" b"), 0, " x := 3;")
+
+    assert str(ast) == _full_parse("BEGIN a := 1; x := 3; b := 2 END.")
+    assert ast.compound_statement[0] is first
+
+    ast = tree.edit(tree.buffer.source.index("; b"), len("; b :="), " +")
+
+    assert str(ast) == _full_parse("BEGIN a := 1; x := 3 + 2 END.")
+    assert len(ast.compound_statement) == 2
+    assert ast.compound_statement[0] is first
+    assert tree.full_parses == 1
+
+    with pytest.raises(InvalidSyntaxError):
+        tree.edit(len("BEGIN a := 1"), 1, " +")
+
+
+def test_header_edit_parses_everything():
+    """Check an edit outside the statements parses the whole buffer again."""
+    text = "PROGRAM p; VAR a : INTEGER; BEGIN a := 1 END."
+    tree = ParseTree(get_token_buffer(text))
+
+    ast = tree.edit(text.index("INTEGER"), len("INTEGER"), "REAL")
+
+    assert tree.full_parses == 2
+    assert str(ast.block) == "Block (VAR VariableDeclaration(Variable(a): REAL_TYPE))"
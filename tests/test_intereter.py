@@ -0,0 +1,222 @@
+# -*- coding:utf-8 -*-
+
+"""Interpreter tests."""
+
+import io
+
+import pytest
+from interpreter.arena import build_arena
+from interpreter.bytecode import VirtualMachine, compile_tree
+from interpreter.cache import SourceCache
+from interpreter.closures import compile_closures
+from interpreter.intereter import (
+    COMPILED_CACHES,
+    ENGINES,
+    interpret,
+    interpret_stream,
+    parse,
+)
+from interpreter.resolver import resolve_slots
+from interpreter.symbol_table import SlotScope
+from interpreter.transpiler import compile_python
+from interpreter.visitor import CalculationVisitor
+from tests.helpers import run_error
+
+_PROGRAM = """PROGRAM p;
+VAR a, b : INTEGER; c : REAL;
+BEGIN
+    a := 2;
+    BEGIN b := a * 10 END;
+    c := b / 4
+END.
+"""
+
+_PROGRAMS = (
+    "BEGIN END.",
+    "BEGIN a := 2; b := a * (a - 3) + 10 / 4; c := -b; END.",
+    "BEGIN BEGIN x := 1.5 END; y := +x; BEGIN END; z := --y END.",
+    "PROGRAM p; VAR a : INTEGER; b : REAL; BEGIN a := 1; b := a / 0 END.",
+    "BEGIN a := 7; b := a / 0.0; c := undefined / 0; d := a / 2 END.",
+    "BEGIN class := 1; none := class + 1; scope := none * 2 END.",
+    "BEGIN \ufb01x := 1; fix := 2; x\u00b2 := \ufb01x + 1 END.",
+)
+
+
+def _compile(engine, tree):
+    """Return function running a tree on a dict scope with the engine.
+
+    Args:
+        engine: engine name
+        tree: abstract syntax tree
+
+    Returns:
+        function: function taking the scope and returning the result
+    """
+    if engine == "visitor":
+        return lambda scope: CalculationVisitor(scope).visit(tree)
+    if engine == "slots":
+        return _slots_runner(tree)
+    if engine == "bytecode":
+        code = compile_tree(tree)
+        return lambda scope: VirtualMachine(scope).run(code)
+    if engine == "closure":
+        return compile_closures(tree)
+    return compile_python(tree)
+
+
+def _slots_runner(tree):
+    """Return function running a tree the way interpret(engine="slots") does.
+
+    The tree is resolved once. Every run seeds a SlotScope from the dict
+    scope and copies the values back, also when the program fails.
+
+    Args:
+        tree: abstract syntax tree
+
+    Returns:
+        function: function taking the scope and returning the result
+    """
+    resolved, resolved_scope = resolve_slots(tree)
+    names = tuple(resolved_scope.names)
+
+    def run(scope):
+        slot_scope = SlotScope(names)
+        slot_scope.update(scope)
+        try:
+            return CalculationVisitor(slot_scope).visit(resolved)
+        finally:
+            scope.update(slot_scope)
+
+    return run
+
+
+@pytest.mark.parametrize("text", _PROGRAMS)
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_matches_visitor(engine, text):
+    """Check every engine leaves the same variables as the visitor.
+
+    Args:
+        engine: engine name
+        text: program text
+    """
+    assert interpret(text, engine=engine) == interpret(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "BEGIN a := 1; b := c + 1; d := 2 END.",
+        "BEGIN a := 1; b := a - a; c := 2 / b; d := 3 END.",
+        "BEGIN x := 5; x := x / (x - x) END.",
+    ],
+)
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_errors_match_visitor(engine, text):
+    """Check a failing program fails alike and keeps earlier assignments.
+
+    Args:
+        engine: engine name
+        text: program text
+    """
+    tree = parse(text)
+    visitor_scope = {"x": 1}
+    engine_scope = {"x": 1}
+
+    error = run_error(_compile(engine, tree), engine_scope)
+    assert error is not None
+    assert error == run_error(_compile("visitor", tree), visitor_scope)
+    assert engine_scope == visitor_scope
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_runs_many_times(engine):
+    """Check a compiled program can be run again with other scopes.
+
+    Args:
+        engine: engine name
+    """
+    program = _compile(engine, parse("BEGIN b := a * 2; a := a + 1 END."))
+    first = {"a": 1, "unused": 0}
+    second = {"a": 10}
+
+    program(first)
+    program(first)
+    program(second)
+
+    assert first == {"a": 3, "unused": 0, "b": 4}
+    assert second == {"a": 11, "b": 20}
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_expression_result(engine):
+    """Check a compiled expression returns its value.
+
+    Args:
+        engine: engine name
+    """
+    tree = parse("BEGIN a := -(1 + b) * 4 / 0 + +b END.").compound_statement[0].expr
+
+    assert _compile(engine, tree)({"b": 2}) == 2
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_arena_views(engine):
+    """Check trees stored in an arena run through their views.
+
+    Args:
+        engine: engine name
+    """
+    scope = {}
+
+    _compile(engine, build_arena(parse(_PROGRAMS[1])).tree)(scope)
+
+    assert scope == interpret(_PROGRAMS[1])
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_unknown_node(engine):
+    """Check an unknown node is rejected like in the visitor.
+
+    Args:
+        engine: engine name
+    """
+    with pytest.raises(AttributeError):
+        _compile(engine, object())({})
+
+
+@pytest.mark.parametrize("engine", sorted(COMPILED_CACHES))
+def test_interpret_compiles_once(engine):
+    """Check interpret keeps the compiled program between calls.
+
+    Args:
+        engine: engine name
+    """
+    text = "BEGIN {0} := 1; {0} := {0} + 41 END.".format(engine)
+    compiled = COMPILED_CACHES[engine]
+    misses = compiled.misses
+
+    for _ in range(3):
+        assert interpret(text, SourceCache(), engine=engine) == {engine: 42}
+
+    assert compiled.misses == misses + 1
+
+
+def test_unknown_engine():
+    """Check an unknown engine is rejected."""
+    with pytest.raises(ValueError, match="engine"):
+        interpret("BEGIN END.", engine="jit")
+
+
+def test_interpret_stream():
+    """Check a streamed program gives the same variables as interpret."""
+    assert interpret_stream(io.StringIO(_PROGRAM)) == interpret(_PROGRAM)
+
+
+def test_interpret_stream_from_path(tmp_path):
+    """Check a program is streamed from a file into the given scope."""
+    path = tmp_path / "program.pas"
+    path.write_text("BEGIN a := a + 1; b := 3 END.")
+    scope = {"a": 1}
+
+    assert interpret_stream(str(path), scope) is scope
+    assert scope == {"a": 2, "b": 3}
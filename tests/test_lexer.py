@@ -2,11 +2,26 @@
 
 """Lexer representation tests."""
 
+import io
+import mmap
+import random
+
 import pytest
-from interpreter.lexer import get_tokens, _parse_number, _parse_word, TextIterator
+from interpreter import lexer
+from interpreter.lexer import (
+    get_token,
+    get_token_by_char,
+    get_token_stream,
+    get_tokens,
+    _parse_number,
+    _parse_word,
+    TextIterator,
+)
 from interpreter.token import (
+    TokenType,
     make_eof,
     make_integer,
+    make_real,
     make_single_symbol_token,
     make_variable,
     make_keyword_token,
@@ -140,9 +155,9 @@ def test_program_token2(test_input):
 @pytest.mark.parametrize(
     "test_input",
     [
-        "PROGRAM program; VAR x:REAL",
-        " PROGRAM program ; VAR x : REAL",
-        "PROGRAM program ;\n VAR x : REAL",
+        "PROGRAM example; VAR x:REAL",
+        " PROGRAM example ; VAR x : REAL",
+        "PROGRAM example ;\n VAR x : REAL",
     ],
 )
 def test_program_token3(test_input):
@@ -161,7 +176,7 @@ def test_program_token3(test_input):
     integer_token = next(tokens)
 
     expected_program = make_keyword_token("PROGRAM")
-    expected_variable1 = make_variable("program")
+    expected_variable1 = make_variable("example")
     expected_semi = make_single_symbol_token(";")
     expected_var = make_keyword_token("VAR")
     expected_variable2 = make_variable("x")
@@ -193,9 +208,9 @@ def test_program_token3(test_input):
 @pytest.mark.parametrize(
     "test_input",
     [
-        "PROGRAM program; VAR x:REAL; y:INTEGER;",
-        " PROGRAM program ; VAR x : REAL; y:INTEGER;",
-        "PROGRAM program ;\n VAR x : REAL; y : INTEGER;",
+        "PROGRAM example; VAR x:REAL; y:INTEGER;",
+        " PROGRAM example ; VAR x : REAL; y:INTEGER;",
+        "PROGRAM example ;\n VAR x : REAL; y : INTEGER;",
     ],
 )
 def test_program_token4(test_input):
@@ -219,7 +234,7 @@ def test_program_token4(test_input):
     semi_token3 = next(tokens)
 
     expected_program = make_keyword_token("PROGRAM")
-    expected_variable1 = make_variable("program")
+    expected_variable1 = make_variable("example")
     expected_semi1 = make_single_symbol_token(";")
     expected_var = make_keyword_token("VAR")
     expected_variable2 = make_variable("x")
@@ -591,3 +606,232 @@ def _run_parse(parse_function, text):
     iterator = TextIterator(new_text)
 
     return parse_function(first, iterator)
+
+
+_PROGRAM_PIECES = (
+    "BEGIN",
+    "END",
+    "PROGRAM",
+    "VAR",
+    "INTEGER",
+    "REAL",
+    "x",
+    "value1",
+    "Total",
+    "0",
+    "42",
+    "100500",
+    "3.14",
+    "0.5",
+    ":=",
+    "+",
+    "-",
+    "*",
+    "/",
+    "(",
+    ")",
+    ";",
+    ":",
+    ",",
+    "{comment}",
+    "{ BEGIN x := 1 }",
+)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_engines_produce_same_tokens(seed):
+    """Check the regex engine and the per-character engine agree.
+
+    Args:
+        seed: random seed
+    """
+    rnd = random.Random(seed)
+    separators = (" ", "  ", "\n", "\t")
+    pieces = [rnd.choice(_PROGRAM_PIECES) for _ in range(200)]
+    text = "".join(piece + rnd.choice(separators) for piece in pieces) + "."
+
+    expected = [(token.type, token.value) for token in get_token_by_char(text)]
+    actual = [(token.type, token.value) for token in get_token(text)]
+
+    assert actual == expected
+
+
+def test_get_tokens_engine():
+    """Check get_tokens can run the per-character engine."""
+    text = "BEGIN a := 5; b := a * 2 END."
+    expected = [(token.type, token.value) for token in get_tokens(text)]
+    actual = [
+        (token.type, token.value)
+        for token in get_tokens(text, engine=get_token_by_char)
+    ]
+
+    assert actual == expected
+
+
+_STREAM_PROGRAM = (
+    "PROGRAM longname1; {a comment that is longer than a chunk}\n"
+    "BEGIN\n    value := 123456 * (x - 7);\n    y:=value{c}+1; z : = 2;\n"
+    "    r := 12.375 / 0.5\nEND."
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64 * 1024])
+def test_token_stream_text_file(chunk_size):
+    """Check chunk boundaries do not change the token stream.
+
+    Args:
+        chunk_size: data for test
+    """
+    expected = [(token.type, token.value) for token in get_token(_STREAM_PROGRAM)]
+    tokens = get_token_stream(io.StringIO(_STREAM_PROGRAM), chunk_size=chunk_size)
+    actual = [(token.type, token.value) for token in tokens]
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5])
+def test_token_stream_bytes(chunk_size):
+    """Check a binary source is decoded across chunk boundaries.
+
+    Args:
+        chunk_size: data for test
+    """
+    text = "BEGIN переменная := 5; {комментарий} b := 10 END."
+    expected = [(token.type, token.value) for token in get_token(text)]
+    tokens = get_token_stream(io.BytesIO(text.encode("utf-8")), chunk_size=chunk_size)
+    actual = [(token.type, token.value) for token in tokens]
+
+    assert actual == expected
+
+
+def test_token_stream_path_and_mmap(tmp_path):
+    """Check a program can be read from a path or a memory-mapped file.
+
+    Args:
+        tmp_path: temporary directory
+    """
+    path = tmp_path / "program.pas"
+    path.write_text(_STREAM_PROGRAM, encoding="utf-8")
+    expected = [(token.type, token.value) for token in get_token(_STREAM_PROGRAM)]
+
+    from_path = [(token.type, token.value) for token in get_token_stream(path)]
+    with open(path, "rb") as program_file:
+        with mmap.mmap(program_file.fileno(), 0, access=mmap.ACCESS_READ) as source:
+            from_mmap = [
+                (token.type, token.value)
+                for token in get_token_stream(source, chunk_size=4)
+            ]
+
+    assert from_path == expected
+    assert from_mmap == expected
+
+
+def test_token_stream_unterminated_comment():
+    """Check an unterminated comment swallows the rest of the program."""
+    tokens = get_token_stream(io.StringIO("a := 1 {never closed 2 + 3"), chunk_size=3)
+    actual = [(token.type, token.value) for token in tokens]
+
+    assert actual == [(token.type, token.value) for token in get_token("a := 1")]
+
+
+def test_token_stream_distinct_literals(monkeypatch):
+    """Check the shared literal table of a stream is reset when it grows.
+
+    Args:
+        monkeypatch: pytest fixture
+    """
+    monkeypatch.setattr(lexer, "_STREAM_LITERALS", 40)
+    statements = (
+        "Ab{0} := ab{1} + {2}".format(index % 7, index, index) for index in range(300)
+    )
+    text = "BEGIN {0} END.".format("; ".join(statements))
+    expected = [(token.type, token.value, token.symbol_id) for token in get_token(text)]
+    tokens = list(get_token_stream(io.StringIO(text), chunk_size=16))
+    names = [token for token in tokens if token.value == "ab0"]
+
+    assert [(token.type, token.value, token.symbol_id) for token in tokens] == expected
+    assert names[0] is not names[-1]
+    assert names[0].symbol_id == names[-1].symbol_id
+
+
+def test_repeated_literals_share_token():
+    """Check repeated identifiers and integers reuse one token object."""
+    tokens = list(get_token("a := a + 1; b := 1 + a"))
+
+    assert tokens[0] is tokens[2]
+    assert tokens[0] is tokens[10]
+    assert tokens[4] is tokens[8]
+    assert tokens[1] is make_single_symbol_token(":=")
+    assert not hasattr(tokens[0], "__dict__")
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [("1.5", 1.5), (" 0.25 ", 0.25), ("100.125", 100.125), ("{c}3.0{c}", 3.0)],
+)
+def test_real_literal(test_input):
+    """Check real literals are lexed as one token.
+
+    Args:
+        test_input: data for test
+    """
+    text, value = test_input
+    tokens = list(get_token(text))
+    expected = make_real(value)
+
+    assert [(token.type, token.value) for token in tokens] == [
+        (expected.type, expected.value),
+        (TokenType.eof, ""),
+    ]
+
+
+@pytest.mark.parametrize("engine", [get_token, get_token_by_char])
+def test_dot_after_integer(engine):
+    """Check a dot without digits after it is not a decimal point.
+
+    Args:
+        engine: lexer engine
+    """
+    tokens = [(token.type, token.value) for token in engine("x := 5. 1.5.")]
+
+    assert tokens == [
+        (TokenType.variable, "x"),
+        (TokenType.assigin, ":="),
+        (TokenType.integer, 5),
+        (TokenType.dot, ","),
+        (TokenType.real, 1.5),
+        (TokenType.dot, ","),
+        (TokenType.eof, ""),
+    ]
+
+
+def test_real_literals_converted_once():
+    """Check a repeated real literal is converted to a single token."""
+    tokens = list(get_token("2.5 * 2.5 + 2.50"))
+
+    assert tokens[0] is tokens[2]
+    assert tokens[0].value == tokens[4].value == 2.5
+
+
+@pytest.mark.parametrize("keyword", ["BEGIN", "begin", "Begin", "bEgIn"])
+@pytest.mark.parametrize("engine", [get_token, get_token_by_char])
+def test_keywords_ignore_case(keyword, engine):
+    """Check keywords are recognized in any letter case.
+
+    Args:
+        keyword: data for test
+        engine: lexer engine
+    """
+    token = next(engine(keyword))
+
+    assert token is make_keyword_token("BEGIN")
+
+
+def test_identifiers_ignore_case():
+    """Check spellings of one identifier share a lower-cased token."""
+    tokens = list(get_token("Total := total + TOTAL; program := 1"))
+
+    assert tokens[0].value == "total"
+    assert tokens[0] is tokens[2]
+    assert tokens[0] is tokens[4]
+    assert tokens[6] is make_keyword_token("PROGRAM")
@@ -0,0 +1,173 @@
+# -*- coding:utf-8 -*-
+
+"""Constant folding tests."""
+
+import random
+
+import pytest
+from interpreter.arena import build_arena
+from interpreter.intereter import parse
+from interpreter.optimizer import count_nodes, fold_constants
+from interpreter.visitor import CalculationVisitor
+from tests.helpers import run_error
+
+
+def _assert_same_results(tree, folded):
+    for initial in ({}, {"x": 3, "y": 0}, {"x": 0.5, "y": -2}):
+        scope = dict(initial)
+        folded_scope = dict(initial)
+        folded_error = run_error(CalculationVisitor(folded_scope).visit, folded)
+        assert folded_error == run_error(CalculationVisitor(scope).visit, tree)
+        assert folded_scope == scope
+        for name, value in scope.items():
+            assert type(folded_scope[name]) is type(value)
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        ("a := 2 * (3 + 4)", "Num(14)"),
+        ("a := 10 / 4 - 1", "Num(1.5)"),
+        ("a := -(2 - 5)", "Num(3)"),
+        ("a := x * 1 + 0", "Variable(x)"),
+        ("a := 1 * x - 0", "Variable(x)"),
+        ("a := 0 + -(-x)", "Variable(x)"),
+        ("a := +x", "Variable(x)"),
+        ("a := x + 0.0", "BinaryOperation(Variable(x) + Num(0.0))"),
+        ("a := x * 0", "BinaryOperation(Variable(x) * Num(0))"),
+        ("a := x / 1", "BinaryOperation(Variable(x) / Num(1))"),
+        ("a := x / 0", "Num(0)"),
+        (
+            "a := x / (1 - 1)",
+            "BinaryOperation(Variable(x) / BinaryOperation(Num(1) - Num(1)))",
+        ),
+        (
+            "a := -x * (2 + 2)",
+            "BinaryOperation(UnaryOperation(- Variable(x)) * Num(4))",
+        ),
+    ],
+)
+def test_fold_expression(test_input):
+    """Check expressions are simplified.
+
+    Args:
+        test_input: data for tests
+    """
+    statement, result = test_input
+    tree = parse("BEGIN {0} END.".format(statement))
+
+    folded, _ = fold_constants(tree)
+
+    assert str(folded.compound_statement[0].expr) == result
+    _assert_same_results(tree, folded)
+
+
+def test_propagate_constants():
+    """Check a variable is replaced by the number assigned last."""
+    tree = parse(
+        """BEGIN
+            z := y;
+            a := 2;
+            BEGIN b := a * 3; c := y + a END;
+            a := x;
+            d := a + 1;
+            a := 5;
+            e := a / 0;
+            f := a / (a - 5)
+        END.""",
+    )
+
+    folded, _ = fold_constants(tree)
+
+    assert [str(statement) for statement in folded.compound_statement] == [
+        "AssignOperator(Variable(z) := Variable(y))",
+        "AssignOperator(Variable(a) := Num(2))",
+        "CompoundOperator(BEGIN AssignOperator(Variable(b) := Num(6)) "
+        "AssignOperator(Variable(c) := BinaryOperation(Variable(y) + Num(2))) END)",
+        "AssignOperator(Variable(a) := Variable(x))",
+        "AssignOperator(Variable(d) := BinaryOperation(Variable(a) + Num(1)))",
+        "AssignOperator(Variable(a) := Num(5))",
+        "AssignOperator(Variable(e) := Num(0))",
+        "AssignOperator(Variable(f) := "
+        "BinaryOperation(Num(5) / BinaryOperation(Variable(a) - Num(5))))",
+    ]
+    _assert_same_results(tree, folded)
+
+
+def test_removed_nodes():
+    """Check the number of removed nodes is reported."""
+    tree = parse("BEGIN a := 2 * (3 + 4); b := a * x; c := x * 1 END.")
+
+    folded, removed = fold_constants(tree)
+
+    assert count_nodes(tree) == 18
+    assert count_nodes(folded) == 12
+    assert removed == 6
+
+
+def test_tree_is_not_changed():
+    """Check folding builds new nodes instead of changing the tree."""
+    tree = parse("PROGRAM p; VAR a : INTEGER; BEGIN a := 1 + 2; b := a END.")
+    text = str(tree)
+
+    folded, _ = fold_constants(tree)
+
+    assert str(tree) == text
+    assert str(folded.compound_statement) == (
+        "CompoundOperator(BEGIN AssignOperator(Variable(a) := Num(3)) "
+        "AssignOperator(Variable(b) := Num(3)) END)"
+    )
+    assert folded.variables is tree.variables
+
+
+def test_arena_views():
+    """Check trees stored in an arena are folded through their views."""
+    tree = parse("BEGIN a := 2 * (3 + 4); b := a * x END.")
+
+    folded, removed = fold_constants(build_arena(tree).tree)
+
+    assert str(folded) == str(fold_constants(tree)[0])
+    assert removed == 4
+
+
+def test_overflow_is_not_folded():
+    """Check an operation raising an error is left to run."""
+    tree = parse("BEGIN a := {0} / 3 END.".format(10**400))
+
+    folded, removed = fold_constants(tree)
+
+    assert removed == 0
+    with pytest.raises(OverflowError):
+        CalculationVisitor({}).visit(folded)
+
+
+def _random_expression(rnd, depth):
+    if depth == 0 or rnd.random() < 0.2:
+        return rnd.choice(["0", "1", "2", "0.5", "0.0", "x", "y", "a", "b"])
+    if rnd.random() < 0.2:
+        return "{0}({1})".format(rnd.choice("+-"), _random_expression(rnd, depth - 1))
+    return "({0} {1} {2})".format(
+        _random_expression(rnd, depth - 1),
+        rnd.choice("+-*/"),
+        _random_expression(rnd, depth - 1),
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_programs(seed):
+    """Check folding keeps the results of random programs.
+
+    Args:
+        seed: random seed
+    """
+    rnd = random.Random(seed)
+    statements = [
+        "{0} := {1}".format(rnd.choice("abxy"), _random_expression(rnd, 4))
+        for _ in range(8)
+    ]
+    tree = parse("BEGIN {0} END.".format("; ".join(statements)))
+
+    folded, removed = fold_constants(tree)
+
+    assert removed >= 0
+    _assert_same_results(tree, folded)
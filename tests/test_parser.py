@@ -3,8 +3,25 @@
 # """Interpreter representation tests."""
 
 
-from interpreter.lexer import get_token
-from interpreter.parser import Parser
+import random
+
+import pytest
+from interpreter.ast import (
+    BinaryOperation,
+    EmptyOperator,
+    Num,
+    Program,
+    UnaryOperation,
+    Variable,
+)
+from interpreter.lexer import get_token, get_token_buffer
+from interpreter.parser import InvalidSyntaxError, Parser
+from interpreter.token import (
+    TokenType,
+    make_integer,
+    make_single_symbol_token,
+    make_variable,
+)
 from interpreter.visitor import CalculationVisitor
 
 
@@ -290,3 +307,410 @@ def test_compound_operator5():
     assert global_scope["a"] == 40
     assert global_scope["b"] == -40
     assert global_scope["c"] == 12
+
+
+def test_real_literals():
+    """Check real literals are evaluated as floats."""
+    parser = Parser(get_token("BEGIN a := 1.5 * 4; b := a / 0.5 - 0.25 END."))
+    ast = parser.parse()
+
+    global_scope = {}
+    visitor = CalculationVisitor(global_scope)
+    visitor.visit(ast)
+
+    assert global_scope == {"a": 6.0, "b": 11.75}
+    assert isinstance(ast.compound_statement[0].expr.left.value, float)
+
+
+def test_syntax_error_position():
+    """Check a syntax error reports the line and column of the bad token."""
+    parser = Parser(get_token_buffer("BEGIN\n    a := 2;\n    b := * 3\nEND."))
+
+    with pytest.raises(InvalidSyntaxError) as error:
+        parser.parse()
+
+    assert error.value.position == (3, 10)
+    assert str(error.value) == "Invalid syntax at line 3, column 10"
+
+
+def test_syntax_error_without_position():
+    """Check a token generator gives an error without position."""
+    parser = Parser(get_token("BEGIN a := END."))
+
+    with pytest.raises(InvalidSyntaxError) as error:
+        parser.parse()
+
+    assert error.value.position is None
+    assert str(error.value) == "Invalid syntax"
+
+
+_PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2}
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_expression_tree(seed):
+    """Check operator precedence and associativity on random expressions.
+
+    Args:
+        seed: random seed
+    """
+    expected, text = _random_expression(random.Random(seed), 6)
+    ast = Parser(get_token(text))._expr()
+
+    assert str(ast) == str(expected)
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    ["(" * 100000 + "1" + ")" * 100000, "-" * 100000 + "1"],
+)
+def test_deep_expression(test_input):
+    """Check deep nesting does not hit the recursion limit.
+
+    Args:
+        test_input: data for test
+    """
+    node = Parser(get_token(test_input))._expr()
+    depth = 0
+    while isinstance(node, UnaryOperation):
+        node = node.expr
+        depth += 1
+
+    assert isinstance(node, Num)
+    assert depth in {0, 100000}
+
+
+@pytest.mark.parametrize("test_input", ["(1 + 2", "((1) + 2", "1 + (2 * (3)"])
+def test_unclosed_parenthesis(test_input):
+    """Check a missing right parenthesis is a syntax error.
+
+    Args:
+        test_input: data for test
+    """
+    with pytest.raises(InvalidSyntaxError):
+        Parser(get_token(test_input))._expr()
+
+
+def _random_expression(rnd, depth):
+    """Return a random expression tree and its text with minimal parenthesis.
+
+    Args:
+        rnd: random generator
+        depth: maximum depth of the tree
+
+    Returns:
+        tuple: expected tree and program text
+    """
+    kind = rnd.random()
+    if depth == 0 or kind < 0.2:
+        if rnd.random() < 0.5:
+            value = rnd.randint(0, 9)
+            return Num(make_integer(value)), str(value)
+        name = rnd.choice("xyz")
+        return Variable(make_variable(name)), name
+    if kind < 0.35:
+        op = rnd.choice("+-")
+        operand, text = _random_expression(rnd, depth - 1)
+        if isinstance(operand, BinaryOperation):
+            text = "(" + text + ")"
+        return UnaryOperation(make_single_symbol_token(op), operand), op + text
+    op = rnd.choice("+-*/")
+    left, left_text = _random_expression(rnd, depth - 1)
+    right, right_text = _random_expression(rnd, depth - 1)
+    if _binary_precedence(left) < _PRECEDENCE[op]:
+        left_text = "(" + left_text + ")"
+    if _binary_precedence(right) <= _PRECEDENCE[op]:
+        right_text = "(" + right_text + ")"
+    node = BinaryOperation(left, make_single_symbol_token(op), right)
+    return node, " ".join((left_text, op, right_text))
+
+
+def _binary_precedence(node):
+    if isinstance(node, BinaryOperation):
+        return _PRECEDENCE[node.op.value]
+    return 3
+
+
+@pytest.mark.parametrize("make_source", [get_token, get_token_buffer])
+def test_lookahead(make_source):
+    """Check the parser can look several tokens ahead.
+
+    Args:
+        make_source: lexer function
+    """
+    parser = Parser(make_source("BEGIN a := 1 + b END."))
+
+    assert parser.peek() == TokenType.variable
+    assert parser.peek(2) == TokenType.assigin
+    assert parser.peek(4) == TokenType.plus
+    assert parser.peek(8) == TokenType.eof
+    assert parser.peek(50) == TokenType.eof
+    assert parser.current_type == TokenType.begin
+
+    node = parser.parse()
+
+    assert str(node) == (
+        "CompoundOperator(BEGIN AssignOperator(Variable(a) := "
+        "BinaryOperation(Num(1) + Variable(b))) END)"
+    )
+
+
+def test_parser_starts_at_cursor():
+    """Check the parser continues from the index of a token cursor."""
+    cursor = iter(get_token_buffer("BEGIN a := 2 * 3 END."))
+    next(cursor)
+    next(cursor)
+    next(cursor)
+    parser = Parser(cursor)
+
+    assert str(parser._expr()) == "BinaryOperation(Num(2) * Num(3))"
+    assert parser.current_type == TokenType.end
+
+
+_DECLARED_PROGRAM = """PROGRAM Part10;
+VAR
+   number     : INTEGER;
+   a, b, c, x : INTEGER;
+   y          : REAL;
+
+BEGIN
+   number := 2;
+   a := number;
+   y := 20 / 7 + 3.14
+END.
+"""
+
+
+@pytest.mark.parametrize("make_source", [get_token, get_token_buffer])
+def test_program_declarations(make_source):
+    """Check the program header and VAR section are parsed into a Block.
+
+    Args:
+        make_source: lexer function
+    """
+    ast = Parser(make_source(_DECLARED_PROGRAM)).parse()
+
+    assert ast.name.value == "part10"
+    assert [str(declaration) for declaration in ast.block.declarations] == [
+        "VariableDeclaration(Variable(number): INTEGER_TYPE)",
+        "VariableDeclaration(Variable(a): INTEGER_TYPE)",
+        "VariableDeclaration(Variable(b): INTEGER_TYPE)",
+        "VariableDeclaration(Variable(c): INTEGER_TYPE)",
+        "VariableDeclaration(Variable(x): INTEGER_TYPE)",
+        "VariableDeclaration(Variable(y): REAL_TYPE)",
+    ]
+    assert [(symbol.name, symbol.type, symbol.slot) for symbol in ast.variables] == [
+        ("number", TokenType.integer_type, 0),
+        ("a", TokenType.integer_type, 1),
+        ("b", TokenType.integer_type, 2),
+        ("c", TokenType.integer_type, 3),
+        ("x", TokenType.integer_type, 4),
+        ("y", TokenType.real_type, 5),
+    ]
+
+    global_scope = {}
+    CalculationVisitor(global_scope).visit(ast)
+
+    assert global_scope["a"] == 2
+    assert global_scope["y"] == pytest.approx(20 / 7 + 3.14)
+
+
+def test_program_without_declarations():
+    """Check a program header may be followed by the body directly."""
+    ast = Parser(get_token("PROGRAM empty; BEGIN a := 1 END.")).parse()
+
+    assert ast.block.declarations == []
+    assert len(ast.variables) == 0
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "PROGRAM p; VAR a : INTEGER BEGIN END.",
+        "PROGRAM p; VAR a INTEGER; BEGIN END.",
+        "PROGRAM p; VAR a : b; BEGIN END.",
+        "PROGRAM p; VAR a, : REAL; BEGIN END.",
+        "PROGRAM p; VAR BEGIN END.",
+        "PROGRAM p VAR a : REAL; BEGIN END.",
+        "PROGRAM p; BEGIN END",
+    ],
+)
+def test_invalid_declarations(text):
+    """Check malformed declaration sections are rejected.
+
+    Args:
+        text: program text
+    """
+    with pytest.raises(InvalidSyntaxError):
+        Parser(get_token(text)).parse()
+
+
+def test_duplicate_declaration():
+    """Check a variable declared twice is reported at the second name."""
+    text = "PROGRAM p;\nVAR a, b : INTEGER;\n    A : REAL;\nBEGIN END."
+    parser = Parser(get_token_buffer(text))
+
+    with pytest.raises(InvalidSyntaxError) as error:
+        parser.parse()
+
+    assert str(error.value) == "Duplicate identifier at line 3, column 5"
+
+
+_BROKEN_PROGRAM = """PROGRAM broken;
+VAR
+   a, b : INTEGER;
+   c    : ;
+   a    : REAL;
+BEGIN
+   a := 1;
+   b := * 2;
+   c := (a + 1;
+   BEGIN d := 3 e := 4; END;
+   f := 5
+END.
+"""
+
+
+def test_recovery_collects_all_errors():
+    """Check recovery mode reports every error and keeps the good statements."""
+    parser = Parser(get_token_buffer(_BROKEN_PROGRAM), recover=True)
+
+    ast = parser.parse()
+
+    assert [str(error) for error in parser.errors] == [
+        "Invalid syntax at line 4, column 11",
+        "Duplicate identifier at line 5, column 4",
+        "Invalid syntax at line 8, column 9",
+        "Invalid syntax at line 9, column 15",
+        "Invalid syntax at line 10, column 17",
+    ]
+    assert [symbol.name for symbol in ast.variables] == ["a", "b"]
+    statements = ast.compound_statement.compound_statement
+    assert str(statements[0]) == "AssignOperator(Variable(a) := Num(1))"
+    assert isinstance(statements[1], EmptyOperator)
+    assert isinstance(statements[2], EmptyOperator)
+    assert str(statements[4]) == "AssignOperator(Variable(f) := Num(5))"
+    nested = statements[3].compound_statement
+    assert str(nested[0]) == "AssignOperator(Variable(d) := Num(3))"
+    assert [type(statement) for statement in nested[1:]] == [EmptyOperator]
+
+
+@pytest.mark.parametrize(
+    "text, count",
+    [
+        ("BEGIN a := 1 END.", 0),
+        ("BEGIN a := 1", 1),
+        ("BEGIN a := 1 END", 1),
+        ("BEGIN a := 1 END. b", 1),
+        ("BEGIN a := ) ; b := 2 END.", 1),
+        ("BEGIN a := 1 2 3; b := 2 END.", 1),
+        ("BEGIN a := 1; END END.", 1),
+        ("PROGRAM p VAR a : REAL; BEGIN END.", 1),
+        ("PROGRAM p; VAR a INTEGER BEGIN a := 1 END.", 1),
+        ("x := 1.", 2),
+        ("PROGRAM ; BEGIN a := 1 END.", 1),
+        ("PROGRAM 1 2; VAR a : REAL; BEGIN a := 1 END.", 1),
+        ("PROGRAM p; a := 1; BEGIN END.", 2),
+    ],
+)
+@pytest.mark.parametrize("make_source", [get_token, get_token_buffer])
+def test_recovery_error_count(make_source, text, count):
+    """Check the number of errors found in recovery mode.
+
+    Args:
+        make_source: lexer function
+        text: program text
+        count: expected number of errors
+    """
+    parser = Parser(make_source(text), recover=True)
+
+    parser.parse()
+
+    assert len(parser.errors) == count
+
+
+@pytest.mark.parametrize(
+    "text, positions, body",
+    [
+        ("x := 1.", [(1, 1), (1, 7)], "AssignOperator(Variable(x) := Num(1))"),
+        (
+            "PROGRAM ; BEGIN a := 1 END.",
+            [(1, 9)],
+            "AssignOperator(Variable(a) := Num(1))",
+        ),
+    ],
+)
+def test_recovery_header_errors(text, positions, body):
+    """Check errors before the program body are collected, not raised.
+
+    Args:
+        text: program text
+        positions: expected error positions
+        body: expected first statement
+    """
+    parser = Parser(get_token_buffer(text), recover=True)
+
+    ast = parser.parse()
+
+    assert [error.position for error in parser.errors] == positions
+    assert str(next(iter(_statements(ast)))) == body
+
+    stream_parser = Parser(get_token(text), recover=True)
+    stream_parser.parse()
+
+    assert [error.position for error in stream_parser.errors] == [None] * len(positions)
+
+
+def _statements(ast):
+    if isinstance(ast, Program):
+        ast = ast.compound_statement
+    return ast.compound_statement
+
+
+def test_recovery_off_raises_first_error():
+    """Check the parser without recovery still raises the first error."""
+    parser = Parser(get_token_buffer(_BROKEN_PROGRAM))
+
+    with pytest.raises(InvalidSyntaxError) as error:
+        parser.parse()
+
+    assert error.value.position == (4, 11)
+    assert parser.errors is None
+
+
+def test_statements_are_yielded_while_reading():
+    """Check a top-level statement is yielded before the rest is lexed."""
+    consumed = []
+
+    def tokens():
+        for token in get_token("BEGIN a := 1; b := a + 1; BEGIN c := b END END."):
+            consumed.append(token)
+            yield token
+
+    parser = Parser(tokens())
+    statements = parser.statements()
+
+    assert str(next(statements)) == "AssignOperator(Variable(a) := Num(1))"
+    assert len(consumed) == 5
+    assert [str(statement) for statement in statements] == [
+        "AssignOperator(Variable(b) := BinaryOperation(Variable(a) + Num(1)))",
+        "CompoundOperator(BEGIN AssignOperator(Variable(c) := Variable(b)) END)",
+    ]
+    assert parser.header is None
+
+
+def test_statements_header_and_errors():
+    """Check statements() reads the header and reports errors."""
+    parser = Parser(get_token(_DECLARED_PROGRAM))
+
+    assert len(list(parser.statements())) == 3
+    names = [symbol.name for symbol in parser.header[2]]
+    assert names == ["number", "a", "b", "c", "x", "y"]
+
+    with pytest.raises(InvalidSyntaxError):
+        list(Parser(get_token("BEGIN a := 1 END")).statements())
+
+    parser = Parser(get_token_buffer(_BROKEN_PROGRAM), recover=True)
+
+    assert len(list(parser.statements())) == 5
+    assert len(parser.errors) == 5
@@ -0,0 +1,62 @@
+# -*- coding:utf-8 -*-
+
+"""Slot resolver tests."""
+
+from interpreter.ast import ResolvedAssignOperator, ResolvedVariable
+from interpreter.intereter import interpret, parse
+from interpreter.resolver import resolve_slots
+from interpreter.symbol_table import SlotScope
+from interpreter.visitor import CalculationVisitor
+
+_PROGRAM = "BEGIN a := 2; b := a * (a - 3) + 10 / 4; c := -b; END."
+
+
+def test_resolved_nodes():
+    """Check variables carry slots and declared variables come first."""
+    tree = parse("PROGRAM p; VAR b, a : INTEGER; BEGIN c := a; b := c + b END.")
+
+    resolved, scope = resolve_slots(tree)
+    first, second = resolved.compound_statement.compound_statement
+
+    assert scope.names == ["b", "a", "c"]
+    assert [symbol.slot for symbol in tree.variables] == [0, 1]
+    assert isinstance(first, ResolvedAssignOperator)
+    assert (first.slot, first.variable.slot, first.expr.slot) == (2, 2, 1)
+    assert isinstance(second.expr.left, ResolvedVariable)
+    assert (second.slot, second.expr.left.slot, second.expr.right.slot) == (0, 2, 0)
+    assert str(resolved) == str(tree)
+
+
+def test_tree_is_not_changed():
+    """Check resolving builds new nodes instead of changing the tree."""
+    tree = parse("BEGIN a := 1; b := a END.")
+    statement = tree.compound_statement[1]
+
+    resolve_slots(tree)
+
+    assert tree.compound_statement[1] is statement
+    assert not isinstance(statement.expr, ResolvedVariable)
+
+
+def test_run_many_times():
+    """Check a resolved tree runs on new scopes with the same names."""
+    resolved, scope = resolve_slots(parse("BEGIN b := a * 2; a := a + 1 END."))
+    values = []
+
+    for start in (1, 10):
+        run_scope = SlotScope(scope.names)
+        run_scope["a"] = start
+        CalculationVisitor(run_scope).visit(resolved)
+        values.append(dict(run_scope))
+
+    assert values == [{"a": 2, "b": 2}, {"a": 11, "b": 20}]
+
+
+def test_dict_scope():
+    """Check resolved nodes also run on a dict scope by name."""
+    resolved, _ = resolve_slots(parse(_PROGRAM))
+    scope = {}
+
+    CalculationVisitor(scope).visit(resolved)
+
+    assert scope == interpret(_PROGRAM)
@@ -0,0 +1,137 @@
+# -*- coding:utf-8 -*-
+
+"""Binary format tests."""
+
+import io
+
+import pytest
+from interpreter.arena import build_arena
+from interpreter.intereter import parse
+from interpreter.serialization import FORMAT_VERSION, dump, dumps, load, loads
+from interpreter.visitor import CalculationVisitor
+
+_PROGRAMS = (
+    "BEGIN END.",
+    "BEGIN a := 2; b := a * (a - 3) + 10 / 4; c := -b; d := +1.25 END.",
+    "BEGIN BEGIN x := 1.5; END; y := x / 0; BEGIN BEGIN END END END.",
+    """PROGRAM Part10;
+    VAR
+       number     : INTEGER;
+       a, b, c, x : INTEGER;
+       y          : REAL;
+    BEGIN
+       number := 2;
+       a := number;
+       b := 10 * a + 10 * number / 4;
+       c := a - - b;
+       x := 11;
+       y := 20 / 7 + 3.14
+    END.""",
+    "BEGIN a := 123456789012345678901234567890 * 2 END.",
+)
+
+
+@pytest.mark.parametrize("text", _PROGRAMS)
+def test_round_trip(text):
+    """Check a loaded program equals the parsed one.
+
+    Args:
+        text: program text
+    """
+    tree = parse(text)
+    expected_scope = {}
+    scope = {}
+
+    loaded = loads(dumps(tree)).tree
+    CalculationVisitor(expected_scope).visit(tree)
+    CalculationVisitor(scope).visit(loaded)
+
+    assert str(loaded) == str(tree)
+    assert scope == expected_scope
+
+
+def test_declarations_round_trip():
+    """Check declarations, types and slots of a program are restored."""
+    tree = parse(_PROGRAMS[3])
+
+    loaded = loads(dumps(tree)).tree
+
+    assert [str(node) for node in loaded.block.declarations] == [
+        str(node) for node in tree.block.declarations
+    ]
+    assert [(symbol.name, symbol.type, symbol.slot) for symbol in loaded.variables] == [
+        (symbol.name, symbol.type, symbol.slot) for symbol in tree.variables
+    ]
+    assert loaded.name.value == "part10"
+
+
+def test_tokens_round_trip():
+    """Check token values, types and symbol ids are restored."""
+    arena = build_arena(parse(_PROGRAMS[1]))
+
+    loaded = loads(dumps(arena))
+
+    assert list(loaded.kinds) == list(arena.kinds)
+    assert list(loaded.left) == list(arena.left)
+    assert list(loaded.right) == list(arena.right)
+    for index in range(len(arena)):
+        token = arena.constant(index)
+        loaded_token = loaded.constant(index)
+        if token is None:
+            assert loaded_token is None
+        else:
+            assert loaded_token.type == token.type
+            assert loaded_token.value == token.value
+            assert type(loaded_token.value) is type(token.value)
+            assert loaded_token.symbol_id == token.symbol_id
+
+
+def test_dump_is_stable():
+    """Check a loaded program serializes to the same bytes."""
+    data = dumps(parse(_PROGRAMS[3]))
+
+    assert dumps(loads(data)) == data
+
+
+def test_file_round_trip():
+    """Check programs are written to and read from binary files."""
+    program_file = io.BytesIO()
+    dump(parse(_PROGRAMS[1]), program_file)
+    program_file.seek(0)
+
+    assert str(load(program_file).tree) == str(parse(_PROGRAMS[1]))
+
+
+def test_deep_tree():
+    """Check a deeply nested expression is serialized without recursion."""
+    depth = 100000
+    text = "BEGIN a := {0}1{1} END.".format("-(" * depth, ")" * depth)
+
+    arena = loads(dumps(parse(text)))
+
+    assert len(arena) == depth + 4
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        (lambda data: b"X" + data[1:], "Not a serialized program"),
+        (
+            lambda data: data[:6] + bytes([FORMAT_VERSION + 1]) + data[7:],
+            "Unsupported format version",
+        ),
+        (lambda data: data[:-3], "Truncated"),
+        (lambda data: data + b"\x00", "Unexpected data"),
+    ],
+)
+def test_invalid_data(change, message):
+    """Check damaged data is rejected.
+
+    Args:
+        change: function damaging serialized data
+        message: start of the error message
+    """
+    data = change(dumps(parse(_PROGRAMS[1])))
+
+    with pytest.raises(ValueError, match=message):
+        loads(data)
@@ -0,0 +1,114 @@
+# -*- coding:utf-8 -*-
+
+"""Symbol table tests."""
+
+import pytest
+from interpreter.ast import Variable
+from interpreter.lexer import get_token, get_token_buffer
+from interpreter.parser import Parser
+from interpreter.symbol_table import SlotScope, SymbolTable, VariableTable
+from interpreter.token import TokenType
+
+
+def test_intern():
+    """Check names are numbered in order of appearance."""
+    table = SymbolTable()
+
+    assert table.intern("a") == 0
+    assert table.intern("b") == 1
+    assert table.intern("a") == 0
+    assert table.lookup("b") == 1
+    assert table.lookup("c") is None
+    assert table.name(1) == "b"
+    assert table.names == ["a", "b"]
+    assert len(table) == 2
+    assert "a" in table
+    assert "c" not in table
+
+
+def test_lexer_assigns_symbol_ids():
+    """Check variable tokens carry the id of their name."""
+    table = SymbolTable()
+    tokens = list(get_token("BEGIN b := 1; a := b; b := a END.", table))
+    variables = [token for token in tokens if token.type == TokenType.variable]
+
+    assert [token.symbol_id for token in variables] == [0, 1, 0, 0, 1]
+    assert table.names == ["b", "a"]
+    assert tokens[0].symbol_id is None
+
+
+def test_shared_symbol_table():
+    """Check several programs can share one symbol table."""
+    table = SymbolTable()
+    list(get_token("x := 1", table))
+    tokens = list(get_token("y := x", table))
+
+    assert tokens[0].symbol_id == 1
+    assert tokens[2].symbol_id == 0
+
+
+def test_parallel_lexing_symbol_ids():
+    """Check symbol ids of a buffer lexed in parts follow the text order."""
+    text = (
+        "BEGIN "
+        + "; ".join("v{0} := v{1}".format(index, index % 7) for index in range(40))
+        + " END."
+    )
+    expected = get_token_buffer(text)
+    actual = get_token_buffer(text, workers=2)
+
+    assert actual.symbol_table.names == expected.symbol_table.names
+    assert [token.symbol_id for token in actual] == [
+        token.symbol_id for token in expected
+    ]
+
+
+def test_variable_node_symbol_id():
+    """Check variable nodes keep the symbol id."""
+    ast = Parser(get_token("BEGIN a := 1; b := a END.")).parse()
+    second = ast.compound_statement[1]
+
+    assert isinstance(second.expr, Variable)
+    assert second.variable.symbol_id == 1
+    assert second.expr.symbol_id == 0
+
+
+def test_variable_table():
+    """Check declared variables get dense slots in order of declaration."""
+    table = VariableTable()
+
+    assert table.declare("a", TokenType.integer_type).slot == 0
+    assert table.declare("b", TokenType.real_type).slot == 1
+    assert table.declare("a", TokenType.real_type) is None
+    assert table.lookup("a").type == TokenType.integer_type
+    assert table.lookup("c") is None
+    assert "b" in table
+    assert "c" not in table
+    assert len(table) == 2
+    assert [symbol.name for symbol in table] == ["a", "b"]
+    assert str(table.lookup("b")) == "VariableSymbol(b: real_type, slot 1)"
+
+
+def test_slot_scope():
+    """Check a slot scope stores values by slot and reads like a dict."""
+    scope = SlotScope(["a", "b"])
+
+    assert scope.slot("b") == 1
+    assert scope.values == [None, None]
+    assert dict(scope) == {}
+    scope["c"] = 3
+    scope.values[0] = 1.5
+    assert scope.values == [1.5, None, 3]
+    assert scope.names == ["a", "b", "c"]
+    assert dict(scope) == {"a": 1.5, "c": 3}
+    assert scope == {"a": 1.5, "c": 3}
+    assert len(scope) == 2
+    assert "b" not in scope
+    assert scope.get("b") is None
+    assert repr(scope) == "SlotScope({'a': 1.5, 'c': 3})"
+    del scope["a"]
+    assert dict(scope) == {"c": 3}
+    with pytest.raises(KeyError):
+        del scope["a"]
+    with pytest.raises(KeyError):
+        scope["d"]
@@ -0,0 +1,233 @@
+# -*- coding:utf-8 -*-
+
+"""Token buffer tests."""
+
+import random
+
+import pytest
+from interpreter.lexer import (
+    _split_points,
+    get_token,
+    get_token_buffer,
+    get_tokens,
+    relex_token_buffer,
+)
+from interpreter.parser import Parser
+from interpreter.token import TokenType
+from interpreter.visitor import CalculationVisitor
+
+_PROGRAM = "BEGIN {init} a := 10; b := a * (a - 3) + 10 END."
+
+
+def test_buffer_matches_token_stream():
+    """Check the buffer holds the same tokens as get_token."""
+    buffer = get_token_buffer(_PROGRAM)
+    expected = list(get_token(_PROGRAM))
+
+    assert len(buffer) == len(expected)
+    for index, token in enumerate(expected):
+        assert buffer[index].type == token.type
+        assert buffer[index].value == token.value
+        assert buffer.type_at(index) == token.type
+
+
+def test_buffer_offsets():
+    """Check offsets point at the token text in the source."""
+    buffer = get_token_buffer(_PROGRAM)
+    lexemes = [_PROGRAM[start:end] for start, end in zip(buffer.starts, buffer.ends)]
+
+    assert lexemes[:5] == ["BEGIN", "a", ":=", "10", ";"]
+    assert lexemes[-3:] == ["END", ".", ""]
+    assert buffer.type_at(len(buffer) - 1) == TokenType.eof
+
+
+def test_buffer_interns_values():
+    """Check repeated lexemes are stored once in the value table."""
+    buffer = get_token_buffer(_PROGRAM)
+
+    assert len(buffer.values) < len(buffer)
+    assert buffer.value_ids[1] == buffer.value_ids[7]
+    assert buffer.types.typecode == "B"
+    assert buffer.starts.typecode == "q"
+
+
+def test_parser_consumes_buffer():
+    """Check the parser accepts a token buffer."""
+    global_scope = {}
+    ast = Parser(get_token_buffer(_PROGRAM)).parse()
+    CalculationVisitor(global_scope).visit(ast)
+
+    assert global_scope == {"a": 10, "b": 80}
+
+
+def test_cursor_index():
+    """Check the cursor reports the index of the next token."""
+    cursor = iter(get_token_buffer("a := 1"))
+    next(cursor)
+    next(cursor)
+
+    assert cursor.index == 2
+    assert next(cursor).value == 1
+    assert next(cursor).type == TokenType.eof
+
+
+_EDIT_PIECES = (
+    "a",
+    "b1",
+    "7",
+    "42",
+    ".",
+    "3.5",
+    " ",
+    ":",
+    "=",
+    ":=",
+    "+",
+    ";",
+    "{",
+    "}",
+    "\n",
+)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_relex_matches_full_lex(seed):
+    """Check incremental relexing gives the same buffer as a full lex.
+
+    Args:
+        seed: random seed
+    """
+    rnd = random.Random(seed)
+    text = "BEGIN {start} x := 10; y1 := x * (x - 3) + 42 END."
+    buffer = get_token_buffer(text)
+    for _ in range(50):
+        offset = rnd.randint(0, len(text))
+        deleted_length = rnd.randint(0, min(3, len(text) - offset))
+        inserted_text = "".join(
+            rnd.choice(_EDIT_PIECES) for _ in range(rnd.randint(0, 3))
+        )
+        before = _buffer_contents(buffer)
+        shift = len(inserted_text) - deleted_length
+        text, start, stop = relex_token_buffer(
+            buffer,
+            text,
+            offset,
+            deleted_length,
+            inserted_text,
+        )
+        after = _buffer_contents(buffer)
+        old_stop = stop - len(after) + len(before)
+
+        assert after == _buffer_contents(get_token_buffer(text))
+        assert after[:start] == before[:start]
+        assert after[stop:] == [
+            (token_type, value, token_start + shift, token_end + shift)
+            for token_type, value, token_start, token_end in before[old_stop:]
+        ]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_relex_pending_shifts(seed):
+    """Check offsets stay right over many edits without reading the arrays.
+
+    Args:
+        seed: random seed
+    """
+    rnd = random.Random(seed)
+    text = " ".join("v{0} := {0};".format(index) for index in range(40))
+    buffer = get_token_buffer(text)
+    for _ in range(200):
+        offset = rnd.randint(0, len(text))
+        deleted_length = rnd.randint(0, min(2, len(text) - offset))
+        inserted_text = rnd.choice(("", " ", "7", "77", "a b", ";"))
+        text, _, _ = relex_token_buffer(
+            buffer,
+            text,
+            offset,
+            deleted_length,
+            inserted_text,
+        )
+        expected = get_token_buffer(text)
+        index = rnd.randrange(len(expected))
+
+        assert (buffer.start(index), buffer.end(index)) == (
+            expected.starts[index],
+            expected.ends[index],
+        )
+        assert buffer.find_start(expected.starts[index]) == index
+    assert _buffer_contents(buffer) == _buffer_contents(get_token_buffer(text))
+
+
+def test_relex_changed_range():
+    """Check the returned range covers only the edited tokens."""
+    text = "BEGIN a := 1; b := 2; c := 3 END."
+    buffer = get_token_buffer(text)
+    text, start, stop = relex_token_buffer(buffer, text, 14, 1, "b2")
+
+    assert text == "BEGIN a := 1; b2 := 2; c := 3 END."
+    assert (start, stop) == (5, 6)
+    assert buffer[5].value == "b2"
+    assert buffer.starts[6] == 17
+
+
+def test_token_position():
+    """Check offsets are converted to line and column."""
+    text = "BEGIN\n  a := 1;\n\n  b := 2\nEND."
+    buffer = get_token_buffer(text)
+
+    assert buffer.position(0) == (1, 1)
+    assert buffer.position(1) == (2, 3)
+    assert buffer.position(5) == (4, 3)
+    assert buffer.position(len(buffer) - 1) == (5, 5)
+
+    text, _, _ = relex_token_buffer(buffer, text, 0, 0, "\n")
+
+    assert buffer.position(1) == (3, 3)
+
+
+_PARALLEL_PROGRAM = (
+    "BEGIN {a; b; c} "
+    + " ".join(
+        "v{0} := v{1} * {0}; {{x := 1;}}".format(index, index // 2)
+        for index in range(50)
+    )
+    + " END."
+)
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_lexing(workers):
+    """Check lexing in a process pool gives the sequential result.
+
+    Args:
+        workers: data for test
+    """
+    expected = get_token_buffer(_PARALLEL_PROGRAM)
+    actual = get_token_buffer(_PARALLEL_PROGRAM, workers=workers)
+
+    assert _buffer_contents(actual) == _buffer_contents(expected)
+    assert actual[0] is expected[0]
+    assert len(actual.values) == len(set(map(id, actual.values)))
+    assert [
+        (token.type, token.value) for token in get_tokens(_PARALLEL_PROGRAM, workers=2)
+    ] == [(token.type, token.value) for token in get_token(_PARALLEL_PROGRAM)]
+
+
+def test_split_points_skip_comments():
+    """Check the text is split only after semicolons outside comments."""
+    text = "a := 1 {;;;;;;;;;;;;;;;;;;;;}; b := 2; {;} c := 3 {;"
+    bounds = _split_points(text, 4)
+
+    assert bounds[0] == 0
+    assert bounds[-1] == len(text)
+    assert bounds == sorted(set(bounds))
+    for point in bounds[1:-1]:
+        assert text[point - 1] == ";"
+        assert text[:point].count("{") == text[:point].count("}")
+
+
+def _buffer_contents(buffer):
+    return [
+        (buffer[index].type, buffer[index].value, start, end)
+        for index, (start, end) in enumerate(zip(buffer.starts, buffer.ends))
+    ]
@@ -0,0 +1,24 @@
+# -*- coding:utf-8 -*-
+
+"""Transpiler tests."""
+
+import ast
+
+from interpreter.intereter import parse
+from interpreter.transpiler import Transpiler
+
+
+def test_first_use_is_checked():
+    """Check only the first use of an unassigned variable is checked."""
+    module = Transpiler().transpile(parse("BEGIN a := b + b; c := a + b END."))
+
+    checks = [node for node in ast.walk(module) if isinstance(node, ast.IfExp)]
+    assert len(checks) == 1
+
+
+def test_locals_named_by_index():
+    """Check locals do not depend on how Python would spell the names."""
+    module = Transpiler().transpile(parse("BEGIN ﬁx := 1; fix := ﬁx END."))
+
+    names = {node.id for node in ast.walk(module) if isinstance(node, ast.Name)}
+    assert names == {"scope", "v0", "v1"}